@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+from datetime import date
+from typing import Iterator
+
+from fastapi import HTTPException
+
+from .schemas import ExamPlanRequest, WeeklyPlanRequest
+from core.utils.admission import (
+    AdmissionController,
+    AdmissionPolicy,
+    AdmissionRejected,
+    estimate_cost,
+)
+from config import settings
+
+# One controller per process, shared by every plan endpoint.
+controller = AdmissionController(
+    AdmissionPolicy(
+        max_cost=settings.ADMISSION_MAX_COST,
+        capacity=settings.ADMISSION_CAPACITY,
+        downgrade_cost=settings.ADMISSION_DOWNGRADE_COST,
+        max_queue=settings.ADMISSION_MAX_QUEUE,
+        queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    )
+)
+
+
+def validate_sweep_grid(size: int) -> None:
+    """Sweeps need at least one and at most MAX_SWEEP_POINTS settings entries."""
+    if size == 0:
+        raise HTTPException(status_code=400, detail="At least one settings entry is required.")
+    if size > settings.MAX_SWEEP_POINTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.MAX_SWEEP_POINTS} settings entries are allowed.",
+        )
+
+
+def exam_request_cost(payload: ExamPlanRequest) -> int:
+    """Cost of an exam request, computed from the validated schema alone."""
+    try:
+        start = date.fromisoformat(payload.availability.start_date)
+        end = date.fromisoformat(payload.availability.end_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be in YYYY-MM-DD format.")
+
+    return estimate_cost(
+        days=(end - start).days + 1,
+        subjects=len(payload.subjects),
+        topics=sum(len(s.topics) for s in payload.subjects),
+    )
+
+
+def weekly_request_cost(payload: WeeklyPlanRequest) -> int:
+    """Cost of a weekly request (always a 7-day window)."""
+    return estimate_cost(
+        days=7,
+        subjects=len(payload.subjects),
+        topics=sum(len(s.topics) for s in payload.subjects),
+    )
+
+
+@contextmanager
+def admitted(cost: int, allow_downgrade: bool = False) -> Iterator[str]:
+    """
+    Admit a request of `cost`, yielding "accept" or "summary".
+    Rejections become 413/429 responses.
+    """
+    try:
+        with controller.admit(cost, allow_downgrade) as action:
+            yield action
+    except AdmissionRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
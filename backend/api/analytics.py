@@ -0,0 +1,57 @@
+from itertools import chain
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from .schemas import CohortReportResponse
+from .jobs import get_queue
+from .plan_diff import get_plan_store
+from core.utils.cohort_analytics import collect, cohort_report, distinct_records, job_records, stored_records
+from config import settings
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+PLAN_KINDS = ("exam", "weekly")
+
+# Returned with every report: what the figures are drawn from.
+COHORT_SAMPLE = (
+    "Sample of finished background jobs and re-plan diffs (newest version per re-plan chain, "
+    "each plan once); plans served by POST /{kind}/generate are not recorded."
+)
+
+
+@router.get("/cohort", response_model=CohortReportResponse)
+def cohort_report_endpoint(
+    kind: Optional[str] = None,
+    since: float = 0.0,
+    limit: int = Query(settings.ANALYTICS_MAX_PLANS, ge=1),
+) -> CohortReportResponse:
+    """
+    Load analytics over the plans this server keeps: per-date total and
+    mean minutes, subject coverage, subjects per plan and the share of
+    offered study time the plans use.
+
+    The figures are a sample, not the whole cohort: plans served by
+    POST /{kind}/generate are never recorded. Plans come from finished
+    background jobs and from the re-plan store (POST /{kind}/diff),
+    newest first, counting each plan once (by ETag) and each re-plan
+    chain by its newest version; optionally only one kind and only
+    those created at or after `since` (unix seconds), up to `limit`
+    (at most ANALYTICS_MAX_PLANS). Capacity figures only cover job
+    plans; stored plans are kept without their request.
+
+    For large cohorts run tests/cohort_report.py offline instead; it
+    reads the same databases.
+    """
+    if kind is not None and kind not in PLAN_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(PLAN_KINDS)}.")
+    limit = min(limit, settings.ANALYTICS_MAX_PLANS)
+
+    columns = collect(
+        distinct_records(chain(
+            job_records(get_queue().iter_done(kind, since, limit)),
+            stored_records(get_plan_store().iter_plans(kind, since)),
+        )),
+        limit=limit,
+    )
+    return CohortReportResponse(sample=COHORT_SAMPLE, **cohort_report(columns))
@@ -1,8 +1,18 @@
-from fastapi import FastAPI
+from anyio import to_thread
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from config.settings import THREADPOOL_SIZE
+
 from .generate_weekly_plan import router as weekly_router
 from .generate_exam_plan import router as exam_router
+from .pdf_export import router as pdf_router
+from .ics_export import router as ics_router
+from .jobs import router as jobs_router, start_workers, stop_workers
+from .catalogs import router as catalogs_router
+from .profiles import router as profiles_router, bind_user, unbind_user
+from .auth import request_user
+from .analytics import router as analytics_router
 
 app = FastAPI(title="Study Scheduler API")
 
@@ -17,9 +27,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def bind_request_user(request: Request, call_next):
+    # Saved profiles are scoped to the caller (see auth.USER_HEADER for
+    # what that identity is worth).
+    token = bind_user(request_user(request))
+    try:
+        return await call_next(request)
+    finally:
+        unbind_user(token)
+
+
+@app.on_event("startup")
+async def size_threadpool():
+    if THREADPOOL_SIZE:
+        to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+
+@app.on_event("startup")
+def start_job_workers():
+    start_workers()
+
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    stop_workers()
+
+
 @app.get("/")
 def root():
     return {"status": "backend running"}
 
 app.include_router(weekly_router)
-app.include_router(exam_router)
\ No newline at end of file
+app.include_router(exam_router)
+app.include_router(pdf_router)
+app.include_router(ics_router)
+app.include_router(jobs_router)
+app.include_router(catalogs_router)
+app.include_router(profiles_router)
+app.include_router(analytics_router)
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from fastapi import Request
+
+# The API has no authentication of its own. Callers are identified by
+# this header, which must be set by a trusted proxy or gateway that
+# authenticates the user and overwrites whatever the client sent; with
+# the API exposed directly, any client can name any user. It scopes
+# saved profiles by owner but is not an isolation boundary.
+USER_HEADER = "X-User-Id"
+
+
+def request_user(request: Request) -> Optional[str]:
+    """
+    The caller's user id, or None. The one place the app decides who is
+    calling: an auth scheme added later replaces this header lookup.
+    """
+    return request.headers.get(USER_HEADER) or None
@@ -0,0 +1,128 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Union
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
+
+from .schemas import (
+    CatalogResponse,
+    TopicModel,
+    ExamPlanRequest,
+    WeeklyPlanRequest,
+)
+from core.utils.syllabus import SyllabusParser, SyllabusError, SYLLABUS_FORMATS
+from database.catalog_store import CatalogStore
+from config import settings
+
+router = APIRouter(prefix="/catalogs", tags=["catalogs"])
+
+
+@lru_cache(maxsize=1)
+def get_catalog_store() -> CatalogStore:
+    return CatalogStore(settings.CATALOG_DB_PATH)
+
+
+@router.post("", status_code=201, response_model=CatalogResponse)
+async def import_catalog_endpoint(
+    request: Request,
+    fmt: str = Query("csv", alias="format"),
+    name: str = Query(""),
+) -> CatalogResponse:
+    """
+    Import a syllabus as a reusable topic catalog.
+
+    The body is CSV (header row with subject, name and optionally
+    priority, familiarity, id) or NDJSON (one such object per line),
+    selected with ?format=csv|ndjson. It is parsed as it streams in and
+    written in batches, so memory does not grow with the upload.
+
+    Topics without an id get a stable one derived from subject and
+    name. A bad row rejects the whole import (400, with its line
+    number); nothing of it is kept.
+    """
+    if fmt not in SYLLABUS_FORMATS:
+        raise HTTPException(status_code=400, detail="format must be one of: csv, ndjson.")
+
+    store = get_catalog_store()
+    parser = SyllabusParser(fmt)
+    catalog_id = await run_in_threadpool(store.create, name)
+
+    try:
+        batch: List[Dict[str, Any]] = []
+        async for chunk in request.stream():
+            batch.extend(parser.feed(chunk))
+            if len(batch) >= settings.CATALOG_IMPORT_BATCH:
+                _check_size(parser.count)
+                await run_in_threadpool(store.add_topics, catalog_id, batch)
+                batch = []
+        batch.extend(parser.close())
+        _check_size(parser.count)
+        if batch:
+            await run_in_threadpool(store.add_topics, catalog_id, batch)
+        await run_in_threadpool(store.finish, catalog_id, parser.count)
+    except SyllabusError as exc:
+        await run_in_threadpool(store.discard, catalog_id)
+        raise HTTPException(status_code=400, detail=str(exc))
+    except BaseException:
+        await run_in_threadpool(store.discard, catalog_id)
+        raise
+
+    return CatalogResponse(**await run_in_threadpool(store.get, catalog_id))
+
+
+@router.get("/{catalog_id}", response_model=CatalogResponse)
+def get_catalog_endpoint(catalog_id: str) -> CatalogResponse:
+    """
+    Catalog metadata: name, topic count and topics per subject.
+    """
+    catalog = get_catalog_store().get(catalog_id)
+    if catalog is None:
+        raise HTTPException(status_code=404, detail="Catalog not found.")
+    return CatalogResponse(**catalog)
+
+
+def _check_size(count: int) -> None:
+    if count > settings.CATALOG_MAX_TOPICS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.CATALOG_MAX_TOPICS} topics per catalog are allowed.",
+        )
+
+
+# ---------------------------------------------------------
+# Plan requests
+# ---------------------------------------------------------
+
+@lru_cache(maxsize=settings.CATALOG_CACHE_SUBJECTS)
+def catalog_topics(catalog_id: str, subject: str) -> Tuple[TopicModel, ...]:
+    """
+    A subject's catalog topics as TopicModels (already validated on
+    import). Safe to cache: ready catalogs never change.
+    """
+    return tuple(TopicModel.construct(**t) for t in get_catalog_store().topics(catalog_id, subject))
+
+
+def resolve_catalog_topics(payload: Union[ExamPlanRequest, WeeklyPlanRequest]) -> None:
+    """
+    Fill in topics from payload.catalog_id, in place: every subject
+    sent without topics gets the catalog's topics for its
+    catalog_subject (or name). Unknown catalogs are a 404; a
+    catalog_subject the catalog does not have is a 400.
+    """
+    if payload.catalog_id is None:
+        return
+
+    if not get_catalog_store().exists(payload.catalog_id):
+        raise HTTPException(status_code=404, detail="Catalog not found.")
+
+    for subject in payload.subjects:
+        if subject.topics:
+            continue
+        key = subject.catalog_subject or subject.name
+        topics = catalog_topics(payload.catalog_id, key)
+        if not topics and subject.catalog_subject:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Catalog has no subject {subject.catalog_subject!r}.",
+            )
+        subject.topics = list(topics)
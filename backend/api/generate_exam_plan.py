@@ -1,15 +1,53 @@
 from datetime import date
+from typing import Dict, Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 
-from .schemas import ExamPlanRequest, ExamPlanResponse
-from core.allocator.exam_allocator import generate_exam_plan
+from .schemas import (
+    assign_stable_ids,
+    ExamPlanRequest,
+    ExamPlanResponse,
+    ExamFeasibilityResponse,
+    ExamSweepRequest,
+    SweepResponse,
+    JobCreatedResponse,
+    ExamDiffRequest,
+    PlanDiffResponse,
+)
+from .admission import admitted, exam_request_cost, validate_sweep_grid
+from .jobs import get_queue, register_runner
+from .plan_diff import plan_diff_response
+from .plan_cache import cached_plan
+from .single_flight import coalesced
+from .catalogs import resolve_catalog_topics
+from .profiles import resolve_profile
+from core.allocator.exam_allocator import (
+    generate_exam_plan,
+    check_exam_feasibility,
+    summarize_exam_plan,
+    sweep_exam_settings,
+    AllocatorSettings,
+    SCHEDULER_MODES,
+)
+from core.utils.admission import DOWNGRADE
+from core.utils.columnar import to_columnar
+from core.utils.plan_metrics import compute_plan_metrics
+from core.engine.slot_placement import parse_windows
+from core.utils.single_flight import canonical_key
+from config.settings import SEGMENT_WORKERS, PLAN_BUDGET_MS
 
 router = APIRouter(prefix="/exam", tags=["exam"])
 
+PLAN_FORMATS = ("json", "columnar")
+
 
 @router.post("/generate", response_model=ExamPlanResponse)
-def generate_exam_plan_endpoint(payload: ExamPlanRequest) -> ExamPlanResponse:
+def generate_exam_plan_endpoint(
+    payload: ExamPlanRequest,
+    mode: str = "full",
+    fmt: str = Query("json", alias="format"),
+    metrics: bool = False,
+) -> ExamPlanResponse:
     """
     Unified exam-mode endpoint.
 
@@ -39,19 +77,203 @@ def generate_exam_plan_endpoint(payload: ExamPlanRequest) -> ExamPlanResponse:
                 "rest_dates": [ "YYYY-MM-DD", ... ],
                 "start_date": "YYYY-MM-DD",
                 "end_date": "YYYY-MM-DD"
-            }
+            },
+            "scheduler": Optional["proportional" | "edf" | "segmented"]
         }
 
     Notes:
     - Subject and topic IDs are optional on input; the allocator guarantees IDs internally.
     - availability.start_date defaults to today if missing.
     - availability.end_date is required in exam mode.
+    - scheduler="edf" only places minutes before each exam_date and adds
+      a per-exam "shortfall" map to the plan.
+    - ?mode=summary returns analytic totals only (per subject, per
+      weekday, per week) without building blocks.
+    - If the compute budget (PLAN_BUDGET_MS) runs out, the plan carries
+      "partial": true and its later days are filled proportionally.
+    - ?format=columnar returns the plan with subjects and topics listed
+      once and days/blocks as parallel integer arrays (see
+      core.utils.columnar). Ignored for summaries.
+    - ?metrics=true adds plan["metrics"]: per-day load, hard minutes and
+      distinct subjects, streaks and cognitive-load violation counts
+      (see core.utils.plan_metrics). Ignored for summaries.
     """
+    if fmt not in PLAN_FORMATS:
+        raise HTTPException(status_code=400, detail="format must be one of: json, columnar.")
+    if mode == "summary":
+        return ExamPlanResponse(plan=build_exam_summary(payload))
+    if mode != "full":
+        raise HTTPException(status_code=400, detail="mode must be one of: full, summary.")
+
+    plan = build_exam_plan(payload, allow_downgrade=True)
+    if metrics and "days" in plan:
+        # The plan may be shared with coalesced requests; do not mutate it.
+        plan = {**plan, "metrics": compute_plan_metrics(plan)}
+    if fmt == "columnar" and "days" in plan:
+        plan = to_columnar(plan)
+
+    return ExamPlanResponse(plan=plan)
+
+
+def build_exam_plan(payload: ExamPlanRequest, allow_downgrade: bool = False) -> Dict[str, Any]:
+    """
+    Validate an exam-mode request, admit it and run the allocator.
+
+    Shared by every endpoint that needs an exam plan (JSON, exports).
+    With allow_downgrade, an expensive request arriving while the server
+    is busy gets the summary preview instead (plan["mode"] == "summary").
+    """
+    _validate_exam_request(payload)
+    cost = exam_request_cost(payload)
+
+    # Delegate to allocator.
+    # The allocator is responsible for:
+    # - Parsing exam_date
+    # - Generating IDs for subjects/topics if missing
+    # - Building the plan dict with days/blocks/subjects/topics
+    def run() -> Dict[str, Any]:
+        with admitted(cost, allow_downgrade) as action:
+            if action == DOWNGRADE:
+                return summarize_exam_plan(
+                    subjects=[s.to_allocator() for s in payload.subjects],
+                    availability=payload.availability.to_allocator(),
+                    scheduler=payload.scheduler,
+                )
+            return _run_allocator(payload, budget_ms=PLAN_BUDGET_MS or None)
+
+    request = payload.dict()
+
+    # Plans cached on disk (by this or another worker, possibly before
+    # a restart) skip admission and the allocator.
+    def compute() -> Dict[str, Any]:
+        return cached_plan("exam", request, run)
+
+    # Downgradable and non-downgradable callers must not share results.
+    namespace = "exam:downgradable" if allow_downgrade else "exam"
+    return coalesced(canonical_key(namespace, request), compute)
+
+
+def _run_allocator(payload: ExamPlanRequest, budget_ms: int | None = None) -> Dict[str, Any]:
+    return generate_exam_plan(
+        subjects=[s.to_allocator() for s in payload.subjects],
+        availability=payload.availability.to_allocator(),
+        scheduler=payload.scheduler,
+        max_workers=SEGMENT_WORKERS or None,
+        budget_ms=budget_ms,
+    )
+
+
+def build_exam_summary(payload: ExamPlanRequest) -> Dict[str, Any]:
+    """
+    Validate an exam-mode request and compute its summary preview.
+    """
+    _validate_exam_request(payload)
+
+    return summarize_exam_plan(
+        subjects=[s.to_allocator() for s in payload.subjects],
+        availability=payload.availability.to_allocator(),
+        scheduler=payload.scheduler,
+    )
+
+
+@router.post("/diff", response_model=PlanDiffResponse)
+def exam_diff_endpoint(body: ExamDiffRequest, response: Response) -> PlanDiffResponse:
+    """
+    Re-plan and return only what changed.
+
+    Computes the plan for `request` like POST /exam/generate and, if
+    `base_etag` names a plan this server recently returned, answers
+    with a day/block patch against it; otherwise with the full plan.
+    Either way `etag` identifies the new plan for the next re-plan.
+    """
+    plan = build_exam_plan(body.request)
+    return plan_diff_response("exam", plan, body.base_etag, response)
+
+
+@router.post("/jobs", status_code=202, response_model=JobCreatedResponse)
+def create_exam_job_endpoint(payload: ExamPlanRequest) -> JobCreatedResponse:
+    """
+    Queue an exam plan for background generation.
+
+    Accepts the same body as POST /exam/generate and validates it up
+    front. Poll GET /jobs/{job_id} for the result. Jobs skip admission
+    control and the compute budget; the worker pool size bounds their
+    concurrency instead.
+    """
+    _validate_exam_request(payload)
+    job_id = get_queue().enqueue("exam", payload.dict())
+    return JobCreatedResponse(job_id=job_id, status="queued")
+
+
+def _run_exam_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    request = ExamPlanRequest(**payload)
+    _validate_exam_request(request)
+    return cached_plan("exam", request.dict(), lambda: _run_allocator(request))
+
+
+register_runner("exam", _run_exam_job)
+
+
+@router.post("/feasibility", response_model=ExamFeasibilityResponse)
+def exam_feasibility_endpoint(payload: ExamPlanRequest) -> ExamFeasibilityResponse:
+    """
+    Cheap pre-check for the exam form.
+
+    Accepts the same body as POST /exam/generate. Builds no blocks;
+    reports, per exam, the weighted minute demand, the minutes available
+    before its exam date and the resulting slack (negative = does not fit).
+    Admitted like a plan request, but never downgraded.
+    """
+    _validate_exam_request(payload)
+
+    with admitted(exam_request_cost(payload)):
+        result = check_exam_feasibility(
+            subjects=[s.to_allocator() for s in payload.subjects],
+            availability=payload.availability.to_allocator(),
+        )
+
+    return ExamFeasibilityResponse(**result)
+
+
+@router.post("/sweep", response_model=SweepResponse)
+def exam_sweep_endpoint(body: ExamSweepRequest) -> SweepResponse:
+    """
+    What-if sweep over allocator weights for one exam request.
+
+    Every grid point is evaluated in one pass over the shared calendar
+    and subjects; returns per-exam minutes and summary metrics for each.
+    Admitted at the request's cost times the number of grid points
+    (413 when too large, 429 when busy); never downgraded.
+    """
+    _validate_exam_request(body.request)
+    validate_sweep_grid(len(body.settings))
+
+    # Every grid point covers the whole request.
+    cost = exam_request_cost(body.request) * len(body.settings)
+    with admitted(cost):
+        results = sweep_exam_settings(
+            subjects=[s.to_allocator() for s in body.request.subjects],
+            availability=body.request.availability.to_allocator(),
+            settings_grid=[AllocatorSettings(**w.dict()) for w in body.settings],
+        )
+
+    return SweepResponse(results=results)
+
+
+def _validate_exam_request(payload: ExamPlanRequest) -> None:
+    # Requests referencing a saved profile are completed from it first.
+    resolve_profile(payload, "exam")
 
     # Basic validation
     if not payload.subjects:
         raise HTTPException(status_code=400, detail="At least one subject is required.")
 
+    # Subjects sent without topics take them from the referenced catalog.
+    resolve_catalog_topics(payload)
+
+    # Ids derived from names keep re-plans of id-less requests diffable.
+    assign_stable_ids(payload.subjects)
+
     # Normalize availability start_date
     if not payload.availability.start_date:
         payload.availability.start_date = date.today().isoformat()
@@ -63,14 +285,13 @@ def generate_exam_plan_endpoint(payload: ExamPlanRequest) -> ExamPlanResponse:
             detail="Exam mode requires end_date in availability.",
         )
 
-    # Delegate to allocator.
-    # The allocator is responsible for:
-    # - Parsing exam_date
-    # - Generating IDs for subjects/topics if missing
-    # - Building the plan dict with days/blocks/subjects/topics
-    plan_dict = generate_exam_plan(
-      subjects=[s.dict() for s in payload.subjects],
-      availability=payload.availability.dict(),
-    )
+    if payload.scheduler not in SCHEDULER_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"scheduler must be one of: {', '.join(SCHEDULER_MODES)}.",
+        )
 
-    return ExamPlanResponse(plan=plan_dict)
+    try:
+        parse_windows(payload.availability.windows_per_weekday)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"windows_per_weekday: {exc}")
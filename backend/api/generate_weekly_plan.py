@@ -1,15 +1,52 @@
+from dataclasses import replace
 from datetime import date
+from typing import Dict, Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 
-from .schemas import WeeklyPlanRequest, WeeklyPlanResponse
-from core.allocator.weekly_allocator import generate_weekly_plan
+from .schemas import (
+    assign_stable_ids,
+    WeeklyPlanRequest,
+    WeeklyPlanResponse,
+    WeeklySweepRequest,
+    SweepResponse,
+    JobCreatedResponse,
+    WeeklyDiffRequest,
+    PlanDiffResponse,
+)
+from .admission import admitted, weekly_request_cost, validate_sweep_grid
+from .jobs import get_queue, register_runner
+from .plan_diff import plan_diff_response
+from .plan_cache import cached_plan
+from .single_flight import coalesced
+from .catalogs import resolve_catalog_topics
+from .profiles import resolve_profile
+from core.allocator.weekly_allocator import (
+    generate_weekly_plan,
+    summarize_weekly_plan,
+    sweep_weekly_settings,
+    DEFAULT_SETTINGS,
+    PLACEMENT_MODES,
+)
+from core.utils.admission import DOWNGRADE
+from core.utils.columnar import to_columnar
+from core.utils.plan_metrics import compute_plan_metrics
+from core.engine.slot_placement import parse_windows
+from core.utils.single_flight import canonical_key
+from config.settings import PLAN_BUDGET_MS
 
 router = APIRouter(prefix="/weekly", tags=["weekly"])
 
+PLAN_FORMATS = ("json", "columnar")
+
 
 @router.post("/generate", response_model=WeeklyPlanResponse)
-def generate_weekly_plan_endpoint(payload: WeeklyPlanRequest) -> WeeklyPlanResponse:
+def generate_weekly_plan_endpoint(
+    payload: WeeklyPlanRequest,
+    mode: str = "full",
+    fmt: str = Query("json", alias="format"),
+    metrics: bool = False,
+) -> WeeklyPlanResponse:
     """
     Unified weekly-mode endpoint.
 
@@ -32,6 +69,7 @@ def generate_weekly_plan_endpoint(payload: WeeklyPlanRequest) -> WeeklyPlanRespo
                 }
             ],
             "weekly_hours": float,
+            "placement": Optional["greedy" | "ffd" | "best_fit"],
             "availability": {
                 "minutes_per_weekday": { "Monday": int, ... },
                 "rest_dates": [ "YYYY-MM-DD", ... ],
@@ -45,18 +83,47 @@ def generate_weekly_plan_endpoint(payload: WeeklyPlanRequest) -> WeeklyPlanRespo
     - weekly_hours must be > 0.
     - start_date defaults to today if missing.
     - end_date is optional in weekly mode (frontend sends it; backend accepts it).
+    - ?mode=summary returns analytic totals only (per subject, per
+      weekday) without building blocks.
+    - If the compute budget (PLAN_BUDGET_MS) runs out, the plan carries
+      "partial": true and its later days are filled proportionally.
+    - ?format=columnar returns the plan with subjects and topics listed
+      once and days/blocks as parallel integer arrays (see
+      core.utils.columnar). Ignored for summaries.
+    - ?metrics=true adds plan["metrics"]: per-day load, hard minutes and
+      distinct subjects, streaks and cognitive-load violation counts
+      (see core.utils.plan_metrics). Ignored for summaries.
+    - placement="ffd" / "best_fit" bin-pack sessions into days (largest
+      first) instead of filling days in order, and add
+      plan["placement"] with utilization, splits and unplaced minutes.
     """
+    if fmt not in PLAN_FORMATS:
+        raise HTTPException(status_code=400, detail="format must be one of: json, columnar.")
+    if mode == "summary":
+        return WeeklyPlanResponse(plan=build_weekly_summary(payload))
+    if mode != "full":
+        raise HTTPException(status_code=400, detail="mode must be one of: full, summary.")
 
-    # Basic validation
-    if not payload.subjects:
-        raise HTTPException(status_code=400, detail="At least one subject is required.")
+    plan = build_weekly_plan(payload, allow_downgrade=True)
+    if metrics and "days" in plan:
+        # The plan may be shared with coalesced requests; do not mutate it.
+        plan = {**plan, "metrics": compute_plan_metrics(plan)}
+    if fmt == "columnar" and "days" in plan:
+        plan = to_columnar(plan)
 
-    if payload.weekly_hours <= 0:
-        raise HTTPException(status_code=400, detail="weekly_hours must be > 0.")
+    return WeeklyPlanResponse(plan=plan)
 
-    # Normalize start_date
-    if not payload.availability.start_date:
-        payload.availability.start_date = date.today().isoformat()
+
+def build_weekly_plan(payload: WeeklyPlanRequest, allow_downgrade: bool = False) -> Dict[str, Any]:
+    """
+    Validate a weekly-mode request, admit it and run the allocator.
+
+    Shared by every endpoint that needs a weekly plan (JSON, exports).
+    With allow_downgrade, an expensive request arriving while the server
+    is busy gets the summary preview instead (plan["mode"] == "summary").
+    """
+    _validate_weekly_request(payload)
+    cost = weekly_request_cost(payload)
 
     # Delegate to allocator.
     # Allocator handles:
@@ -64,10 +131,140 @@ def generate_weekly_plan_endpoint(payload: WeeklyPlanRequest) -> WeeklyPlanRespo
     # - Weekly minutes distribution
     # - Cognitive load rules
     # - Fairness adjustments
-    plan_dict = generate_weekly_plan(
-        subjects=[s.dict() for s in payload.subjects],
+    def run() -> Dict[str, Any]:
+        with admitted(cost, allow_downgrade) as action:
+            if action == DOWNGRADE:
+                return summarize_weekly_plan(
+                    subjects=[s.to_allocator() for s in payload.subjects],
+                    weekly_hours=payload.weekly_hours,
+                    availability=payload.availability.to_allocator(),
+                )
+            return _run_allocator(payload, budget_ms=PLAN_BUDGET_MS or None)
+
+    request = payload.dict()
+
+    # Plans cached on disk (by this or another worker, possibly before
+    # a restart) skip admission and the allocator.
+    def compute() -> Dict[str, Any]:
+        return cached_plan("weekly", request, run)
+
+    # Downgradable and non-downgradable callers must not share results.
+    namespace = "weekly:downgradable" if allow_downgrade else "weekly"
+    return coalesced(canonical_key(namespace, request), compute)
+
+
+def _run_allocator(payload: WeeklyPlanRequest, budget_ms: int | None = None) -> Dict[str, Any]:
+    return generate_weekly_plan(
+        subjects=[s.to_allocator() for s in payload.subjects],
         weekly_hours=payload.weekly_hours,
-        availability=payload.availability.dict(),
+        availability=payload.availability.to_allocator(),
+        budget_ms=budget_ms,
+        placement=payload.placement,
     )
 
-    return WeeklyPlanResponse(plan=plan_dict)
+
+def build_weekly_summary(payload: WeeklyPlanRequest) -> Dict[str, Any]:
+    """
+    Validate a weekly-mode request and compute its summary preview.
+    """
+    _validate_weekly_request(payload)
+
+    return summarize_weekly_plan(
+        subjects=[s.to_allocator() for s in payload.subjects],
+        weekly_hours=payload.weekly_hours,
+        availability=payload.availability.to_allocator(),
+    )
+
+
+@router.post("/diff", response_model=PlanDiffResponse)
+def weekly_diff_endpoint(body: WeeklyDiffRequest, response: Response) -> PlanDiffResponse:
+    """
+    Re-plan and return only what changed.
+
+    Computes the plan for `request` like POST /weekly/generate and, if
+    `base_etag` names a plan this server recently returned, answers
+    with a day/block patch against it; otherwise with the full plan.
+    Either way `etag` identifies the new plan for the next re-plan.
+    """
+    plan = build_weekly_plan(body.request)
+    return plan_diff_response("weekly", plan, body.base_etag, response)
+
+
+@router.post("/jobs", status_code=202, response_model=JobCreatedResponse)
+def create_weekly_job_endpoint(payload: WeeklyPlanRequest) -> JobCreatedResponse:
+    """
+    Queue a weekly plan for background generation.
+
+    Accepts the same body as POST /weekly/generate and validates it up
+    front. Poll GET /jobs/{job_id} for the result.
+    """
+    _validate_weekly_request(payload)
+    job_id = get_queue().enqueue("weekly", payload.dict())
+    return JobCreatedResponse(job_id=job_id, status="queued")
+
+
+def _run_weekly_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    request = WeeklyPlanRequest(**payload)
+    _validate_weekly_request(request)
+    return cached_plan("weekly", request.dict(), lambda: _run_allocator(request))
+
+
+register_runner("weekly", _run_weekly_job)
+
+
+@router.post("/sweep", response_model=SweepResponse)
+def weekly_sweep_endpoint(body: WeeklySweepRequest) -> SweepResponse:
+    """
+    What-if sweep over allocator weights for one weekly request.
+
+    Returns per-subject minutes and summary metrics for each grid point.
+    Admitted at the request's cost times the number of grid points
+    (413 when too large, 429 when busy); never downgraded.
+    """
+    _validate_weekly_request(body.request)
+    validate_sweep_grid(len(body.settings))
+
+    # Every grid point covers the whole request.
+    cost = weekly_request_cost(body.request) * len(body.settings)
+    with admitted(cost):
+        results = sweep_weekly_settings(
+            subjects=[s.to_allocator() for s in body.request.subjects],
+            weekly_hours=body.request.weekly_hours,
+            availability=body.request.availability.to_allocator(),
+            settings_grid=[replace(DEFAULT_SETTINGS, **w.dict()) for w in body.settings],
+        )
+
+    return SweepResponse(results=results)
+
+
+def _validate_weekly_request(payload: WeeklyPlanRequest) -> None:
+    # Requests referencing a saved profile are completed from it first.
+    resolve_profile(payload, "weekly")
+
+    # Basic validation
+    if not payload.subjects:
+        raise HTTPException(status_code=400, detail="At least one subject is required.")
+
+    # Subjects sent without topics take them from the referenced catalog.
+    resolve_catalog_topics(payload)
+
+    # Ids derived from names keep re-plans of id-less requests diffable.
+    assign_stable_ids(payload.subjects)
+
+    if payload.weekly_hours <= 0:
+        raise HTTPException(status_code=400, detail="weekly_hours must be > 0.")
+
+    # Normalize start_date
+    if not payload.availability.start_date:
+        payload.availability.start_date = date.today().isoformat()
+
+    try:
+        parse_windows(payload.availability.windows_per_weekday)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"windows_per_weekday: {exc}")
+
+    if payload.placement not in PLACEMENT_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"placement must be one of: {', '.join(PLACEMENT_MODES)}.",
+        )
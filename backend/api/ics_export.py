@@ -0,0 +1,41 @@
+from typing import Dict, Any
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from .schemas import ExamPlanRequest, WeeklyPlanRequest
+from .generate_exam_plan import build_exam_plan
+from .generate_weekly_plan import build_weekly_plan
+from core.utils.ics_utils import render_plan_ics
+
+router = APIRouter(prefix="/ics", tags=["ics"])
+
+
+@router.post("/exam")
+def export_exam_plan_ics(payload: ExamPlanRequest) -> StreamingResponse:
+    """
+    Generate an exam plan and stream it back as an .ics calendar.
+
+    Accepts the same body as POST /exam/generate.
+    """
+    plan = build_exam_plan(payload)
+    return _ics_response(plan, calendar_name="Exam study plan", filename="exam-plan.ics")
+
+
+@router.post("/weekly")
+def export_weekly_plan_ics(payload: WeeklyPlanRequest) -> StreamingResponse:
+    """
+    Generate a weekly plan and stream it back as an .ics calendar.
+
+    Accepts the same body as POST /weekly/generate.
+    """
+    plan = build_weekly_plan(payload)
+    return _ics_response(plan, calendar_name="Weekly study plan", filename="weekly-plan.ics")
+
+
+def _ics_response(plan: Dict[str, Any], calendar_name: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        render_plan_ics(iter(plan.get("days", [])), calendar_name=calendar_name),
+        media_type="text/calendar; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,160 @@
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Set
+
+from fastapi import APIRouter, HTTPException
+
+from .schemas import JobStatusResponse
+from database.job_queue import JobQueue
+from config import settings
+
+router = APIRouter(tags=["jobs"])
+
+# kind -> function(payload dict) -> plan dict; registered by the plan routers.
+_runners: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+
+@lru_cache(maxsize=1)
+def get_queue() -> JobQueue:
+    return JobQueue(settings.JOBS_DB_PATH)
+
+
+def register_runner(kind: str, runner: Callable[[Dict[str, Any]], Dict[str, Any]]) -> None:
+    _runners[kind] = runner
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+def get_job_endpoint(job_id: str) -> JobStatusResponse:
+    """
+    Poll a background plan job.
+
+    status is one of "queued", "running", "done", "failed"; result holds
+    the plan once done, error the failure detail once failed.
+    """
+    job = get_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+
+    return JobStatusResponse(
+        id=job["id"],
+        kind=job["kind"],
+        status=job["status"],
+        result=job["result"],
+        error=job["error"],
+    )
+
+
+class JobWorkers:
+    """
+    Local worker threads that pull jobs from the persistent queue.
+
+    Idle workers poll every `poll_seconds`. A maintenance thread renews
+    the lease of the jobs this process is running every quarter lease,
+    requeues jobs whose lease ran out (their process died, in this or
+    any other worker process) and deletes finished jobs older than
+    `retention_seconds`.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        workers: int,
+        poll_seconds: float,
+        lease_seconds: float,
+        retention_seconds: float,
+    ) -> None:
+        self.queue = queue
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.retention_seconds = retention_seconds
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._held: Set[str] = set()
+        self._held_lock = threading.Lock()
+
+    def start(self) -> None:
+        threads = [threading.Thread(target=self._maintain, name="plan-job-lease", daemon=True)]
+        threads += [
+            threading.Thread(target=self._loop, name=f"plan-job-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in threads:
+            t.start()
+        self._threads = threads
+
+    def stop(self) -> None:
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout=5)
+        self._threads = []
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            job = self.queue.claim()
+            if job is None:
+                self._stop.wait(self.poll_seconds)
+                continue
+
+            with self._held_lock:
+                self._held.add(job["id"])
+            try:
+                self._run(job)
+            finally:
+                with self._held_lock:
+                    self._held.discard(job["id"])
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        runner = _runners.get(job["kind"])
+        if runner is None:
+            self.queue.fail(job["id"], f"Unknown job kind: {job['kind']}")
+            return
+
+        try:
+            result = runner(job["payload"])
+        except Exception as exc:
+            # HTTPException carries a user-facing detail; anything else
+            # is reported by type only.
+            detail = getattr(exc, "detail", None) or type(exc).__name__
+            self.queue.fail(job["id"], str(detail))
+        else:
+            self.queue.complete(job["id"], result)
+
+    def _maintain(self) -> None:
+        while True:
+            with self._held_lock:
+                held = list(self._held)
+            try:
+                if held:
+                    self.queue.heartbeat(held)
+                self.queue.requeue_stale(self.lease_seconds)
+                self.queue.purge_finished(self.retention_seconds)
+            except sqlite3.Error:
+                # A busy or briefly unavailable database only delays the
+                # next renewal; leases outlast several missed ones.
+                pass
+            if self._stop.wait(self.lease_seconds / 4):
+                return
+
+
+_workers: List[JobWorkers] = []
+
+
+def start_workers() -> None:
+    if _workers or settings.JOB_WORKERS <= 0:
+        return
+    workers = JobWorkers(
+        get_queue(),
+        workers=settings.JOB_WORKERS,
+        poll_seconds=settings.JOB_POLL_SECONDS,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+        retention_seconds=settings.JOB_RETENTION_SECONDS,
+    )
+    workers.start()
+    _workers.append(workers)
+
+
+def stop_workers() -> None:
+    while _workers:
+        _workers.pop().stop()
@@ -0,0 +1,43 @@
+from typing import Dict, Any
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from .schemas import ExamPlanRequest, WeeklyPlanRequest
+from .generate_exam_plan import build_exam_plan
+from .generate_weekly_plan import build_weekly_plan
+from core.utils.pdf_utils import render_plan_pdf
+
+router = APIRouter(prefix="/pdf", tags=["pdf"])
+
+
+@router.post("/exam")
+def export_exam_plan_pdf(payload: ExamPlanRequest) -> StreamingResponse:
+    """
+    Generate an exam plan and stream it back as a PDF.
+
+    Accepts the same body as POST /exam/generate. Pages are rendered
+    one at a time while the response is being sent.
+    """
+    plan = build_exam_plan(payload)
+    return _pdf_response(plan, title="Exam study plan", filename="exam-plan.pdf")
+
+
+@router.post("/weekly")
+def export_weekly_plan_pdf(payload: WeeklyPlanRequest) -> StreamingResponse:
+    """
+    Generate a weekly plan and stream it back as a PDF.
+
+    Accepts the same body as POST /weekly/generate.
+    """
+    plan = build_weekly_plan(payload)
+    title = f"Weekly study plan ({plan['week_start']})" if plan.get("week_start") else "Weekly study plan"
+    return _pdf_response(plan, title=title, filename="weekly-plan.pdf")
+
+
+def _pdf_response(plan: Dict[str, Any], title: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        render_plan_pdf(iter(plan.get("days", [])), title=title),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,50 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+import sqlite3
+
+from core.allocator import ALLOCATOR_VERSION
+from core.utils.single_flight import canonical_key
+from database.plan_cache import PlanCache
+from config import settings
+
+
+@lru_cache(maxsize=1)
+def get_plan_cache() -> Optional[PlanCache]:
+    if settings.PLAN_CACHE_MAX_BYTES <= 0:
+        return None
+    return PlanCache(settings.PLAN_CACHE_DB_PATH, settings.PLAN_CACHE_MAX_BYTES)
+
+
+def cached_plan(
+    kind: str,
+    request: Dict[str, Any],
+    compute: Callable[[], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Serve the plan for `request` from the disk cache, or compute and
+    store it.
+
+    Partial plans (compute budget ran out) and summary downgrades are
+    returned but not stored: a later request may get the full plan. A
+    cache that cannot be read or written (disk full, locked for longer
+    than the busy timeout) counts as a miss.
+    """
+    cache = get_plan_cache()
+    if cache is None:
+        return compute()
+
+    key = canonical_key(f"{kind}:v{ALLOCATOR_VERSION}", request)
+    try:
+        plan = cache.get(key)
+    except sqlite3.Error:
+        plan = None
+    if plan is not None:
+        return plan
+
+    plan = compute()
+    if not plan.get("partial") and plan.get("mode") != "summary":
+        try:
+            cache.put(key, plan)
+        except sqlite3.Error:
+            pass
+    return plan
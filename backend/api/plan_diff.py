@@ -0,0 +1,38 @@
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from fastapi import Response
+
+from .schemas import PlanDiffResponse
+from core.utils.plan_diff import diff_plans, plan_etag
+from database.plan_store import PlanStore
+from config import settings
+
+
+@lru_cache(maxsize=1)
+def get_plan_store() -> PlanStore:
+    return PlanStore(settings.PLANS_DB_PATH, settings.PLAN_STORE_MAX_PLANS)
+
+
+def plan_diff_response(
+    kind: str,
+    plan: Dict[str, Any],
+    base_etag: Optional[str],
+    response: Response,
+) -> PlanDiffResponse:
+    """
+    Store `plan` under its ETag and answer with a patch against the
+    client's base plan, or with the full plan when the base is unknown
+    (never sent, expired, or from the other mode). The plan is stored
+    as a re-plan of the base, when there is one.
+    """
+    store = get_plan_store()
+    etag = plan_etag(plan)
+    store.put(etag, kind, plan, base_etag)
+    response.headers["ETag"] = f'"{etag}"'
+
+    base = store.get(base_etag, kind) if base_etag else None
+    if base is None:
+        return PlanDiffResponse(etag=etag, plan=plan)
+
+    return PlanDiffResponse(etag=etag, base_etag=base_etag, patch=diff_plans(base, plan))
@@ -0,0 +1,191 @@
+from contextvars import ContextVar, Token
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+from uuid import uuid4
+
+from fastapi import APIRouter, HTTPException, Response
+from pydantic import BaseModel, ValidationError, parse_obj_as
+
+from .auth import USER_HEADER
+from .schemas import (
+    SubjectProfileModel,
+    ProfileResponse,
+    ProfileListResponse,
+    ProfileSummary,
+    ExamPlanRequest,
+    ExamSubjectModel,
+    ExamAvailabilityModel,
+    WeeklyPlanRequest,
+    WeeklySubjectModel,
+    WeeklyAvailabilityModel,
+)
+from database.profile_store import ProfileStore
+from config import settings
+
+router = APIRouter(prefix="/profiles", tags=["profiles"])
+
+# kind -> (subject model, availability model)
+PROFILE_KINDS = {
+    "exam": (ExamSubjectModel, ExamAvailabilityModel),
+    "weekly": (WeeklySubjectModel, WeeklyAvailabilityModel),
+}
+
+# Set per request by the middleware in app.py, from auth.request_user.
+_current_user: ContextVar[Optional[str]] = ContextVar("current_user", default=None)
+
+
+def bind_user(user_id: Optional[str]) -> Token:
+    return _current_user.set(user_id or None)
+
+
+def unbind_user(token: Token) -> None:
+    _current_user.reset(token)
+
+
+def _require_user() -> str:
+    user_id = _current_user.get()
+    if not user_id:
+        raise HTTPException(status_code=401, detail=f"Profiles require the {USER_HEADER} header.")
+    return user_id
+
+
+@lru_cache(maxsize=1)
+def get_profile_store() -> ProfileStore:
+    return ProfileStore(settings.PROFILES_DB_PATH)
+
+
+# ---------------------------------------------------------
+# CRUD
+# ---------------------------------------------------------
+
+@router.post("", status_code=201, response_model=ProfileResponse)
+def create_profile_endpoint(body: SubjectProfileModel) -> ProfileResponse:
+    """
+    Save a subject profile. Subjects and topics without ids get one, so
+    plan requests can patch them by id later.
+    """
+    user_id = _require_user()
+    stored = _normalize(body)
+    meta = get_profile_store().create(user_id, body.kind, body.name, stored)
+    return ProfileResponse(**meta, **stored)
+
+
+@router.get("", response_model=ProfileListResponse)
+def list_profiles_endpoint() -> ProfileListResponse:
+    profiles = get_profile_store().list(_require_user())
+    return ProfileListResponse(profiles=[ProfileSummary(**p) for p in profiles])
+
+
+@router.get("/{profile_id}", response_model=ProfileResponse)
+def get_profile_endpoint(profile_id: str) -> ProfileResponse:
+    profile = get_profile_store().get(_require_user(), profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    body = profile.pop("body")
+    return ProfileResponse(**profile, **body)
+
+
+@router.put("/{profile_id}", response_model=ProfileResponse)
+def replace_profile_endpoint(profile_id: str, body: SubjectProfileModel) -> ProfileResponse:
+    """
+    Replace a profile; its version goes up by one.
+    """
+    user_id = _require_user()
+    stored = _normalize(body)
+    meta = get_profile_store().replace(user_id, profile_id, body.kind, body.name, stored)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return ProfileResponse(**meta, **stored)
+
+
+@router.delete("/{profile_id}", status_code=204)
+def delete_profile_endpoint(profile_id: str) -> Response:
+    if not get_profile_store().delete(_require_user(), profile_id):
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return Response(status_code=204)
+
+
+def _normalize(body: SubjectProfileModel) -> Dict[str, Any]:
+    """Validate a profile for its kind; fill in missing ids."""
+    if body.kind not in PROFILE_KINDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"kind must be one of: {', '.join(PROFILE_KINDS)}.",
+        )
+
+    subject_model, availability_model = PROFILE_KINDS[body.kind]
+    try:
+        subjects = parse_obj_as(List[subject_model], body.subjects)
+        availability = availability_model.parse_obj(body.availability)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors())
+
+    for subject in subjects:
+        subject.id = subject.id or uuid4().hex
+        for topic in subject.topics:
+            topic.id = topic.id or uuid4().hex
+
+    return {"subjects": [s.dict() for s in subjects], "availability": availability.dict()}
+
+
+# ---------------------------------------------------------
+# Plan requests
+# ---------------------------------------------------------
+
+@lru_cache(maxsize=settings.PROFILE_CACHE_SIZE)
+def _parsed_profile(user_id: str, profile_id: str, version: int) -> Tuple[Tuple[BaseModel, ...], BaseModel]:
+    """
+    A profile's subjects and availability as request models, parsed
+    once per version and shared by every request using that version.
+    Callers must deep-copy before handing them to a request.
+    """
+    profile = get_profile_store().get(user_id, profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+
+    subject_model, availability_model = PROFILE_KINDS[profile["kind"]]
+    body = profile["body"]
+    return (
+        tuple(subject_model.parse_obj(s) for s in body["subjects"]),
+        availability_model.parse_obj(body["availability"]),
+    )
+
+
+def resolve_profile(payload: Union[ExamPlanRequest, WeeklyPlanRequest], kind: str) -> None:
+    """
+    Merge payload.profile_id into the request, in place.
+
+    Profile subjects come first, in profile order; a request subject
+    with the same id replaces one, remove_subjects drops some, and
+    request subjects with other ids are appended. The request's
+    availability wins over the profile's. Afterwards the request is
+    self-contained (profile_id is cleared), so queued jobs and the plan
+    cache see the profile as it was at request time.
+    """
+    if payload.profile_id is not None:
+        user_id = _require_user()
+        found = get_profile_store().version(user_id, payload.profile_id)
+        if found is None:
+            raise HTTPException(status_code=404, detail="Profile not found.")
+        profile_kind, version = found
+        if profile_kind != kind:
+            raise HTTPException(status_code=400, detail=f"Profile is for {profile_kind} plans.")
+
+        subjects, availability = _parsed_profile(user_id, payload.profile_id, version)
+        removed = set(payload.remove_subjects)
+        patches = {s.id: s for s in payload.subjects if s.id}
+        merged = [
+            patches.pop(s.id, None) or s.copy(deep=True)
+            for s in subjects
+            if s.id not in removed
+        ]
+        merged.extend(s for s in payload.subjects if not s.id or s.id in patches)
+
+        payload.subjects = merged
+        if payload.availability is None:
+            payload.availability = availability.copy(deep=True)
+        payload.profile_id = None
+        payload.remove_subjects = []
+
+    if payload.availability is None:
+        raise HTTPException(status_code=400, detail="availability is required without a profile_id.")
@@ -1,6 +1,13 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+from uuid import uuid4
 from pydantic import BaseModel, Field
 
+from core.allocator.exam_allocator import ExamSubject, Availability
+from core.allocator.weekly_allocator import WeeklySubject, WeeklyAvailability
+from core.utils.syllabus import stable_subject_id, stable_topic_id
+from core.utils.time_utils import parse_date
+from core.engine.slot_placement import parse_windows, cap_minutes_to_windows
+
 
 # ============================================================
 # SHARED MODELS (unified schema)
@@ -17,6 +24,14 @@ class TopicModel(BaseModel):
     priority: int = Field(default=3, ge=1, le=5)
     familiarity: int = Field(default=3, ge=1, le=5)
 
+    def to_allocator(self) -> Dict[str, Any]:
+        return {
+            "id": self.id or uuid4().hex,
+            "name": self.name,
+            "priority": self.priority,
+            "familiarity": self.familiarity,
+        }
+
 
 class ExamAvailabilityModel(BaseModel):
     """
@@ -25,11 +40,25 @@ class ExamAvailabilityModel(BaseModel):
     - rest_dates: concrete dates to skip, "YYYY-MM-DD"
     - start_date: global start date
     - end_date: last study day (day before exam)
+    - windows_per_weekday: optional time windows, e.g.
+      {"Monday": ["07:00-08:00", "18:00-21:30"]}; blocks then get
+      concrete start/end times
     """
     minutes_per_weekday: Dict[str, int]
     rest_dates: List[str] = Field(default_factory=list)
     start_date: str  # "YYYY-MM-DD"
     end_date: str    # "YYYY-MM-DD"
+    windows_per_weekday: Dict[str, List[str]] = Field(default_factory=dict)
+
+    def to_allocator(self) -> Availability:
+        windows = parse_windows(self.windows_per_weekday)
+        return Availability(
+            start_date=parse_date(self.start_date),
+            end_date=parse_date(self.end_date),
+            minutes_per_weekday=cap_minutes_to_windows(self.minutes_per_weekday, windows),
+            rest_dates=[parse_date(d) for d in self.rest_dates],
+            windows=windows,
+        )
 
 
 class WeeklyAvailabilityModel(BaseModel):
@@ -39,6 +68,7 @@ class WeeklyAvailabilityModel(BaseModel):
     - rest_dates: concrete dates to skip, "YYYY-MM-DD"
     - start_date: week start
     - end_date: optional 7-day window end (frontend sends it; backend may ignore)
+    - windows_per_weekday: optional time windows (see ExamAvailabilityModel)
     """
     minutes_per_weekday: Dict[str, int]
     rest_dates: List[str] = Field(default_factory=list)
@@ -46,6 +76,39 @@ class WeeklyAvailabilityModel(BaseModel):
     # Frontend currently computes and sends this; allocator does not require it,
     # but we accept it to avoid validation errors.
     end_date: Optional[str] = None
+    windows_per_weekday: Dict[str, List[str]] = Field(default_factory=dict)
+
+    def to_allocator(self) -> WeeklyAvailability:
+        windows = parse_windows(self.windows_per_weekday)
+        return WeeklyAvailability(
+            minutes_per_weekday=cap_minutes_to_windows(self.minutes_per_weekday, windows),
+            rest_dates=[parse_date(d) for d in self.rest_dates],
+            start_date=parse_date(self.start_date),
+            windows=windows,
+        )
+
+
+def assign_stable_ids(subjects: List[Union["ExamSubjectModel", "WeeklySubjectModel"]]) -> None:
+    """
+    Fill in missing subject and topic ids, in place, derived from names:
+    the frontend sends none, and re-plans must keep the ids of the
+    previous request for /diff to match blocks. Repeated names get an
+    occurrence suffix, so ids stay unique within a request.
+    """
+    subject_names: Dict[str, int] = {}
+    for subject in subjects:
+        if not subject.id:
+            subject.id = stable_subject_id(_occurrence(subject.name, subject_names))
+        topic_names: Dict[str, int] = {}
+        for topic in subject.topics:
+            if not topic.id:
+                topic.id = stable_topic_id(subject.id, _occurrence(topic.name, topic_names))
+
+
+def _occurrence(name: str, seen: Dict[str, int]) -> str:
+    n = seen.get(name, 0)
+    seen[name] = n + 1
+    return name if n == 0 else f"{name}\x1f{n}"
 
 
 # ============================================================
@@ -65,6 +128,20 @@ class ExamSubjectModel(BaseModel):
     difficulty: int = Field(default=3, ge=1, le=5)
     confidence: int = Field(default=3, ge=1, le=5)
     topics: List[TopicModel] = Field(default_factory=list)
+    # Subject key in the request's catalog (defaults to name); used
+    # when topics is empty.
+    catalog_subject: Optional[str] = None
+
+    def to_allocator(self) -> ExamSubject:
+        """Typed hand-off to the allocator; skips its dict parsing."""
+        return ExamSubject(
+            id=self.id or uuid4().hex,
+            name=self.name,
+            exam_date=parse_date(self.exam_date),
+            difficulty=self.difficulty,
+            confidence=self.confidence,
+            topics=[t.to_allocator() for t in self.topics],
+        )
 
 
 class ExamPlanRequest(BaseModel):
@@ -72,9 +149,23 @@ class ExamPlanRequest(BaseModel):
     Request body for POST /exam/generate:
     - subjects: list of exam subjects
     - availability: exam availability window
+    - scheduler: "proportional" (default), "edf" (deadline-aware,
+      reports per-exam shortfall) or "segmented" (split at exam dates,
+      planned in parallel)
+    - catalog_id: optional imported syllabus (POST /catalogs); subjects
+      without topics take theirs from it
+    - profile_id: optional saved profile (POST /profiles) supplying
+      subjects and availability; subjects sent here replace the
+      profile's subject with the same id (or are added),
+      remove_subjects drops profile subjects by id, and availability
+      sent here replaces the profile's
     """
-    subjects: List[ExamSubjectModel]
-    availability: ExamAvailabilityModel
+    subjects: List[ExamSubjectModel] = Field(default_factory=list)
+    availability: Optional[ExamAvailabilityModel] = None
+    scheduler: str = "proportional"
+    catalog_id: Optional[str] = None
+    profile_id: Optional[str] = None
+    remove_subjects: List[str] = Field(default_factory=list)
 
 
 class ExamPlanResponse(BaseModel):
@@ -85,6 +176,46 @@ class ExamPlanResponse(BaseModel):
     plan: Dict[str, Any]
 
 
+class ExamFeasibilityResponse(BaseModel):
+    """
+    Response body for POST /exam/feasibility:
+    - feasible: True when every exam's demand fits before its date
+    - total_capacity: study minutes in the whole window
+    - exams: per exam, in exam_date order:
+        { id, name, exam_date, demand_minutes, capacity_minutes, slack_minutes, feasible }
+    """
+    feasible: bool
+    total_capacity: int
+    exams: List[Dict[str, Any]]
+
+
+class ExamWeightsModel(BaseModel):
+    """
+    One grid point for POST /exam/sweep (mirrors AllocatorSettings).
+    """
+    difficulty_weight: float = 0.5
+    confidence_weight: float = 0.3
+    urgency_weight: float = 0.2
+
+
+class ExamSweepRequest(BaseModel):
+    """
+    Request body for POST /exam/sweep:
+    - request: the exam plan request to evaluate
+    - settings: grid of weight settings
+    """
+    request: ExamPlanRequest
+    settings: List[ExamWeightsModel]
+
+
+class SweepResponse(BaseModel):
+    """
+    Response body for the /sweep endpoints:
+    - results: one { settings, minutes, metrics } entry per grid point, in order
+    """
+    results: List[Dict[str, Any]]
+
+
 # ============================================================
 # WEEKLY PLAN (unified)
 # ============================================================
@@ -101,6 +232,17 @@ class WeeklySubjectModel(BaseModel):
     difficulty: int = Field(default=3, ge=1, le=5)
     confidence: int = Field(default=3, ge=1, le=5)
     topics: List[TopicModel] = Field(default_factory=list)
+    catalog_subject: Optional[str] = None  # see ExamSubjectModel
+
+    def to_allocator(self) -> WeeklySubject:
+        """Typed hand-off to the allocator; skips its dict parsing."""
+        return WeeklySubject(
+            id=self.id or uuid4().hex,
+            name=self.name,
+            difficulty=self.difficulty,
+            confidence=self.confidence,
+            topics=[t.to_allocator() for t in self.topics],
+        )
 
 
 class WeeklyPlanRequest(BaseModel):
@@ -109,10 +251,20 @@ class WeeklyPlanRequest(BaseModel):
     - subjects: list of weekly subjects
     - weekly_hours: total hours per week
     - availability: weekly availability
+    - placement: "greedy" (default), "ffd" (first-fit decreasing) or
+      "best_fit" (best-fit decreasing); the packing modes report
+      utilization and splits under plan["placement"]
+    - catalog_id: optional imported syllabus (see ExamPlanRequest)
+    - profile_id, remove_subjects: optional saved profile and patch
+      (see ExamPlanRequest)
     """
-    subjects: List[WeeklySubjectModel]
+    subjects: List[WeeklySubjectModel] = Field(default_factory=list)
     weekly_hours: float
-    availability: WeeklyAvailabilityModel
+    availability: Optional[WeeklyAvailabilityModel] = None
+    placement: str = "greedy"
+    catalog_id: Optional[str] = None
+    profile_id: Optional[str] = None
+    remove_subjects: List[str] = Field(default_factory=list)
 
 
 class WeeklyPlanResponse(BaseModel):
@@ -121,3 +273,170 @@ class WeeklyPlanResponse(BaseModel):
     - plan: dict consumed by WeeklyTimeline (week_start + days -> blocks)
     """
     plan: Dict[str, Any]
+
+
+class WeeklyWeightsModel(BaseModel):
+    """
+    One grid point for POST /weekly/sweep (weight fields of WeeklySettings).
+    """
+    difficulty_weight: float = 0.6
+    confidence_weight: float = 0.4
+
+
+class WeeklySweepRequest(BaseModel):
+    """
+    Request body for POST /weekly/sweep:
+    - request: the weekly plan request to evaluate
+    - settings: grid of weight settings
+    """
+    request: WeeklyPlanRequest
+    settings: List[WeeklyWeightsModel]
+
+
+# ============================================================
+# RE-PLAN DIFFS
+# ============================================================
+
+
+class ExamDiffRequest(BaseModel):
+    """
+    Request body for POST /exam/diff:
+    - request: the new exam plan request
+    - base_etag: ETag of the plan the client already has (optional)
+    """
+    request: ExamPlanRequest
+    base_etag: Optional[str] = None
+
+
+class WeeklyDiffRequest(BaseModel):
+    """
+    Request body for POST /weekly/diff (see ExamDiffRequest).
+    """
+    request: WeeklyPlanRequest
+    base_etag: Optional[str] = None
+
+
+class PlanDiffResponse(BaseModel):
+    """
+    Response body for the /diff endpoints:
+    - etag: ETag of the new plan (send it as base_etag next time)
+    - base_etag: set when `patch` is relative to that plan
+    - patch: day/block patch (see core.utils.plan_diff.diff_plans)
+    - plan: the full plan, when the base plan is unknown
+    """
+    etag: str
+    base_etag: Optional[str] = None
+    patch: Optional[Dict[str, Any]] = None
+    plan: Optional[Dict[str, Any]] = None
+
+
+# ============================================================
+# BACKGROUND JOBS
+# ============================================================
+
+
+class JobCreatedResponse(BaseModel):
+    """
+    Response body for POST /exam/jobs and POST /weekly/jobs (202).
+    """
+    job_id: str
+    status: str
+
+
+class JobStatusResponse(BaseModel):
+    """
+    Response body for GET /jobs/{job_id}:
+    - status: "queued" | "running" | "done" | "failed"
+    - result: the plan, once done
+    - error: failure detail, once failed
+    """
+    id: str
+    kind: str
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+# ============================================================
+# SYLLABUS CATALOGS
+# ============================================================
+
+
+class CatalogResponse(BaseModel):
+    """
+    Response body for POST /catalogs (201) and GET /catalogs/{catalog_id}:
+    - subjects: subject key -> number of topics
+    """
+    id: str
+    name: str
+    topic_count: int
+    created_at: float
+    subjects: Dict[str, int]
+
+
+# ============================================================
+# SUBJECT PROFILES
+# ============================================================
+
+
+class SubjectProfileModel(BaseModel):
+    """
+    Request body for POST /profiles and PUT /profiles/{profile_id}:
+    - kind: "exam" or "weekly"; subjects and availability are validated
+      as in ExamPlanRequest / WeeklyPlanRequest
+    - name: label shown in profile lists
+    """
+    kind: str
+    name: str = ""
+    subjects: List[Dict[str, Any]]
+    availability: Dict[str, Any]
+
+
+class ProfileSummary(BaseModel):
+    id: str
+    kind: str
+    name: str
+    version: int
+    updated_at: float
+
+
+class ProfileResponse(ProfileSummary):
+    """
+    Response body for the /profiles endpoints: the stored profile, with
+    subject and topic ids filled in.
+    """
+    subjects: List[Dict[str, Any]]
+    availability: Dict[str, Any]
+
+
+class ProfileListResponse(BaseModel):
+    """
+    Response body for GET /profiles (most recently updated first).
+    """
+    profiles: List[ProfileSummary]
+
+
+# ============================================================
+# COHORT ANALYTICS
+# ============================================================
+
+
+class CohortReportResponse(BaseModel):
+    """
+    Response body for GET /analytics/cohort (see
+    core.utils.cohort_analytics.cohort_report):
+    - sample: which plans the figures are drawn from
+    - plans: plans aggregated
+    - dates: per calendar date, parallel lists of plans, total/mean
+      minutes and share of capacity used
+    - subjects: per subject name, plans, minutes and share of all minutes
+    - subjects_per_plan: histogram, distinct subjects -> plans
+    - capacity: minutes vs. offered capacity over plans with known
+      availability, plus a per-plan utilization histogram
+    """
+    sample: str
+    plans: int
+    dates: Dict[str, List[Any]]
+    subjects: List[Dict[str, Any]]
+    subjects_per_plan: Dict[str, int]
+    capacity: Dict[str, Any]
@@ -0,0 +1,26 @@
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict
+
+from fastapi import HTTPException
+
+from core.utils.single_flight import SingleFlight
+from config.settings import COALESCE_TIMEOUT_SECONDS
+
+# One per process, shared by every plan endpoint. Identical concurrent
+# requests (double clicks, client retries) share one allocator run; keys
+# are namespaced by plan kind (see canonical_key).
+_flight = SingleFlight()
+
+
+def coalesced(key: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Run `compute` once per key across concurrent identical requests.
+    The returned plan may be shared with other requests; do not mutate it.
+    """
+    try:
+        return _flight.do(key, compute, timeout=COALESCE_TIMEOUT_SECONDS)
+    except FutureTimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="An identical request is still being processed. Please retry shortly.",
+        )
@@ -0,0 +1,96 @@
+# backend/config/settings.py
+"""
+Runtime settings for the API layer.
+
+Every value can be overridden with an environment variable of the same
+name prefixed with STUDY_ (e.g. STUDY_MAX_SWEEP_POINTS=500).
+"""
+from __future__ import annotations
+import os
+from pathlib import Path
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(f"STUDY_{name}")
+    return int(raw) if raw not in (None, "") else default
+
+
+def _env_str(name: str, default: str) -> str:
+    raw = os.getenv(f"STUDY_{name}")
+    return raw if raw not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(f"STUDY_{name}")
+    return float(raw) if raw not in (None, "") else default
+
+
+# Largest settings grid accepted by the /sweep endpoints.
+MAX_SWEEP_POINTS = _env_int("MAX_SWEEP_POINTS", 10_000)
+
+# Process pool size for the "segmented" exam scheduler (0 = CPU count).
+SEGMENT_WORKERS = _env_int("SEGMENT_WORKERS", 0)
+
+# How long a request waits for an identical in-flight request before
+# giving up with 503.
+COALESCE_TIMEOUT_SECONDS = _env_float("COALESCE_TIMEOUT_SECONDS", 30.0)
+
+# Threads serving the synchronous endpoints (0 = the AnyIO default of
+# 40). Every plan request holds one for its whole allocator run.
+THREADPOOL_SIZE = _env_int("THREADPOOL_SIZE", 0)
+
+# Compute budget per synchronous plan request, in milliseconds (0 = no
+# limit). When it runs out the allocator returns a "partial" plan whose
+# remaining days are filled proportionally. Background jobs are exempt.
+PLAN_BUDGET_MS = _env_int("PLAN_BUDGET_MS", 5_000)
+
+# Admission control for plan requests, in cost units
+# (days x subjects x topics per subject; see core/utils/admission.py).
+ADMISSION_MAX_COST = _env_int("ADMISSION_MAX_COST", 25_000_000)
+ADMISSION_CAPACITY = _env_int("ADMISSION_CAPACITY", 10_000_000)
+ADMISSION_DOWNGRADE_COST = _env_int("ADMISSION_DOWNGRADE_COST", 2_000_000)
+ADMISSION_MAX_QUEUE = _env_int("ADMISSION_MAX_QUEUE", 16)
+ADMISSION_QUEUE_TIMEOUT_SECONDS = _env_float("ADMISSION_QUEUE_TIMEOUT_SECONDS", 10.0)
+
+# Directory for local persistent state (SQLite databases).
+DATA_DIR = Path(_env_str("DATA_DIR", str(Path(__file__).resolve().parent.parent / "data")))
+
+# Background plan jobs (POST /exam/jobs, /weekly/jobs).
+JOBS_DB_PATH = DATA_DIR / "jobs.sqlite3"
+JOB_WORKERS = _env_int("JOB_WORKERS", 2)
+JOB_POLL_SECONDS = _env_float("JOB_POLL_SECONDS", 0.5)
+# Running jobs hold a lease that their process renews every quarter
+# lease; jobs whose lease ran out (their process died) are requeued.
+JOB_LEASE_SECONDS = _env_float("JOB_LEASE_SECONDS", 120.0)
+# Done and failed jobs (with their payload and plan) are deleted this
+# long after they finish.
+JOB_RETENTION_SECONDS = _env_float("JOB_RETENTION_SECONDS", 7 * 24 * 3600.0)
+
+# Plans kept for re-plan diffs (POST /exam/diff, /weekly/diff).
+PLANS_DB_PATH = DATA_DIR / "plans.sqlite3"
+PLAN_STORE_MAX_PLANS = _env_int("PLAN_STORE_MAX_PLANS", 10_000)
+
+# Disk cache of computed plans, keyed by request hash + allocator
+# version; shared by all workers and kept across restarts. Bounded by
+# compressed size (0 = cache disabled).
+PLAN_CACHE_DIR = Path(_env_str("PLAN_CACHE_DIR", str(DATA_DIR)))
+PLAN_CACHE_DB_PATH = PLAN_CACHE_DIR / "plan_cache.sqlite3"
+PLAN_CACHE_MAX_BYTES = _env_int("PLAN_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+
+# Imported syllabus catalogs (POST /catalogs), referenced by plan
+# requests through catalog_id.
+CATALOG_DB_PATH = DATA_DIR / "catalogs.sqlite3"
+CATALOG_MAX_TOPICS = _env_int("CATALOG_MAX_TOPICS", 200_000)
+# Topics parsed per database write during an import.
+CATALOG_IMPORT_BATCH = _env_int("CATALOG_IMPORT_BATCH", 1_000)
+# (catalog, subject) topic lists kept in memory per worker.
+CATALOG_CACHE_SUBJECTS = _env_int("CATALOG_CACHE_SUBJECTS", 256)
+
+# Saved subject profiles (POST /profiles), referenced by plan requests
+# through profile_id.
+PROFILES_DB_PATH = DATA_DIR / "profiles.sqlite3"
+# Parsed profiles kept in memory per worker.
+PROFILE_CACHE_SIZE = _env_int("PROFILE_CACHE_SIZE", 512)
+
+# Cohort analytics (GET /analytics/cohort): most plans read per report.
+ANALYTICS_MAX_PLANS = _env_int("ANALYTICS_MAX_PLANS", 100_000)
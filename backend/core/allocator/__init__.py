@@ -0,0 +1,4 @@
+# Bump whenever a change to the allocators (or to the engine/utils they
+# call) can change the plan produced for the same request. It is part
+# of every plan cache key, so stale cached plans are never served.
+ALLOCATOR_VERSION = "2"
@@ -4,7 +4,21 @@ Exam allocator (v2, unified schema)
 Generates a multi-exam, multi-subject, deadline-driven study plan.
 
 Public API:
-    generate_exam_plan(subjects, availability) -> dict
+    generate_exam_plan(subjects, availability, scheduler="proportional", max_workers=None) -> dict
+    check_exam_feasibility(subjects, availability) -> dict
+    summarize_exam_plan(subjects, availability, scheduler="proportional") -> dict
+    sweep_exam_settings(subjects, availability, settings_grid) -> list
+
+Scheduler modes:
+    - "proportional": round-robin by urgency over the whole window (default)
+    - "edf": earliest-deadline-first; minutes are only placed strictly
+      before each exam's date, and any demand that cannot fit is
+      reported per exam in "shortfall" and redistributed to exams
+      that still have room
+    - "segmented": the window is split at exam dates (the set of active
+      exams is fixed inside each segment), segments are planned in
+      parallel across a process pool and topic rotation is stitched
+      afterwards in date order; output does not depend on worker count
 
 Conventions:
     - All dates in ISO format: "YYYY-MM-DD"
@@ -73,14 +87,20 @@ Internally, fairness and cognitive_load operate on blocks with a
 
 from __future__ import annotations
 from uuid import uuid4
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import heapq
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from datetime import date, datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
-from .cognitive_load import validate_day_plan
+from .cognitive_load import validate_day_plan, CLSettings
 from .fairness import adjust_for_fairness
-from ..engine.topic_rotation import pick_next_topic
+from ..engine.topic_rotation import pick_next_topic, round_robin_topic
+from ..engine.slot_placement import parse_windows, cap_minutes_to_windows, place_blocks
+from ..utils.time_utils import fill_days_in_order, summarize_day_loads, parse_date
+from ..utils.deadline import Deadline
 
 
 # ---------- Data structures ----------
@@ -115,6 +135,8 @@ class Availability:
     end_date: date
     minutes_per_weekday: Dict[str, int]
     rest_dates: List[date]
+    # Optional time-of-day windows per weekday, in minutes after midnight.
+    windows: Dict[str, List[Tuple[int, int]]] = field(default_factory=dict)
 
 
 @dataclass
@@ -129,6 +151,16 @@ class AllocatorSettings:
 
 DEFAULT_SETTINGS = AllocatorSettings()
 
+SCHEDULER_MODES = ("proportional", "edf", "segmented")
+
+# Blocks shorter than this are tails: they are folded into a longer
+# block of the same exam on the same day when there is one.
+MIN_BLOCK_MINUTES = 25
+
+# Below this many segments the "segmented" scheduler runs inline; pool
+# start-up and pickling cost more than they save.
+MIN_PARALLEL_SEGMENTS = 4
+
 
 # ---------- Public API ----------
 
@@ -136,13 +168,24 @@ DEFAULT_SETTINGS = AllocatorSettings()
 def generate_exam_plan(
     subjects: List[Dict[str, Any]],
     availability: Dict[str, Any],
+    scheduler: str = "proportional",
+    max_workers: int | None = None,
+    budget_ms: float | None = None,
 ) -> Dict[str, Any]:
     """
     Generate a deadline-driven exam plan based on the unified schema.
 
     Args:
-        subjects: list of subject dicts (unified exam-mode subjects).
-        availability: unified availability dict.
+        subjects: list of subject dicts (unified exam-mode subjects), or
+            ExamSubject instances, which are used as-is.
+        availability: unified availability dict, or an Availability.
+        scheduler: one of SCHEDULER_MODES.
+        max_workers: process pool size for the "segmented" scheduler
+            (None = CPU count, 1 = run inline).
+        budget_ms: compute budget for the scheduling loops (None = no
+            limit). When it runs out, days not yet reached are filled by
+            the cheap proportional fallback and the plan is flagged
+            "partial".
 
     Returns (public shape, consumed by frontend ExamTimeline):
         {
@@ -164,9 +207,14 @@ def generate_exam_plan(
                         }
                     ],
                 }
-            ]
+            ],
+            "shortfall": {exam_id: int, ...},   # "edf" scheduler only
+            "partial": True,                    # only when budget_ms ran out
         }
     """
+    if scheduler not in SCHEDULER_MODES:
+        raise ValueError(f"Unknown scheduler: {scheduler!r}")
+
     if not subjects:
         return {"days": []}
 
@@ -181,15 +229,24 @@ def generate_exam_plan(
     settings = DEFAULT_SETTINGS
 
     weights = _compute_exam_weights(exams_model, availability_model, settings)
-    minutes_per_exam = _allocate_minutes_per_exam(calendar_days, weights)
 
     # Internal plan uses "subjects": [...], for compatibility with
     # fairness and cognitive_load utilities.
-    raw_plan = _distribute_minutes_into_days(
-        calendar_days,
-        exams_model,
-        minutes_per_exam,
-    )
+    deadline = Deadline(budget_ms)
+    shortfall = None
+    if scheduler == "edf":
+        raw_plan, shortfall = _schedule_edf(calendar_days, exams_model, weights, deadline)
+    elif scheduler == "segmented":
+        raw_plan = _schedule_segmented(calendar_days, exams_model, weights, max_workers, deadline)
+    else:
+        minutes_per_exam = _allocate_minutes_per_exam(calendar_days, weights)
+        raw_plan = _distribute_minutes_into_days(
+            calendar_days,
+            exams_model,
+            minutes_per_exam,
+            deadline,
+        )
+    partial = raw_plan.get("partial", False)
 
     fair_plan = adjust_for_fairness(raw_plan)
 
@@ -198,50 +255,258 @@ def generate_exam_plan(
         validated = validate_day_plan(day)
         validated_days.append(validated)
 
-    # Convert internal shape (blocks with "subjects": [...]) to public
-    # shape (blocks with "subject": {...}) for exam mode.
-    public_days: List[Dict[str, Any]] = []
-    for day in validated_days:
-        blocks_out: List[Dict[str, Any]] = []
-        for block in day.get("blocks", []):
-            subjects_list = block.get("subjects", [])
-            subject_obj = subjects_list[0] if subjects_list else None
-
-            new_block = {
-                "minutes": block.get("minutes", 0),
+    public_days = _to_public_days(validated_days)
+
+    if availability_model.windows:
+        place_blocks(public_days, availability_model.windows)
+
+    plan: Dict[str, Any] = {"days": public_days}
+    if shortfall is not None:
+        plan["shortfall"] = shortfall
+    if partial:
+        plan["partial"] = True
+
+    return plan
+
+
+def check_exam_feasibility(
+    subjects: List[Dict[str, Any]],
+    availability: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Check, without building any blocks, whether each exam's weighted
+    minute demand fits into the study time available before its date.
+
+    Demand is the same per-exam allocation the default scheduler uses.
+    Exams are checked cumulatively in date order (earlier exams consume
+    capacity first), using capacity prefix sums over the calendar.
+
+    Returns:
+        {
+            "feasible": bool,
+            "total_capacity": int,
+            "exams": [
+                {
+                    "id": str,
+                    "name": str,
+                    "exam_date": "YYYY-MM-DD",
+                    "demand_minutes": int,
+                    "capacity_minutes": int,   # available before exam_date
+                    "slack_minutes": int,      # < 0 means it does not fit
+                    "feasible": bool,
+                }
+            ]
+        }
+    """
+    if not subjects:
+        return {"feasible": True, "total_capacity": 0, "exams": []}
+
+    exams_model = _parse_subjects_as_exams(subjects)
+    availability_model = _parse_availability(availability)
+    calendar_days = _build_calendar_days(availability_model)
+
+    weights = _compute_exam_weights(exams_model, availability_model, DEFAULT_SETTINGS)
+    demand = _allocate_minutes_per_exam(calendar_days, weights)
+
+    exams_by_date = sorted(exams_model, key=lambda e: e.exam_date)
+    capacities = _capacity_before_dates(calendar_days, exams_by_date)
+
+    exams_out: List[Dict[str, Any]] = []
+    cumulative_demand = 0
+    for e, cap in zip(exams_by_date, capacities):
+        cumulative_demand += demand[e.id]
+        slack = cap - cumulative_demand
+        exams_out.append(
+            {
+                "id": e.id,
+                "name": e.name,
+                "exam_date": e.exam_date.isoformat(),
+                "demand_minutes": demand[e.id],
+                "capacity_minutes": cap,
+                "slack_minutes": slack,
+                "feasible": slack >= 0,
             }
-            # Only include a subject if present; exam mode uses one subject per block.
-            if subject_obj is not None:
-                new_block["subject"] = subject_obj
+        )
 
-            blocks_out.append(new_block)
+    return {
+        "feasible": all(e["feasible"] for e in exams_out),
+        "total_capacity": sum(d["available_minutes"] for d in calendar_days),
+        "exams": exams_out,
+    }
 
-        public_days.append(
+
+def summarize_exam_plan(
+    subjects: List[Dict[str, Any]],
+    availability: Dict[str, Any],
+    scheduler: str = "proportional",
+) -> Dict[str, Any]:
+    """
+    Analytic preview of an exam plan: totals straight from the weighting
+    and apportionment stages. No blocks, topic rotation, fairness or
+    validation.
+
+    Returns:
+        {
+            "mode": "summary",
+            "subjects": [{"id": str, "name": str, "minutes": int}, ...],
+            "weekdays": {"Monday": int, ..., "Sunday": int},
+            "weeks": [{"week_start": "YYYY-MM-DD", "minutes": int}, ...],
+            "total_minutes": int,
+            "shortfall": {exam_id: int, ...},   # "edf" scheduler only
+        }
+    """
+    if scheduler not in SCHEDULER_MODES:
+        raise ValueError(f"Unknown scheduler: {scheduler!r}")
+
+    exams_model = _parse_subjects_as_exams(subjects) if subjects else []
+    availability_model = _parse_availability(availability)
+    calendar_days = _build_calendar_days(availability_model)
+
+    if not exams_model or not calendar_days:
+        summary = {"mode": "summary", "subjects": []}
+        summary.update(summarize_day_loads([]))
+        return summary
+
+    weights = _compute_exam_weights(exams_model, availability_model, DEFAULT_SETTINGS)
+
+    shortfall = None
+    if scheduler == "edf":
+        exams_by_date, minutes_per_exam, shortfall = _edf_demands(
+            calendar_days, exams_model, weights
+        )
+        # Feasible EDF demands fill every day before the last exam.
+        loads = fill_days_in_order(
+            calendar_days,
+            sum(minutes_per_exam.values()),
+            until=exams_by_date[-1].exam_date,
+        )
+    elif scheduler == "segmented":
+        minutes_per_exam = {e.id: 0 for e in exams_model}
+        loads = []
+        for seg_days, _, budget in _segment_budgets(calendar_days, exams_model, weights):
+            for exam_id, minutes in budget.items():
+                minutes_per_exam[exam_id] += minutes
+            loads.extend((d["date"], d["available_minutes"]) for d in seg_days)
+    else:
+        minutes_per_exam = _allocate_minutes_per_exam(calendar_days, weights)
+        loads = fill_days_in_order(calendar_days, sum(minutes_per_exam.values()))
+
+    summary = {
+        "mode": "summary",
+        "subjects": [
+            {"id": e.id, "name": e.name, "minutes": minutes_per_exam.get(e.id, 0)}
+            for e in exams_model
+        ],
+    }
+    summary.update(summarize_day_loads(loads))
+    if shortfall is not None:
+        summary["shortfall"] = shortfall
+
+    return summary
+
+
+def sweep_exam_settings(
+    subjects: List[Dict[str, Any]],
+    availability: Dict[str, Any],
+    settings_grid: List[AllocatorSettings],
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate many weight settings against one request.
+
+    Parsing, the calendar, capacity prefix sums and the per-exam weight
+    features are computed once; each grid point is then a dot product
+    over the feature rows plus the same allocation rule as
+    `_allocate_minutes_per_exam`. No blocks are built.
+
+    Returns one entry per grid point, in grid order:
+        {
+            "settings": {"difficulty_weight": float, ...},
+            "minutes": {exam_id: int, ...},
+            "metrics": {
+                "allocated_minutes": int,
+                "unused_minutes": int,       # lost to flooring
+                "min_minutes": int,
+                "max_minutes": int,
+                "infeasible_exams": int,     # demand does not fit before exam_date
+                "unplaceable_minutes": int,  # least shortfall any schedule must have
+            },
+        }
+    """
+    exams_model = _parse_subjects_as_exams(subjects) if subjects else []
+    availability_model = _parse_availability(availability)
+    calendar_days = _build_calendar_days(availability_model)
+
+    total_available = sum(d["available_minutes"] for d in calendar_days)
+    exams_by_date = sorted(exams_model, key=lambda e: e.exam_date)
+    capacities = _capacity_before_dates(calendar_days, exams_by_date)
+
+    ids = [e.id for e in exams_by_date]
+    features = _exam_features(exams_by_date, availability_model)
+
+    results: List[Dict[str, Any]] = []
+    for settings in settings_grid:
+        weights = [
+            max(
+                settings.difficulty_weight * d
+                + settings.confidence_weight * c
+                + settings.urgency_weight * u,
+                0.0001,
+            )
+            for d, c, u in features
+        ]
+        total_weight = sum(weights)
+        minutes = [int(total_available * (w / total_weight)) for w in weights] if weights else []
+
+        infeasible = 0
+        unplaceable = 0
+        cumulative = 0
+        for m, cap in zip(minutes, capacities):
+            cumulative += m
+            if cumulative > cap:
+                infeasible += 1
+                unplaceable = max(unplaceable, cumulative - cap)
+
+        allocated = sum(minutes)
+        by_id = dict(zip(ids, minutes))
+        results.append(
             {
-                "date": day["date"] if isinstance(day["date"], str) else day["date"].isoformat(),
-                "weekday": day.get("weekday") or datetime.fromisoformat(
-                    day["date"] if isinstance(day["date"], str) else day["date"].isoformat()
-                ).strftime("%A"),
-                "total_minutes": day.get("total_minutes", 0),
-                "blocks": blocks_out,
+                "settings": {
+                    "difficulty_weight": settings.difficulty_weight,
+                    "confidence_weight": settings.confidence_weight,
+                    "urgency_weight": settings.urgency_weight,
+                },
+                "minutes": {e.id: by_id[e.id] for e in exams_model},
+                "metrics": {
+                    "allocated_minutes": allocated,
+                    "unused_minutes": total_available - allocated,
+                    "min_minutes": min(minutes) if minutes else 0,
+                    "max_minutes": max(minutes) if minutes else 0,
+                    "infeasible_exams": infeasible,
+                    "unplaceable_minutes": unplaceable,
+                },
             }
         )
 
-    return {"days": public_days}
+    return results
 
 
 # ---------- Parsing ----------
 
 
-def _parse_subjects_as_exams(subjects: List[Dict[str, Any]]) -> List[ExamSubject]:
+def _parse_subjects_as_exams(subjects: List[Dict[str, Any] | ExamSubject]) -> List[ExamSubject]:
     parsed: List[ExamSubject] = []
 
     for s in subjects:
+        # Already typed (API hand-off): nothing to parse.
+        if isinstance(s, ExamSubject):
+            parsed.append(s)
+            continue
+
         # Generate unique subject ID if missing
         subject_id = s.get("id") or uuid4().hex
 
         # Parse exam date
-        exam_date = _parse_date(s["exam_date"])
+        exam_date = parse_date(s["exam_date"])
 
         # Parse topics with safe unique IDs
         raw_topics = s.get("topics", [])
@@ -272,26 +537,59 @@ def _parse_subjects_as_exams(subjects: List[Dict[str, Any]]) -> List[ExamSubject
     return parsed
 
 
-def _parse_availability(data: Dict[str, Any]) -> Availability:
-    start = _parse_date(data["start_date"])
-    end = _parse_date(data["end_date"])
-    mpw = data["minutes_per_weekday"]
+def _parse_availability(data: Dict[str, Any] | Availability) -> Availability:
+    if isinstance(data, Availability):
+        return data
+
+    start = parse_date(data["start_date"])
+    end = parse_date(data["end_date"])
+    windows = parse_windows(data.get("windows_per_weekday") or {})
+    mpw = cap_minutes_to_windows(data["minutes_per_weekday"], windows)
     rest_dates_raw = data.get("rest_dates", [])
-    rest_dates = [_parse_date(d) for d in rest_dates_raw]
+    rest_dates = [parse_date(d) for d in rest_dates_raw]
 
     return Availability(
         start_date=start,
         end_date=end,
         minutes_per_weekday=mpw,
         rest_dates=rest_dates,
+        windows=windows,
     )
 
 
-def _parse_date(value: str) -> date:
-    return datetime.strptime(value, "%Y-%m-%d").date()
+# ---------- Calendar ----------
 
 
-# ---------- Calendar ----------
+def _to_public_days(days: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert internal days (blocks with "subjects": [...]) to the public
+    exam shape (blocks with "subject": {...}).
+
+    Block dicts are converted in place rather than copied: on long
+    horizons they are most of the plan, and the internal days are not
+    used afterwards.
+    """
+    public_days: List[Dict[str, Any]] = []
+    for day in days:
+        blocks_out: List[Dict[str, Any]] = day.get("blocks", [])
+        for block in blocks_out:
+            block.setdefault("minutes", 0)
+            subjects_list = block.pop("subjects", [])
+            # Only include a subject if present; exam mode uses one subject per block.
+            if subjects_list:
+                block["subject"] = subjects_list[0]
+
+        public_days.append(
+            {
+                "date": day["date"] if isinstance(day["date"], str) else day["date"].isoformat(),
+                "weekday": day.get("weekday") or datetime.fromisoformat(
+                    day["date"] if isinstance(day["date"], str) else day["date"].isoformat()
+                ).strftime("%A"),
+                "total_minutes": day.get("total_minutes", 0),
+                "blocks": blocks_out,
+            }
+        )
+    return public_days
 
 
 def _build_calendar_days(avail: Availability) -> List[Dict[str, Any]]:
@@ -330,19 +628,16 @@ def _build_calendar_days(avail: Availability) -> List[Dict[str, Any]]:
 # ---------- Weighting ----------
 
 
-def _compute_exam_weights(
+def _exam_features(
     exams: List[ExamSubject],
     avail: Availability,
-    settings: AllocatorSettings,
-) -> Dict[str, float]:
+) -> List[Tuple[float, float, float]]:
     """
-    Compute a weight for each exam based on:
-      - difficulty (harder → more time)
-      - confidence (lower confidence → more time)
-      - urgency (closer exam date → more time)
+    Per-exam (difficulty_score, confidence_need, urgency_score), the
+    settings-independent inputs to the weighting.
     """
     today = avail.start_date
-    weights: Dict[str, float] = {}
+    features: List[Tuple[float, float, float]] = []
 
     for e in exams:
         days_until = max((e.exam_date - today).days, 1)
@@ -352,6 +647,27 @@ def _compute_exam_weights(
         confidence_need = (6 - e.confidence) / 5.0
         urgency_score = 1.0 / days_until
 
+        features.append((difficulty_score, confidence_need, urgency_score))
+
+    return features
+
+
+def _compute_exam_weights(
+    exams: List[ExamSubject],
+    avail: Availability,
+    settings: AllocatorSettings,
+) -> Dict[str, float]:
+    """
+    Compute a weight for each exam based on:
+      - difficulty (harder → more time)
+      - confidence (lower confidence → more time)
+      - urgency (closer exam date → more time)
+    """
+    weights: Dict[str, float] = {}
+
+    for e, (difficulty_score, confidence_need, urgency_score) in zip(
+        exams, _exam_features(exams, avail)
+    ):
         weight = (
             settings.difficulty_weight * difficulty_score
             + settings.confidence_weight * confidence_need
@@ -385,6 +701,51 @@ def _allocate_minutes_per_exam(
     return minutes_per_exam
 
 
+def _apportion_minutes(total: int, weights: Dict[str, float]) -> Dict[str, int]:
+    """
+    Split `total` minutes across exams by weight (largest remainder), so
+    that the shares always add up to exactly `total`.
+    """
+    total_weight = sum(weights.values())
+    if total_weight <= 0 or total <= 0:
+        return {exam_id: 0 for exam_id in weights}
+
+    out: Dict[str, int] = {}
+    fractions: List[Any] = []
+    assigned = 0
+    for exam_id, w in weights.items():
+        exact = total * (w / total_weight)
+        share = int(exact)
+        out[exam_id] = share
+        assigned += share
+        fractions.append((exact - share, exam_id))
+
+    fractions.sort(key=lambda f: f[0], reverse=True)
+    for _, exam_id in fractions[: total - assigned]:
+        out[exam_id] += 1
+
+    return out
+
+
+def _capacity_before_dates(
+    calendar_days: List[Dict[str, Any]],
+    exams_by_date: List[ExamSubject],
+) -> List[int]:
+    """
+    For exams sorted by exam_date, return the study minutes available
+    strictly before each exam's date (a prefix sum over the calendar).
+    """
+    capacities: List[int] = []
+    running = 0
+    i = 0
+    for e in exams_by_date:
+        while i < len(calendar_days) and calendar_days[i]["date"] < e.exam_date:
+            running += calendar_days[i]["available_minutes"]
+            i += 1
+        capacities.append(running)
+    return capacities
+
+
 # ---------- Distribution ----------
 
 
@@ -392,11 +753,15 @@ def _distribute_minutes_into_days(
     calendar_days: List[Dict[str, Any]],
     exams: List[ExamSubject],
     minutes_per_exam: Dict[str, int],
+    deadline: Deadline | None = None,
 ) -> Dict[str, Any]:
     """
     Distribute each exam's allocated minutes into daily blocks,
     respecting daily availability and exam urgency.
 
+    If `deadline` expires, the days not yet reached are filled by
+    `_fill_days_proportionally` and the plan gets "partial": True.
+
     Produces an internal plan structure where blocks contain
     `subjects: [...]` to stay compatible with fairness/cognitive_load:
 
@@ -436,7 +801,13 @@ def _distribute_minutes_into_days(
     days_output: List[Dict[str, Any]] = []
     remaining = dict(minutes_per_exam)
 
-    for day in calendar_days:
+    for day_idx, day in enumerate(calendar_days):
+        if deadline is not None and deadline.expired():
+            days_output.extend(
+                _fill_days_proportionally(calendar_days[day_idx:], exams_sorted, remaining)
+            )
+            return {"days": days_output, "partial": True}
+
         day_date: date = day["date"]
         available = day["available_minutes"]
 
@@ -506,6 +877,7 @@ def _distribute_minutes_into_days(
                 break
 
         if day_blocks:
+            day_blocks = _coalesce_blocks(day_blocks)
             days_output.append(
                 {
                     "date": day_date,
@@ -521,6 +893,348 @@ def _distribute_minutes_into_days(
     return {"days": days_output}
 
 
+def _schedule_edf(
+    calendar_days: List[Dict[str, Any]],
+    exams: List[ExamSubject],
+    weights: Dict[str, float],
+    deadline: Deadline | None = None,
+) -> Any:
+    """
+    Earliest-deadline-first scheduling with a feasibility pass.
+
+    1. Apportion the usable capacity (days before the last exam) by
+       weight, so no minutes are lost to flooring.
+    2. Walk exams in date order against capacity prefix sums. Whatever
+       cannot fit before an exam's date is its shortfall.
+    3. Hand the total shortfall to exams that still have room, by
+       weight, never exceeding the slack of any later deadline.
+    4. Place minutes day by day from a heap keyed on exam_date. With
+       feasible demands EDF places every minute before its deadline.
+
+    Runs in O((days + exams) log exams). If `deadline` expires, the
+    remaining days get the proportional fallback ("partial": True).
+
+    Returns (internal plan, {exam_id: shortfall_minutes}).
+    """
+    exams_by_date, demand, shortfall = _edf_demands(calendar_days, exams, weights)
+
+    # --- EDF placement ---
+    order = {e.id: i for i, e in enumerate(exams_by_date)}
+    heap = [(e.exam_date, order[e.id], e) for e in exams_by_date if demand[e.id] > 0]
+    heapq.heapify(heap)
+    remaining = dict(demand)
+
+    topic_state: Dict[str, Dict[str, Any]] = {}
+    days_output: List[Dict[str, Any]] = []
+
+    for day_idx, day in enumerate(calendar_days):
+        if deadline is not None and deadline.expired():
+            days_output.extend(
+                _fill_days_proportionally(calendar_days[day_idx:], exams_by_date, remaining)
+            )
+            return {"days": days_output, "partial": True}, shortfall
+
+        day_date: date = day["date"]
+        available = day["available_minutes"]
+
+        # Exams whose date has arrived can no longer be studied for.
+        while heap and heap[0][0] <= day_date:
+            heapq.heappop(heap)
+
+        day_blocks: List[Dict[str, Any]] = []
+        while available > 0 and heap:
+            _, _, exam = heap[0]
+            minutes_today = min(remaining[exam.id], available)
+
+            while minutes_today > 0:
+                block_minutes = _decide_block_length(exam, minutes_today, minutes_today)
+                topic = pick_next_topic(
+                    subject_id=exam.id,
+                    topics=exam.topics,
+                    state=topic_state,
+                    current_date=day_date,
+                )
+                day_blocks.append(
+                    {
+                        "minutes": block_minutes,
+                        "subjects": [
+                            {
+                                "id": exam.id,
+                                "name": exam.name,
+                                "minutes": block_minutes,
+                                "topic": topic,
+                                "difficulty": exam.difficulty,
+                            }
+                        ],
+                    }
+                )
+                minutes_today -= block_minutes
+                remaining[exam.id] -= block_minutes
+                available -= block_minutes
+
+            if remaining[exam.id] <= 0:
+                heapq.heappop(heap)
+
+        if day_blocks:
+            day_blocks = _coalesce_blocks(day_blocks)
+            days_output.append(
+                {
+                    "date": day_date,
+                    "weekday": day["weekday"],
+                    "total_minutes": sum(b["minutes"] for b in day_blocks),
+                    "blocks": day_blocks,
+                }
+            )
+
+    return {"days": days_output}, shortfall
+
+
+def _segment_budgets(
+    calendar_days: List[Dict[str, Any]],
+    exams: List[ExamSubject],
+    weights: Dict[str, float],
+) -> List[Tuple[List[Dict[str, Any]], List[ExamSubject], Dict[str, int]]]:
+    """
+    Split the calendar at exam dates. Inside a segment the set of active
+    exams (those whose date is still ahead) is fixed; each segment's
+    capacity is apportioned among its active exams by weight.
+
+    Returns [(segment days, active exams, {exam_id: minutes}), ...] in
+    date order. Days on/after the last exam date belong to no segment.
+    """
+    exams_by_date = sorted(exams, key=lambda e: e.exam_date)
+    boundaries = sorted({e.exam_date for e in exams_by_date})
+
+    segments: List[Tuple[List[Dict[str, Any]], List[ExamSubject], Dict[str, int]]] = []
+    day_idx = 0
+    exam_idx = 0
+    for boundary in boundaries:
+        seg_days: List[Dict[str, Any]] = []
+        while day_idx < len(calendar_days) and calendar_days[day_idx]["date"] < boundary:
+            seg_days.append(calendar_days[day_idx])
+            day_idx += 1
+
+        active = exams_by_date[exam_idx:]
+        if seg_days:
+            capacity = sum(d["available_minutes"] for d in seg_days)
+            budget = _apportion_minutes(capacity, {e.id: weights[e.id] for e in active})
+            segments.append((seg_days, active, budget))
+
+        while exam_idx < len(exams_by_date) and exams_by_date[exam_idx].exam_date <= boundary:
+            exam_idx += 1
+
+    return segments
+
+
+def _schedule_segmented(
+    calendar_days: List[Dict[str, Any]],
+    exams: List[ExamSubject],
+    weights: Dict[str, float],
+    max_workers: int | None = None,
+    deadline: Deadline | None = None,
+) -> Dict[str, Any]:
+    """
+    Plan each exam-date segment independently (in parallel when worth
+    it), then stitch topic rotation across segments in date order,
+    one independent rotation per exam.
+
+    Segments and rotations are pure functions of their inputs and
+    results are collected in submission order, so the plan is identical
+    for any worker count.
+    """
+    segments = _segment_budgets(calendar_days, exams, weights)
+
+    # Topics are assigned during stitching; ship exams without them.
+    jobs = [
+        (seg_days, [replace(e, topics=[]) for e in active], budget, deadline)
+        for seg_days, active, budget in segments
+    ]
+
+    parallel = max_workers != 1 and len(jobs) >= MIN_PARALLEL_SEGMENTS
+    if parallel:
+        planned = list(_segment_pool(max_workers).map(_plan_segment, jobs))
+    else:
+        planned = [_plan_segment(job) for job in jobs]
+
+    days_output = [day for seg_plan in planned for day in seg_plan["days"]]
+
+    # Stitch topic rotation. Its state is keyed per exam, so each exam's
+    # blocks are rotated in date order independently of other exams.
+    entries_by_exam: Dict[str, List[Dict[str, Any]]] = {e.id: [] for e in exams}
+    dates_by_exam: Dict[str, List[date]] = {e.id: [] for e in exams}
+    for day in days_output:
+        for block in day["blocks"]:
+            for s in block["subjects"]:
+                entries_by_exam[s["id"]].append(s)
+                dates_by_exam[s["id"]].append(day["date"])
+
+    rotating = [e for e in exams if e.topics and entries_by_exam[e.id]]
+    rotate_jobs = [(e.id, e.topics, dates_by_exam[e.id]) for e in rotating]
+    if parallel:
+        picks = list(_segment_pool(max_workers).map(_rotate_topics, rotate_jobs))
+    else:
+        picks = [_rotate_topics(job) for job in rotate_jobs]
+
+    for e, indices in zip(rotating, picks):
+        for entry, idx in zip(entries_by_exam[e.id], indices):
+            entry["topic"] = e.topics[idx]
+
+    if any(seg_plan.get("partial") for seg_plan in planned):
+        return {"days": days_output, "partial": True}
+    return {"days": days_output}
+
+
+def _plan_segment(job: Tuple[Any, ...]) -> Dict[str, Any]:
+    """Process-pool entry point: distribute one segment's budget into days."""
+    seg_days, active, budget, deadline = job
+    return _distribute_minutes_into_days(seg_days, active, budget, deadline)
+
+
+def _rotate_topics(job: Tuple[str, List[Dict[str, Any]], List[date]]) -> List[int]:
+    """
+    Process-pool entry point: run topic rotation for one exam over its
+    block dates and return the chosen topic indices.
+    """
+    exam_id, topics, dates = job
+    index_of = {id(t): i for i, t in enumerate(topics)}
+    state: Dict[str, Dict[str, Any]] = {}
+    return [
+        index_of[id(pick_next_topic(exam_id, topics, state, d))]
+        for d in dates
+    ]
+
+
+@lru_cache(maxsize=None)
+def _segment_pool(max_workers: int | None) -> ProcessPoolExecutor:
+    """One long-lived pool per size, shared across requests."""
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+def _edf_demands(
+    calendar_days: List[Dict[str, Any]],
+    exams: List[ExamSubject],
+    weights: Dict[str, float],
+) -> Any:
+    """
+    Steps 1-3 of `_schedule_edf`: per-exam minute demands that are
+    guaranteed to fit before each exam's date, plus per-exam shortfall.
+
+    Returns (exams sorted by date, {exam_id: demand}, {exam_id: shortfall}).
+    """
+    exams_by_date = sorted(exams, key=lambda e: e.exam_date)
+    capacities = _capacity_before_dates(calendar_days, exams_by_date)
+
+    usable = capacities[-1] if capacities else 0
+    demand = _apportion_minutes(usable, weights)
+
+    # --- Feasibility: cumulative placed minutes by each deadline ---
+    shortfall: Dict[str, int] = {}
+    placed_cum = 0
+    slack: List[int] = []
+    for e, cap in zip(exams_by_date, capacities):
+        placed = min(demand[e.id], cap - placed_cum)
+        shortfall[e.id] = demand[e.id] - placed
+        demand[e.id] = placed
+        placed_cum += placed
+        slack.append(cap - placed_cum)
+
+    # --- Redistribute the infeasible remainder ---
+    to_redistribute = sum(shortfall.values())
+    if to_redistribute > 0:
+        # Slack available to an exam is the smallest slack of any
+        # deadline at or after its own.
+        suffix_slack = list(slack)
+        for i in range(len(suffix_slack) - 2, -1, -1):
+            suffix_slack[i] = min(suffix_slack[i], suffix_slack[i + 1])
+
+        receivers = {e.id: weights[e.id] for e in exams_by_date if shortfall[e.id] == 0}
+        extra = _apportion_minutes(to_redistribute, receivers)
+
+        carry = 0
+        used = 0
+        for e, room in zip(exams_by_date, suffix_slack):
+            want = extra.get(e.id, 0) + carry
+            allowed = max(min(want, room - used), 0)
+            demand[e.id] += allowed
+            used += allowed
+            carry = want - allowed
+
+    return exams_by_date, demand, shortfall
+
+
+def _fill_days_proportionally(
+    calendar_days: List[Dict[str, Any]],
+    exams: List[ExamSubject],
+    remaining: Dict[str, int],
+) -> List[Dict[str, Any]]:
+    """
+    Cheap fallback for days a scheduler did not reach before its
+    deadline: each day's minutes are split among the nearest exams
+    still owed time (at most max_subjects_per_day, so validation keeps
+    them all) in proportion to what they are owed. Topics cycle
+    round-robin instead of going through `pick_next_topic`.
+
+    `exams` must be sorted by exam_date. Runs in O(days * exams).
+    Consumes `remaining`.
+    """
+    per_day = CLSettings().max_subjects_per_day
+    turns: Dict[str, int] = {}
+    days_output: List[Dict[str, Any]] = []
+
+    for day in calendar_days:
+        day_date: date = day["date"]
+        owed: Dict[str, float] = {}
+        for e in exams:
+            if remaining.get(e.id, 0) > 0 and e.exam_date > day_date:
+                owed[e.id] = remaining[e.id]
+                if len(owed) == per_day:
+                    break
+        if not owed or day["available_minutes"] <= 0:
+            continue
+
+        shares = _apportion_minutes(min(day["available_minutes"], sum(owed.values())), owed)
+
+        day_blocks: List[Dict[str, Any]] = []
+        for exam in exams:
+            minutes = shares.get(exam.id, 0)
+            if minutes <= 0:
+                continue
+            remaining[exam.id] -= minutes
+
+            while minutes > 0:
+                block_minutes = _decide_block_length(exam, minutes, minutes)
+                turn = turns.get(exam.id, 0)
+                turns[exam.id] = turn + 1
+                day_blocks.append(
+                    {
+                        "minutes": block_minutes,
+                        "subjects": [
+                            {
+                                "id": exam.id,
+                                "name": exam.name,
+                                "minutes": block_minutes,
+                                "topic": round_robin_topic(exam.topics, turn),
+                                "difficulty": exam.difficulty,
+                            }
+                        ],
+                    }
+                )
+                minutes -= block_minutes
+
+        if day_blocks:
+            day_blocks = _coalesce_blocks(day_blocks)
+            days_output.append(
+                {
+                    "date": day_date,
+                    "weekday": day["weekday"],
+                    "total_minutes": sum(b["minutes"] for b in day_blocks),
+                    "blocks": day_blocks,
+                }
+            )
+
+    return days_output
+
+
 def _decide_block_length(
     exam: ExamSubject,
     remaining_for_exam: int,
@@ -530,20 +1244,76 @@ def _decide_block_length(
     Decide a single block length for this exam on this day
     based on exam difficulty and remaining minutes.
     """
-    if exam.difficulty >= 4:
-        preferred = 75
-    elif exam.difficulty == 3:
-        preferred = 60
-    else:
-        preferred = 45
-
-    block = min(preferred, remaining_for_exam, remaining_for_day)
+    block = min(_preferred_block_length(exam.difficulty), remaining_for_exam, remaining_for_day)
 
     if block <= 0:
         return 0
 
     # allow small tail fragments rather than dropping them
-    if block < 25:
+    # (_coalesce_blocks folds them into a same-exam block afterwards)
+    if block < MIN_BLOCK_MINUTES:
         return block
 
     return block
+
+
+def _preferred_block_length(difficulty: int) -> int:
+    if difficulty >= 4:
+        return 75
+    if difficulty == 3:
+        return 60
+    return 45
+
+
+def _coalesce_blocks(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Tidy one day's internal blocks (one subject each), in two passes:
+
+      1. adjacent blocks of the same exam are merged while the result
+         stays within the exam's preferred block length;
+      2. tails shorter than MIN_BLOCK_MINUTES are folded into the
+         shortest other block of the same exam that day, if that block
+         has not grown past its preferred length (so a block exceeds it
+         by less than one tail at most).
+
+    Merged blocks keep the first block's topic. Tails with no block of
+    their exam that day are kept. Each exam's hosts sit in a min-heap on
+    minutes (ties go to the earlier block), so a day takes
+    O(blocks log blocks).
+    """
+    merged: List[Dict[str, Any]] = []
+    for block in blocks:
+        prev = merged[-1] if merged else None
+        if (
+            prev is not None
+            and prev["subjects"][0]["id"] == block["subjects"][0]["id"]
+            and prev["minutes"] + block["minutes"] <= _preferred_block_length(prev["subjects"][0]["difficulty"])
+        ):
+            _absorb_block(prev, block)
+        else:
+            merged.append(block)
+
+    hosts: Dict[str, List[Tuple[int, int, Dict[str, Any]]]] = {}
+    for i, block in enumerate(merged):
+        if block["minutes"] >= MIN_BLOCK_MINUTES:
+            hosts.setdefault(block["subjects"][0]["id"], []).append((block["minutes"], i, block))
+    for heap in hosts.values():
+        heapq.heapify(heap)
+
+    out: List[Dict[str, Any]] = []
+    for block in merged:
+        entry = block["subjects"][0]
+        heap = hosts.get(entry["id"])
+        if block["minutes"] < MIN_BLOCK_MINUTES and heap:
+            minutes, i, host = heap[0]
+            if minutes <= _preferred_block_length(entry["difficulty"]):
+                _absorb_block(host, block)
+                heapq.heapreplace(heap, (host["minutes"], i, host))
+                continue
+        out.append(block)
+    return out
+
+
+def _absorb_block(host: Dict[str, Any], block: Dict[str, Any]) -> None:
+    host["minutes"] += block["minutes"]
+    host["subjects"][0]["minutes"] += block["minutes"]
@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 from uuid import uuid4
-from dataclasses import dataclass
-from datetime import date, datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional, Set, Tuple
+from bisect import bisect_left, insort
 import math
 
-from .cognitive_load import validate_day_plan, validate_block
+from .cognitive_load import validate_day_plan, validate_block, CLSettings
 from .fairness import adjust_for_fairness
-from ..engine.topic_rotation import pick_next_topic
+from ..engine.topic_rotation import pick_next_topic, round_robin_topic
+from ..engine.slot_placement import parse_windows, cap_minutes_to_windows, place_blocks
+from ..utils.time_utils import fill_days_in_order, summarize_day_loads, parse_date
+from ..utils.deadline import Deadline
 
 
 # ---------------------------------------------------------
@@ -38,6 +42,8 @@ class WeeklyAvailability:
     minutes_per_weekday: Dict[str, int]
     rest_dates: List[date]
     start_date: date
+    # Optional time-of-day windows per weekday, in minutes after midnight.
+    windows: Dict[str, List[Tuple[int, int]]] = field(default_factory=dict)
 
 
 @dataclass
@@ -68,6 +74,13 @@ class WeeklySettings:
 
 DEFAULT_SETTINGS = WeeklySettings()
 
+# How sessions are placed into days:
+#   - "greedy": round-robin over subjects, day by day, splitting a
+#     session whenever it does not fit the current day (default)
+#   - "ffd": first-fit decreasing bin packing into day capacities
+#   - "best_fit": best-fit decreasing (tightest day that still fits)
+PLACEMENT_MODES = ("greedy", "ffd", "best_fit")
+
 
 # ---------------------------------------------------------
 # Public API
@@ -77,10 +90,33 @@ def generate_weekly_plan(
     subjects: List[Dict[str, Any]],
     weekly_hours: float,
     availability: Dict[str, Any],
+    budget_ms: float | None = None,
+    placement: str = "greedy",
 ) -> Dict[str, Any]:
     """
     Generate a weekly plan using the unified schema.
 
+    `subjects` and `availability` may be unified-schema dicts or already
+    typed WeeklySubject / WeeklyAvailability instances (the API hands
+    those over directly to skip re-parsing).
+
+    `budget_ms` caps the time spent filling blocks (None = no limit).
+    When it runs out, days not yet reached are filled proportionally
+    and the plan carries "partial": True.
+
+    `placement` is one of PLACEMENT_MODES. The packing modes ignore
+    `budget_ms` (they run in O(n log n) over the sessions) and add a
+    "placement" report to the plan:
+
+        {
+            "mode": "ffd" | "best_fit",
+            "requested_minutes": int,   # session minutes to place
+            "placed_minutes": int,      # after cognitive-load validation
+            "utilization": float,       # placed / requested
+            "splits": int,              # sessions split across days
+            "unplaced_minutes": int,
+        }
+
     Returns public shape consumed by WeeklyTimeline:
 
     {
@@ -108,6 +144,9 @@ def generate_weekly_plan(
         ]
     }
     """
+    if placement not in PLACEMENT_MODES:
+        raise ValueError(f"Unknown placement: {placement!r}")
+
     subject_models = _parse_subjects(subjects)
     avail_model = _parse_availability(availability)
     settings = DEFAULT_SETTINGS
@@ -128,7 +167,16 @@ def generate_weekly_plan(
 
     sessions = _expand_into_sessions(subject_models, minutes_per_subject, settings)
 
-    raw_week_plan = _fill_week_blocks(week_days, subject_models, sessions, settings)
+    requested_sessions = sum(sum(parts) for parts in sessions.values())
+    splits = 0
+    if placement == "greedy":
+        raw_week_plan = _fill_week_blocks(
+            week_days, subject_models, sessions, settings, Deadline(budget_ms)
+        )
+    else:
+        raw_week_plan, splits = _pack_week_blocks(
+            week_days, subject_models, sessions, settings, best_fit=placement == "best_fit"
+        )
 
     fair_week_plan = adjust_for_fairness(raw_week_plan)
 
@@ -137,20 +185,156 @@ def generate_weekly_plan(
         validated = validate_day_plan(day)
         validated_days.append(validated)
 
-    return {
+    plan = {
         "week_start": fair_week_plan.get("week_start"),
         "days": validated_days,
     }
+    if raw_week_plan.get("partial"):
+        plan["partial"] = True
+    if placement != "greedy":
+        placed = sum(d.get("total_minutes", 0) for d in validated_days)
+        plan["placement"] = {
+            "mode": placement,
+            "requested_minutes": requested_sessions,
+            "placed_minutes": placed,
+            "utilization": round(placed / requested_sessions, 4) if requested_sessions else 1.0,
+            "splits": splits,
+            "unplaced_minutes": max(requested_sessions - placed, 0),
+        }
+    if avail_model.windows:
+        place_blocks(validated_days, avail_model.windows)
+
+    return plan
+
+
+def summarize_weekly_plan(
+    subjects: List[Dict[str, Any]],
+    weekly_hours: float,
+    availability: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Analytic preview of a weekly plan: per-subject minutes from the
+    weighting stage and the daily load profile, without session
+    expansion, block filling, topic rotation, fairness or validation.
+
+    Returns:
+        {
+            "mode": "summary",
+            "week_start": "YYYY-MM-DD",
+            "subjects": [{"id": str, "name": str, "minutes": int}, ...],
+            "weekdays": {"Monday": int, ..., "Sunday": int},
+            "weeks": [{"week_start": "YYYY-MM-DD", "minutes": int}],
+            "total_minutes": int,
+        }
+    """
+    subject_models = _parse_subjects(subjects)
+    avail_model = _parse_availability(availability)
+    settings = DEFAULT_SETTINGS
+
+    week_days = _build_week_days(avail_model)
+    if settings.max_daily_minutes is not None:
+        for d in week_days:
+            d["available_minutes"] = min(d["available_minutes"], settings.max_daily_minutes)
+
+    available_total = sum(d["available_minutes"] for d in week_days)
+    total_minutes = min(int(round(weekly_hours * 60)), available_total)
+
+    if total_minutes <= 0 or not subject_models:
+        minutes_per_subject: Dict[str, int] = {}
+        loads: List[Tuple[date, int]] = []
+    else:
+        weights = _compute_subject_weights(subject_models, settings)
+        minutes_per_subject = _distribute_minutes_by_weight(weights, total_minutes)
+        loads = fill_days_in_order(week_days, total_minutes)
+
+    summary = {
+        "mode": "summary",
+        "week_start": week_days[0]["date"].isoformat() if week_days else None,
+        "subjects": [
+            {"id": s.id, "name": s.name, "minutes": minutes_per_subject.get(s.id, 0)}
+            for s in subject_models
+        ],
+    }
+    summary.update(summarize_day_loads(loads))
+    return summary
+
+
+def sweep_weekly_settings(
+    subjects: List[Dict[str, Any]],
+    weekly_hours: float,
+    availability: Dict[str, Any],
+    settings_grid: List[WeeklySettings],
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate many weight settings against one request.
+
+    Parsing, the week skeleton and the per-subject weight features are
+    computed once; each grid point only re-weights and re-apportions.
+    Only difficulty_weight and confidence_weight vary per grid point;
+    session sizes come from DEFAULT_SETTINGS.
+
+    Returns one entry per grid point, in grid order:
+        {
+            "settings": {"difficulty_weight": float, "confidence_weight": float},
+            "minutes": {subject_id: int, ...},
+            "metrics": {"allocated_minutes", "min_minutes", "max_minutes", "sessions"},
+        }
+    """
+    subject_models = _parse_subjects(subjects)
+    avail_model = _parse_availability(availability)
+
+    week_days = _build_week_days(avail_model)
+    available_total = sum(d["available_minutes"] for d in week_days)
+    total_minutes = max(min(int(round(weekly_hours * 60)), available_total), 0)
+
+    features = _subject_features(subject_models)
+
+    results: List[Dict[str, Any]] = []
+    for settings in settings_grid:
+        weights = {
+            s.id: max(
+                settings.difficulty_weight * diff_score
+                + settings.confidence_weight * confidence_need,
+                0.0001,
+            )
+            for s, (diff_score, confidence_need) in zip(subject_models, features)
+        }
+        minutes = _distribute_minutes_by_weight(weights, total_minutes) if weights else {}
+        sessions = _expand_into_sessions(subject_models, minutes, DEFAULT_SETTINGS)
+        values = list(minutes.values())
+
+        results.append(
+            {
+                "settings": {
+                    "difficulty_weight": settings.difficulty_weight,
+                    "confidence_weight": settings.confidence_weight,
+                },
+                "minutes": minutes,
+                "metrics": {
+                    "allocated_minutes": sum(values),
+                    "min_minutes": min(values) if values else 0,
+                    "max_minutes": max(values) if values else 0,
+                    "sessions": sum(len(v) for v in sessions.values()),
+                },
+            }
+        )
+
+    return results
 
 
 # ---------------------------------------------------------
 # Parsing
 # ---------------------------------------------------------
 
-def _parse_subjects(subjects: List[Dict[str, Any]]) -> List[WeeklySubject]:
+def _parse_subjects(subjects: List[Dict[str, Any] | WeeklySubject]) -> List[WeeklySubject]:
     out: List[WeeklySubject] = []
 
     for s in subjects:
+        # Already typed (API hand-off): nothing to parse.
+        if isinstance(s, WeeklySubject):
+            out.append(s)
+            continue
+
         subject_id = s.get("id") or uuid4().hex
 
         raw_topics = s.get("topics", []) or []
@@ -179,30 +363,34 @@ def _parse_subjects(subjects: List[Dict[str, Any]]) -> List[WeeklySubject]:
     return out
 
 
-def _parse_availability(data: Dict[str, Any]) -> WeeklyAvailability:
-    mpw = data["minutes_per_weekday"]
-    rest_dates = [_parse_date(d) for d in data.get("rest_dates", [])]
-    start_date = _parse_date(data["start_date"])
+def _parse_availability(data: Dict[str, Any] | WeeklyAvailability) -> WeeklyAvailability:
+    if isinstance(data, WeeklyAvailability):
+        return data
+
+    windows = parse_windows(data.get("windows_per_weekday") or {})
+    mpw = cap_minutes_to_windows(data["minutes_per_weekday"], windows)
+    rest_dates = [parse_date(d) for d in data.get("rest_dates", [])]
+    start_date = parse_date(data["start_date"])
     return WeeklyAvailability(
         minutes_per_weekday=mpw,
         rest_dates=rest_dates,
         start_date=start_date,
+        windows=windows,
     )
 
 
-def _parse_date(value: str) -> date:
-    return datetime.strptime(value, "%Y-%m-%d").date()
-
-
 # ---------------------------------------------------------
 # Weighting
 # ---------------------------------------------------------
 
+def _subject_features(subjects: List[WeeklySubject]) -> List[Tuple[float, float]]:
+    """Per-subject (difficulty_score, confidence_need), independent of settings."""
+    return [(s.difficulty / 5.0, (6 - s.confidence) / 5.0) for s in subjects]
+
+
 def _compute_subject_weights(subjects: List[WeeklySubject], settings: WeeklySettings) -> Dict[str, float]:
     weights: Dict[str, float] = {}
-    for s in subjects:
-        diff_score = s.difficulty / 5.0
-        confidence_need = (6 - s.confidence) / 5.0
+    for s, (diff_score, confidence_need) in zip(subjects, _subject_features(subjects)):
         weight = (
             settings.difficulty_weight * diff_score
             + settings.confidence_weight * confidence_need
@@ -324,6 +512,7 @@ def _fill_week_blocks(
     subjects: List[WeeklySubject],
     sessions: Dict[str, List[int]],
     settings: WeeklySettings,
+    deadline: Deadline | None = None,
 ) -> Dict[str, Any]:
 
     subject_map: Dict[str, WeeklySubject] = {s.id: s for s in subjects}
@@ -335,8 +524,16 @@ def _fill_week_blocks(
 
     qptr = 0
     topic_state: Dict[str, Dict[str, Any]] = {}
+    partial = False
+
+    for day_idx, day in enumerate(week_days):
+        if deadline is not None and deadline.expired():
+            partial = True
+            _fill_week_days_proportionally(
+                week_days[day_idx:], subject_map, sessions, subject_queue, settings
+            )
+            break
 
-    for day in week_days:
         available = day["available_minutes"]
         if settings.max_daily_minutes is not None:
             available = min(available, settings.max_daily_minutes)
@@ -349,9 +546,17 @@ def _fill_week_blocks(
         blocks: List[Dict[str, Any]] = []
 
         while available >= settings.min_light_session and subject_queue:
+            if deadline is not None and deadline.expired():
+                # Keep today's blocks; later days get the fallback.
+                partial = True
+                break
+
             block_capacity = available
             block_subjects: List[Dict[str, Any]] = []
             subjects_in_block = 0
+            # Queue entries skipped in a row; a full lap without placing
+            # anything means no remaining session fits this block.
+            skipped = 0
 
             while (
                 block_capacity >= settings.min_light_session
@@ -378,6 +583,9 @@ def _fill_week_blocks(
                         sessions[sid][idx] = session_len - allocated
                         session_len = allocated
                     else:
+                        skipped += 1
+                        if skipped >= len(subject_queue):
+                            break
                         continue
 
                 subj_spec = subject_map[sid]
@@ -401,6 +609,7 @@ def _fill_week_blocks(
 
                 block_capacity -= session_len
                 subjects_in_block += 1
+                skipped = 0
 
                 subject_queue = [
                     (s, (i + 1 if s == sid else i)) for (s, i) in subject_queue
@@ -439,6 +648,10 @@ def _fill_week_blocks(
             sum(s["minutes"] for s in block["subjects"]) for block in blocks
         )
 
+    return _week_plan_output(week_days, partial)
+
+
+def _week_plan_output(week_days: List[Dict[str, Any]], partial: bool = False) -> Dict[str, Any]:
     week_start = week_days[0]["date"].isoformat() if week_days else None
 
     days_output = [
@@ -451,4 +664,222 @@ def _fill_week_blocks(
         for d in week_days
     ]
 
+    if partial:
+        return {"week_start": week_start, "days": days_output, "partial": True}
     return {"week_start": week_start, "days": days_output}
+
+
+def _fill_week_days_proportionally(
+    week_days: List[Dict[str, Any]],
+    subject_map: Dict[str, WeeklySubject],
+    sessions: Dict[str, List[int]],
+    subject_queue: List[Tuple[str, int]],
+    settings: WeeklySettings,
+) -> None:
+    """
+    Cheap fallback for days `_fill_week_blocks` did not reach before its
+    deadline: the minutes still queued per subject are split across each
+    day's availability in proportion to what is owed, at most
+    max_subjects_per_day subjects a day. Topics cycle round-robin.
+    """
+    owed = {sid: sum(sessions[sid][idx:]) for sid, idx in subject_queue}
+    owed = {sid: m for sid, m in owed.items() if m > 0}
+    turns: Dict[str, int] = {}
+
+    for day in week_days:
+        available = day["available_minutes"]
+        if settings.max_daily_minutes is not None:
+            available = min(available, settings.max_daily_minutes)
+        if available <= 0 or not owed:
+            continue
+
+        picked = sorted(owed, key=lambda sid: owed[sid], reverse=True)[: settings.max_subjects_per_day]
+        budget = min(available, sum(owed[sid] for sid in picked))
+        shares = _distribute_minutes_by_weight({sid: float(owed[sid]) for sid in picked}, budget)
+
+        blocks: List[Dict[str, Any]] = []
+        for sid in picked:
+            minutes = min(shares.get(sid, 0), owed[sid])
+            owed[sid] -= minutes
+            subj_spec = subject_map[sid]
+
+            while minutes > 0:
+                session_len = min(minutes, settings.deep_work_max)
+                turn = turns.get(sid, 0)
+                turns[sid] = turn + 1
+                blocks.append(
+                    {
+                        "minutes": session_len,
+                        "subjects": [
+                            {
+                                "id": sid,
+                                "name": subj_spec.name,
+                                "minutes": session_len,
+                                "topic": round_robin_topic(subj_spec.topics, turn),
+                                "difficulty": subj_spec.difficulty,
+                            }
+                        ],
+                    }
+                )
+                minutes -= session_len
+
+        owed = {sid: m for sid, m in owed.items() if m > 0}
+        day["blocks"] = blocks
+        day["total_minutes"] = sum(b["minutes"] for b in blocks)
+
+
+# ---------------------------------------------------------
+# Bin-packing placement
+# ---------------------------------------------------------
+
+def _pack_week_blocks(
+    week_days: List[Dict[str, Any]],
+    subjects: List[WeeklySubject],
+    sessions: Dict[str, List[int]],
+    settings: WeeklySettings,
+    best_fit: bool = False,
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Pack sessions into day capacities, largest first. Returns the raw
+    week plan (same shape as `_fill_week_blocks`) and the number of
+    sessions split across days.
+
+    Each session goes to the first day that holds it (ffd) or to the
+    day with the least capacity left that still holds it (best_fit,
+    found by bisect over capacities kept sorted). A day only takes a
+    session validation would keep: at most max_subjects_per_day
+    distinct subjects and max_hard_subjects_per_day hard sessions.
+
+    A session no day holds is split: the allowed day with the most
+    capacity left takes what it can, leaving the rest at least
+    min_light_session where possible, and the rest is placed the same
+    way. Minutes no day can take stay unplaced.
+
+    Each day's sessions are then interleaved by subject and chunked
+    into blocks of max_subjects_per_block.
+    """
+    cl_settings = CLSettings()
+    max_subjects = min(settings.max_subjects_per_day, cl_settings.max_subjects_per_day)
+    subject_map: Dict[str, WeeklySubject] = {s.id: s for s in subjects}
+
+    capacity: List[int] = []
+    for day in week_days:
+        available = day["available_minutes"]
+        if settings.max_daily_minutes is not None:
+            available = min(available, settings.max_daily_minutes)
+        capacity.append(max(available, 0))
+
+    day_subjects: List[Set[str]] = [set() for _ in week_days]
+    day_hard = [0] * len(week_days)
+    placed: List[List[Tuple[str, int]]] = [[] for _ in week_days]
+    # (capacity left, day index), ascending, for best fit.
+    free = sorted((cap, i) for i, cap in enumerate(capacity))
+
+    def is_hard(sid: str) -> bool:
+        return subject_map[sid].difficulty >= cl_settings.hard_subject_threshold
+
+    def allowed(i: int, sid: str) -> bool:
+        if sid not in day_subjects[i] and len(day_subjects[i]) >= max_subjects:
+            return False
+        return not (is_hard(sid) and day_hard[i] >= cl_settings.max_hard_subjects_per_day)
+
+    def find(need: int, sid: str) -> int:
+        if best_fit:
+            for _, i in free[bisect_left(free, (need, -1)):]:
+                if allowed(i, sid):
+                    return i
+            return -1
+        for i, cap in enumerate(capacity):
+            if cap >= need and allowed(i, sid):
+                return i
+        return -1
+
+    def put(i: int, sid: str, minutes: int) -> None:
+        free.remove((capacity[i], i))
+        capacity[i] -= minutes
+        insort(free, (capacity[i], i))
+        day_subjects[i].add(sid)
+        if is_hard(sid):
+            day_hard[i] += 1
+        placed[i].append((sid, minutes))
+
+    # Largest first; the sort is stable, so ties keep subject order.
+    items = sorted(
+        ((minutes, sid) for sid, parts in sessions.items() for minutes in parts if minutes > 0),
+        key=lambda item: -item[0],
+    )
+
+    splits = 0
+    for minutes, sid in items:
+        while minutes > 0:
+            i = find(minutes, sid)
+            if i >= 0:
+                put(i, sid, minutes)
+                break
+
+            candidates = [
+                j for j, cap in enumerate(capacity)
+                if cap >= settings.min_light_session and allowed(j, sid)
+            ]
+            if not candidates:
+                break
+            i = max(candidates, key=lambda j: capacity[j])
+
+            piece = capacity[i]
+            short = settings.min_light_session - (minutes - piece)
+            if short > 0 and piece - short >= settings.min_light_session:
+                piece -= short
+            put(i, sid, piece)
+            splits += 1
+            minutes -= piece
+
+    topic_state: Dict[str, Dict[str, Any]] = {}
+    step = settings.max_subjects_per_block
+
+    for day, day_sessions in zip(week_days, placed):
+        order = _interleave_by_subject(day_sessions)
+        blocks: List[Dict[str, Any]] = []
+
+        for k in range(0, len(order), step):
+            block_subjects: List[Dict[str, Any]] = []
+            for sid, session_len in order[k:k + step]:
+                subj_spec = subject_map[sid]
+                block_subjects.append(
+                    {
+                        "id": sid,
+                        "name": subj_spec.name,
+                        "minutes": session_len,
+                        "topic": pick_next_topic(
+                            subject_id=sid,
+                            topics=subj_spec.topics,
+                            state=topic_state,
+                            current_date=day["date"],
+                        ),
+                        "difficulty": subj_spec.difficulty,
+                    }
+                )
+            blocks.append(
+                validate_block(
+                    {"minutes": sum(s["minutes"] for s in block_subjects), "subjects": block_subjects}
+                )
+            )
+
+        day["blocks"] = blocks
+        day["total_minutes"] = sum(b["minutes"] for b in blocks)
+
+    return _week_plan_output(week_days), splits
+
+
+def _interleave_by_subject(day_sessions: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
+    """Round-robin over a day's sessions by subject, so neighbours differ."""
+    queues: Dict[str, List[int]] = {}
+    for sid, minutes in day_sessions:
+        queues.setdefault(sid, []).append(minutes)
+
+    order: List[Tuple[str, int]] = []
+    while queues:
+        for sid in list(queues):
+            order.append((sid, queues[sid].pop(0)))
+            if not queues[sid]:
+                del queues[sid]
+    return order
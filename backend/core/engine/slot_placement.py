@@ -0,0 +1,215 @@
+# backend/core/engine/slot_placement.py
+from __future__ import annotations
+from typing import Dict, Any, List, Mapping, Sequence, Tuple
+
+from ..utils.time_utils import WEEKDAYS
+
+
+Window = Tuple[int, int]  # (start, end) in minutes after midnight
+
+
+# ---------------------------------------------------------
+# Windows
+# ---------------------------------------------------------
+
+def parse_windows(raw: Mapping[str, Sequence[str]]) -> Dict[str, List[Window]]:
+    """
+    Parse {"Monday": ["07:00-08:00", "18:00-21:30"], ...} into sorted
+    minute windows. Raises ValueError on bad weekdays, times or
+    overlapping windows.
+    """
+    out: Dict[str, List[Window]] = {}
+    for weekday, items in raw.items():
+        if weekday not in WEEKDAYS:
+            raise ValueError(f"Unknown weekday: {weekday!r}")
+
+        windows = sorted(_parse_window(item) for item in items)
+        for (_, prev_end), (start, _) in zip(windows, windows[1:]):
+            if start < prev_end:
+                raise ValueError(f"Overlapping windows on {weekday}.")
+        if windows:
+            out[weekday] = windows
+    return out
+
+
+def cap_minutes_to_windows(
+    minutes_per_weekday: Dict[str, int],
+    windows: Dict[str, List[Window]],
+) -> Dict[str, int]:
+    """
+    A weekday with windows has at most as many minutes as its windows
+    hold; minutes_per_weekday can only lower that.
+    """
+    if not windows:
+        return minutes_per_weekday
+
+    out = dict(minutes_per_weekday)
+    for weekday, wins in windows.items():
+        total = sum(end - start for start, end in wins)
+        out[weekday] = min(out.get(weekday, total), total)
+    return out
+
+
+def format_time(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def parse_time(text: str) -> int:
+    hours, _, mins = text.strip().partition(":")
+    value = int(hours) * 60 + int(mins)
+    if not (0 <= int(mins) < 60 and 0 <= value <= 24 * 60):
+        raise ValueError(f"Invalid time: {text!r}")
+    return value
+
+
+def _parse_window(text: str) -> Window:
+    start_text, sep, end_text = text.partition("-")
+    if not sep:
+        raise ValueError(f"Invalid window: {text!r} (expected HH:MM-HH:MM)")
+    start, end = parse_time(start_text), parse_time(end_text)
+    if end <= start:
+        raise ValueError(f"Window ends before it starts: {text!r}")
+    return start, end
+
+
+# ---------------------------------------------------------
+# Free-time index
+# ---------------------------------------------------------
+
+class FreeSlotIndex:
+    """
+    Free minutes left in a sorted list of windows, with a max segment
+    tree over the free lengths.
+
+    `first_fit(lo, hi, need)` finds the leftmost window in [lo, hi) with
+    at least `need` free minutes and `take` consumes minutes from the
+    front of a window; both are O(log n) in the number of windows, so
+    one index can cover a whole multi-month plan.
+    """
+
+    def __init__(self, windows: Sequence[Window]) -> None:
+        self.starts = [start for start, _ in windows]
+        self.ends = [end for _, end in windows]
+        size = 1
+        while size < len(windows):
+            size *= 2
+        self.size = size
+        self.tree = [0] * (2 * size)
+        for i, (start, end) in enumerate(windows):
+            self.tree[size + i] = end - start
+        for node in range(size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def free(self, i: int) -> int:
+        return self.tree[self.size + i]
+
+    def first_fit(self, lo: int, hi: int, need: int) -> int:
+        """Leftmost window index in [lo, hi) with >= need free minutes, or -1."""
+        if lo >= hi:
+            return -1
+        return self._find(1, 0, self.size, lo, hi, need)
+
+    def take(self, i: int, minutes: int) -> Window:
+        """Consume `minutes` from the front of window i; returns the slot."""
+        start = self.starts[i]
+        self.starts[i] = start + minutes
+
+        node = self.size + i
+        self.tree[node] -= minutes
+        node //= 2
+        while node:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+        return start, start + minutes
+
+    def _find(self, node: int, node_lo: int, node_hi: int, lo: int, hi: int, need: int) -> int:
+        if node_hi <= lo or hi <= node_lo or self.tree[node] < need:
+            return -1
+        if node_hi - node_lo == 1:
+            return node_lo
+        mid = (node_lo + node_hi) // 2
+        found = self._find(2 * node, node_lo, mid, lo, hi, need)
+        if found >= 0:
+            return found
+        return self._find(2 * node + 1, mid, node_hi, lo, hi, need)
+
+
+# ---------------------------------------------------------
+# Placement
+# ---------------------------------------------------------
+
+def place_blocks(days: List[Dict[str, Any]], windows: Dict[str, List[Window]]) -> None:
+    """
+    Give every block on a day with windows concrete times, in place:
+
+        block["start"], block["end"]: "HH:MM"
+        block["slots"]: [{"start": "HH:MM", "end": "HH:MM"}, ...]
+
+    Blocks are placed in plan order, each into the earliest window of
+    its day that still holds it whole (first fit). A block that fits no
+    single window is spread over the earliest free windows, giving
+    several slots. Minutes that fit nowhere stay unplaced. Days whose
+    weekday has no windows are left untouched.
+    """
+    flat: List[Window] = []
+    ranges: List[Tuple[int, int]] = []
+    for day in days:
+        lo = len(flat)
+        flat.extend(windows.get(day.get("weekday"), ()))
+        ranges.append((lo, len(flat)))
+
+    if not flat:
+        return
+
+    index = FreeSlotIndex(flat)
+
+    for day, (lo, hi) in zip(days, ranges):
+        if lo == hi:
+            continue
+
+        for block in day.get("blocks", []):
+            need = block.get("minutes", 0)
+            slots: List[Window] = []
+
+            i = index.first_fit(lo, hi, need) if need > 0 else -1
+            if i >= 0:
+                slots.append(index.take(i, need))
+            else:
+                while need > 0:
+                    i = index.first_fit(lo, hi, 1)
+                    if i < 0:
+                        break
+                    slot = index.take(i, min(need, index.free(i)))
+                    slots.append(slot)
+                    need -= slot[1] - slot[0]
+
+            block["slots"] = [{"start": format_time(s), "end": format_time(e)} for s, e in slots]
+            if slots:
+                block["start"] = format_time(slots[0][0])
+                block["end"] = format_time(slots[-1][1])
+
+
+def entry_segments(slots: List[Dict[str, str]], minutes: Sequence[int]) -> List[List[Window]]:
+    """
+    Lay a block's entries (in order, with the given minutes) along its
+    slots. Returns, per entry, the (start, end) pieces it occupies.
+    """
+    pieces = [(parse_time(s["start"]), parse_time(s["end"])) for s in slots]
+    out: List[List[Window]] = []
+    k = 0
+    cursor = pieces[0][0] if pieces else 0
+
+    for need in minutes:
+        segments: List[Window] = []
+        while need > 0 and k < len(pieces):
+            end = min(pieces[k][1], cursor + need)
+            if end > cursor:
+                segments.append((cursor, end))
+                need -= end - cursor
+            cursor = end
+            if cursor >= pieces[k][1]:
+                k += 1
+                if k < len(pieces):
+                    cursor = pieces[k][0]
+        out.append(segments)
+    return out
@@ -4,6 +4,10 @@ from typing import List, Dict, Any
 import datetime
 
 
+# Returned when a subject has no topics.
+GENERAL_REVIEW: Dict[str, Any] = {"id": None, "name": "General review"}
+
+
 def pick_next_topic(
     subject_id: str,
     topics: List[Dict[str, Any]],
@@ -35,10 +39,14 @@ def pick_next_topic(
         - familiarity (memory strength)
         - gap since last_seen (spacing)
         - repetition penalty (avoid overusing same topic)
+
+    Only topics that have been picked get a state entry; a missing entry
+    reads as never seen. Subjects with hundreds of topics would
+    otherwise hold a state dict per topic for the whole plan.
     """
 
     if not topics:
-        return {"id": None, "name": "General review"}
+        return dict(GENERAL_REVIEW)
 
     # Initialize state for this subject if missing
     if subject_id not in state:
@@ -54,13 +62,13 @@ def pick_next_topic(
         priority = int(t.get("priority", 3))
         familiarity = int(t.get("familiarity", 3))
 
-        # Initialize topic state if missing
-        if tid not in subject_state:
-            subject_state[tid] = {"last_seen": None, "times_seen": 0}
-
-        ts = subject_state[tid]
-        last_seen = ts["last_seen"]
-        times_seen = ts["times_seen"]
+        ts = subject_state.get(tid)
+        if ts is None:
+            last_seen = None
+            times_seen = 0
+        else:
+            last_seen = ts["last_seen"]
+            times_seen = ts["times_seen"]
 
         # --- Compute gap days ---
         if last_seen is None:
@@ -85,7 +93,20 @@ def pick_next_topic(
 
     # Update state for chosen topic
     chosen_id = best_topic["id"]
-    subject_state[chosen_id]["last_seen"] = current_date
-    subject_state[chosen_id]["times_seen"] += 1
+    chosen_state = subject_state.get(chosen_id)
+    if chosen_state is None:
+        chosen_state = subject_state[chosen_id] = {"last_seen": None, "times_seen": 0}
+    chosen_state["last_seen"] = current_date
+    chosen_state["times_seen"] += 1
 
-    return best_topic
\ No newline at end of file
+    return best_topic
+
+
+def round_robin_topic(topics: List[Dict[str, Any]], turn: int) -> Dict[str, Any]:
+    """
+    O(1) stand-in for `pick_next_topic`: cycle through topics in order.
+    Used where rotation quality is traded for speed (partial plans).
+    """
+    if not topics:
+        return dict(GENERAL_REVIEW)
+    return topics[turn % len(topics)]
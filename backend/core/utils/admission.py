@@ -0,0 +1,123 @@
+# backend/core/utils/admission.py
+from __future__ import annotations
+from typing import Iterator
+from dataclasses import dataclass
+from contextlib import contextmanager
+import math
+import threading
+import time
+
+
+ACCEPT = "accept"
+DOWNGRADE = "summary"
+
+
+@dataclass
+class AdmissionPolicy:
+    """
+    Limits for admitting plan requests, in cost units (see estimate_cost).
+    """
+    max_cost: int = 25_000_000          # larger requests are rejected outright (413)
+    capacity: int = 10_000_000          # total cost allowed to run at once
+    downgrade_cost: int = 2_000_000     # when busy, requests this large get summary mode
+    max_queue: int = 16                 # requests allowed to wait for capacity
+    queue_timeout: float = 10.0         # seconds a queued request waits before 429
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not admitted; carries the HTTP status to use."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def estimate_cost(days: int, subjects: int, topics: int) -> int:
+    """
+    Cost of a plan request: days × subjects × topics per subject.
+
+    Every scheduled day touches each subject, and every block scans its
+    subject's topic list during rotation.
+    """
+    days = max(days, 1)
+    subjects = max(subjects, 1)
+    topics_per_subject = max(math.ceil(topics / subjects), 1)
+    return days * subjects * topics_per_subject
+
+
+class AdmissionController:
+    """
+    Admits requests against a shared in-flight cost budget.
+
+    Decision order for a request of cost C:
+        1. C > max_cost                        → reject (413)
+        2. C fits in the remaining capacity    → accept
+        3. C >= downgrade_cost and downgrade allowed → summary mode
+        4. queue not full                      → wait up to queue_timeout,
+                                                 then accept or reject (429)
+        5. otherwise                           → reject (429)
+
+    A request larger than `capacity` (but within max_cost) is accepted
+    when nothing else is running, so it cannot starve forever.
+    """
+
+    def __init__(self, policy: AdmissionPolicy | None = None) -> None:
+        self.policy = policy or AdmissionPolicy()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._queued = 0
+
+    @contextmanager
+    def admit(self, cost: int, allow_downgrade: bool = True) -> Iterator[str]:
+        """
+        Context manager yielding ACCEPT or DOWNGRADE. Accepted requests
+        hold their cost until the block exits; downgraded ones hold none.
+        Raises AdmissionRejected.
+        """
+        action = self._acquire(cost, allow_downgrade)
+        try:
+            yield action
+        finally:
+            if action == ACCEPT:
+                with self._cond:
+                    self._in_flight -= cost
+                    self._cond.notify_all()
+
+    def in_flight_cost(self) -> int:
+        with self._cond:
+            return self._in_flight
+
+    def _fits(self, cost: int) -> bool:
+        return self._in_flight == 0 or self._in_flight + cost <= self.policy.capacity
+
+    def _acquire(self, cost: int, allow_downgrade: bool) -> str:
+        policy = self.policy
+
+        if cost > policy.max_cost:
+            raise AdmissionRejected(413, "Plan request is too large. Reduce subjects, topics or the date range.")
+
+        with self._cond:
+            if self._fits(cost):
+                self._in_flight += cost
+                return ACCEPT
+
+            if allow_downgrade and cost >= policy.downgrade_cost:
+                return DOWNGRADE
+
+            if self._queued >= policy.max_queue:
+                raise AdmissionRejected(429, "Server is busy. Please retry shortly.")
+
+            self._queued += 1
+            deadline = time.monotonic() + policy.queue_timeout
+            try:
+                while not self._fits(cost):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise AdmissionRejected(429, "Server is busy. Please retry shortly.")
+                    self._cond.wait(remaining)
+            finally:
+                self._queued -= 1
+
+            self._in_flight += cost
+            return ACCEPT
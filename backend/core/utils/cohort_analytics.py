@@ -0,0 +1,318 @@
+# backend/core/utils/cohort_analytics.py
+from __future__ import annotations
+from array import array
+from datetime import date, timedelta
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .plan_diff import plan_etag
+from .time_utils import WEEKDAYS, parse_date
+from ..engine.slot_placement import parse_windows, cap_minutes_to_windows
+
+
+# Per-plan utilization histogram: 10 buckets of 10%, the last one also
+# holds plans at or above 100%.
+UTILIZATION_BUCKETS = 10
+
+UNKNOWN = -1
+
+
+# ---------------------------------------------------------
+# Columns
+# ---------------------------------------------------------
+
+class CohortColumns:
+    """
+    Many plans (exam or weekly public shape) flattened into compact
+    integer columns: one row per plan day and one per subject entry.
+    Plans are read once by `add` and can be dropped afterwards, so
+    memory grows with the columns, not with the plan JSON.
+
+        day_plan, day_date (ordinal), day_minutes, day_capacity
+        entry_plan, entry_subject, entry_minutes
+
+    Day rows cover the plan's days and, when its availability is known,
+    every date of its availability window (exam plans leave out days
+    without study; those get 0 minutes). day_capacity is the study time
+    the availability offered that date, or -1 when the plan came
+    without its availability. Subjects are interned by name: ids are
+    per user, names are what a cohort shares.
+    """
+
+    def __init__(self) -> None:
+        self.plans = 0
+        self.day_plan = array("q")
+        self.day_date = array("q")
+        self.day_minutes = array("q")
+        self.day_capacity = array("q")
+        self.entry_plan = array("q")
+        self.entry_subject = array("q")
+        self.entry_minutes = array("q")
+        self.subject_names: List[str] = []
+        self._subject_index: Dict[str, int] = {}
+
+    def add(self, plan: Dict[str, Any], availability: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Append one plan. `availability` is the request's availability
+        dict (minutes_per_weekday, rest_dates, windows_per_weekday).
+        """
+        p = self.plans
+        self.plans += 1
+
+        minutes: Dict[int, int] = {}
+        for day in plan.get("days", []):
+            o = _as_date(day["date"]).toordinal()
+            minutes[o] = minutes.get(o, 0) + day.get("total_minutes", 0)
+
+            for block in day.get("blocks", []):
+                if "subjects" in block:
+                    entries = block["subjects"]
+                else:
+                    entries = [block["subject"]] if block.get("subject") else []
+                for s in entries:
+                    self.entry_plan.append(p)
+                    self.entry_subject.append(self._intern(s.get("name") or str(s.get("id"))))
+                    self.entry_minutes.append(s.get("minutes", 0))
+
+        offered = _offered_minutes(plan, availability)
+        if offered is None:
+            rows = ((o, m, UNKNOWN) for o, m in minutes.items())
+        else:
+            rows = ((o, minutes.get(o, 0), offered.get(o, 0)) for o in sorted(minutes.keys() | offered.keys()))
+        for o, m, c in rows:
+            self.day_plan.append(p)
+            self.day_date.append(o)
+            self.day_minutes.append(m)
+            self.day_capacity.append(c)
+
+    def _intern(self, name: str) -> int:
+        i = self._subject_index.get(name)
+        if i is None:
+            i = self._subject_index[name] = len(self.subject_names)
+            self.subject_names.append(name)
+        return i
+
+
+def _offered_minutes(plan: Dict[str, Any], availability: Optional[Dict[str, Any]]) -> Optional[Dict[int, int]]:
+    """
+    Study minutes the availability offered per date (ordinal) over the
+    plan's window: start_date..end_date for exam plans, the 7 days
+    from week_start for weekly plans. Rest dates offer 0; windows cap
+    the weekday minutes. None when the availability is unknown.
+    """
+    if not availability or "minutes_per_weekday" not in availability:
+        return None
+    try:
+        windows = parse_windows(availability.get("windows_per_weekday") or {})
+        if plan.get("week_start"):
+            start = _as_date(plan["week_start"])
+            end = start + timedelta(days=6)
+        else:
+            start = _as_date(availability["start_date"])
+            end = _as_date(availability["end_date"])
+        rest = {_as_date(d) for d in availability.get("rest_dates") or ()}
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    per_weekday = cap_minutes_to_windows(availability["minutes_per_weekday"], windows)
+    offered: Dict[int, int] = {}
+    for i in range((end - start).days + 1):
+        d = start + timedelta(days=i)
+        offered[d.toordinal()] = 0 if d in rest else per_weekday.get(WEEKDAYS[d.weekday()], 0)
+    return offered
+
+
+def _as_date(value: Any) -> date:
+    return value if isinstance(value, date) else parse_date(value)
+
+
+# ---------------------------------------------------------
+# Report
+# ---------------------------------------------------------
+
+def cohort_report(columns: CohortColumns) -> Dict[str, Any]:
+    """
+    Aggregates over every plan in `columns`:
+
+        {
+            "plans": int,
+            "dates": {                          # one entry per calendar date
+                "date": ["YYYY-MM-DD", ...],
+                "plans": [int, ...],            # plans covering the date
+                "total_minutes": [int, ...],    # summed over those plans
+                "mean_minutes": [float, ...],
+                "capacity_used": [float | None, ...],
+            },
+            "subjects": [                       # by total minutes, descending
+                {"name": str, "plans": int, "minutes": int, "share": float}, ...
+            ],
+            "subjects_per_plan": {"3": int, ...},
+            "capacity": {
+                "minutes": int,                 # over days with known capacity
+                "capacity": int,
+                "used": float | None,
+                "plans": [int, ...],            # UTILIZATION_BUCKETS histogram
+            },
+        }
+
+    A plan covers its days and its availability window, so exam days
+    without study count with 0 minutes and their full capacity.
+
+    Every aggregate is a sweep over the columns into dense arrays
+    indexed by date offset, plan or subject; nothing is keyed by
+    per-row dicts.
+    """
+    n_plans = columns.plans
+    n_subjects = len(columns.subject_names)
+
+    # Per date.
+    if columns.day_date:
+        first, last = min(columns.day_date), max(columns.day_date)
+    else:
+        first, last = 0, -1
+    n_dates = last - first + 1
+    date_plans = _zeros(n_dates)
+    date_minutes = _zeros(n_dates)
+    date_known_minutes = _zeros(n_dates)
+    date_capacity = _zeros(n_dates)
+
+    # Per plan.
+    plan_known_minutes = _zeros(n_plans)
+    plan_capacity = _zeros(n_plans)
+
+    for p, o, m, c in zip(columns.day_plan, columns.day_date, columns.day_minutes, columns.day_capacity):
+        i = o - first
+        date_plans[i] += 1
+        date_minutes[i] += m
+        if c != UNKNOWN:
+            date_known_minutes[i] += m
+            date_capacity[i] += c
+            plan_known_minutes[p] += m
+            plan_capacity[p] += c
+
+    # Per subject, and distinct subjects per plan. A plan's entries are
+    # contiguous, so the last plan that counted a subject is enough to
+    # count each (plan, subject) pair once.
+    subject_minutes = _zeros(n_subjects)
+    subject_plans = _zeros(n_subjects)
+    subject_last_plan = array("q", [UNKNOWN]) * n_subjects
+    plan_subjects = _zeros(n_plans)
+    for p, s, m in zip(columns.entry_plan, columns.entry_subject, columns.entry_minutes):
+        subject_minutes[s] += m
+        if m > 0 and subject_last_plan[s] != p:
+            subject_last_plan[s] = p
+            subject_plans[s] += 1
+            plan_subjects[p] += 1
+
+    total_minutes = sum(subject_minutes)
+    subjects = sorted(
+        (
+            {
+                "name": name,
+                "plans": subject_plans[s],
+                "minutes": subject_minutes[s],
+                "share": round(subject_minutes[s] / total_minutes, 4) if total_minutes else 0.0,
+            }
+            for s, name in enumerate(columns.subject_names)
+        ),
+        key=lambda row: (-row["minutes"], row["name"]),
+    )
+
+    histogram = _zeros(max(plan_subjects, default=0) + 1)
+    for k in plan_subjects:
+        histogram[k] += 1
+    subjects_per_plan = {str(k): n for k, n in enumerate(histogram) if n}
+
+    buckets = [0] * UTILIZATION_BUCKETS
+    for m, c in zip(plan_known_minutes, plan_capacity):
+        if c > 0:
+            buckets[min(int(m * UTILIZATION_BUCKETS / c), UTILIZATION_BUCKETS - 1)] += 1
+
+    dates = [i for i in range(n_dates) if date_plans[i]]
+    known_minutes, known_capacity = sum(plan_known_minutes), sum(plan_capacity)
+
+    return {
+        "plans": n_plans,
+        "dates": {
+            "date": [date.fromordinal(first + i).isoformat() for i in dates],
+            "plans": [date_plans[i] for i in dates],
+            "total_minutes": [date_minutes[i] for i in dates],
+            "mean_minutes": [round(date_minutes[i] / date_plans[i], 1) for i in dates],
+            "capacity_used": [
+                round(date_known_minutes[i] / date_capacity[i], 4) if date_capacity[i] else None
+                for i in dates
+            ],
+        },
+        "subjects": subjects,
+        "subjects_per_plan": subjects_per_plan,
+        "capacity": {
+            "minutes": known_minutes,
+            "capacity": known_capacity,
+            "used": round(known_minutes / known_capacity, 4) if known_capacity else None,
+            "plans": buckets,
+        },
+    }
+
+
+def _zeros(n: int) -> array:
+    return array("q", [0]) * n
+
+
+# ---------------------------------------------------------
+# Records
+# ---------------------------------------------------------
+
+Record = Tuple[Dict[str, Any], Optional[Dict[str, Any]]]
+
+
+def job_records(jobs: Iterable[Dict[str, Any]]) -> Iterator[Record]:
+    """
+    (plan, availability) pairs from JobQueue.iter_done rows; the job
+    payload is the request, so capacity is known for these plans.
+    """
+    for job in jobs:
+        if "days" in job["result"]:
+            yield job["result"], job["payload"].get("availability")
+
+
+def stored_records(plans: Iterable[Dict[str, Any]]) -> Iterator[Record]:
+    """
+    (plan, None) pairs from PlanStore.iter_plans rows (newest first),
+    one per re-plan lineage: earlier versions of a re-planned plan are
+    skipped. Stored plans come without their request, so their capacity
+    is unknown.
+    """
+    lineages = set()
+    for row in plans:
+        lineage = row.get("lineage")
+        if lineage is not None:
+            if lineage in lineages:
+                continue
+            lineages.add(lineage)
+        if "days" in row["plan"]:
+            yield row["plan"], None
+
+
+def distinct_records(records: Iterable[Record]) -> Iterator[Record]:
+    """
+    `records` without repeated plans (by ETag), keeping the first: a
+    job's plan can also be stored for re-plan diffs.
+    """
+    seen = set()
+    for plan, availability in records:
+        etag = plan_etag(plan)
+        if etag not in seen:
+            seen.add(etag)
+            yield plan, availability
+
+
+def collect(*sources: Iterable[Record], limit: Optional[int] = None) -> CohortColumns:
+    """
+    Columns for the (plan, availability or None) pairs of `sources`, in
+    order, stopping after `limit` plans. Summary-only plans are skipped
+    by the record adapters above.
+    """
+    columns = CohortColumns()
+    for plan, availability in islice(chain(*sources), limit):
+        columns.add(plan, availability)
+    return columns
@@ -0,0 +1,221 @@
+# backend/core/utils/columnar.py
+from __future__ import annotations
+from typing import Dict, Any, List, Tuple
+
+from .time_utils import WEEKDAYS
+
+
+_WEEKDAY_INDEX = {name: i for i, name in enumerate(WEEKDAYS)}
+
+
+# ---------------------------------------------------------
+# Public API
+# ---------------------------------------------------------
+
+def to_columnar(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Encode a plan (exam or weekly public shape) as interned columns.
+
+    Subjects and topics are listed once; days, blocks and block entries
+    become parallel integer arrays that reference them by index:
+
+        {
+            "format": "columnar",
+            "shape": "exam" | "weekly",
+            "subjects": [{"id", "name", "difficulty"}, ...],
+            "topics": [{...topic dict...}, ...],
+            "days": {
+                "date": ["YYYY-MM-DD", ...],
+                "weekday": [0-6, ...],          # index into WEEKDAYS
+                "total_minutes": [int, ...],
+                "blocks": [int, ...],           # offsets, len(days) + 1
+            },
+            "blocks": {
+                "minutes": [int, ...],
+                "entries": [int, ...],          # offsets, len(blocks) + 1
+            },
+            "entries": {
+                "subject": [int, ...],
+                "topic": [int, ...],            # -1 = no topic
+                "minutes": [int, ...],
+            },
+            ...any other top-level plan keys (week_start, shortfall)...
+        }
+
+    Plans placed into time windows also carry blocks.placed (0/1),
+    blocks.slots (offsets, len(blocks) + 1) and
+    "slots": {"start": ["HH:MM", ...], "end": ["HH:MM", ...]}.
+
+    Day i owns blocks days.blocks[i]:days.blocks[i+1]; block j owns
+    entries blocks.entries[j]:blocks.entries[j+1]. Exam blocks have at
+    most one entry. `from_columnar` is the exact inverse.
+
+    The input plan is not modified (it may be shared between requests).
+    """
+    shape = "weekly"
+    subjects: List[Dict[str, Any]] = []
+    subject_index: Dict[Tuple[Any, Any, Any], int] = {}
+    topics: List[Dict[str, Any]] = []
+    topic_index: Dict[Any, int] = {}
+
+    day_date: List[str] = []
+    day_weekday: List[int] = []
+    day_total: List[int] = []
+    day_blocks: List[int] = [0]
+    block_minutes: List[int] = []
+    block_entries: List[int] = [0]
+    entry_subject: List[int] = []
+    entry_topic: List[int] = []
+    entry_minutes: List[int] = []
+    block_placed: List[int] = []
+    block_slots: List[int] = [0]
+    slot_start: List[str] = []
+    slot_end: List[str] = []
+
+    for day in plan.get("days", []):
+        date_str = day["date"] if isinstance(day["date"], str) else day["date"].isoformat()
+        day_date.append(date_str)
+        day_weekday.append(_WEEKDAY_INDEX.get(day.get("weekday"), -1))
+        day_total.append(day.get("total_minutes", 0))
+
+        for block in day.get("blocks", []):
+            if "subjects" in block:
+                entries = block["subjects"]
+            else:
+                shape = "exam"
+                entries = [block["subject"]] if block.get("subject") else []
+
+            block_minutes.append(block.get("minutes", 0))
+            block_placed.append(1 if "slots" in block else 0)
+            for slot in block.get("slots", ()):
+                slot_start.append(slot["start"])
+                slot_end.append(slot["end"])
+            block_slots.append(len(slot_start))
+
+            for s in entries:
+                key = (s.get("id"), s.get("name"), s.get("difficulty"))
+                idx = subject_index.get(key)
+                if idx is None:
+                    idx = subject_index[key] = len(subjects)
+                    subjects.append({"id": key[0], "name": key[1], "difficulty": key[2]})
+                entry_subject.append(idx)
+                entry_topic.append(_intern_topic(s.get("topic"), topics, topic_index))
+                entry_minutes.append(s.get("minutes", 0))
+
+            block_entries.append(len(entry_subject))
+
+        day_blocks.append(len(block_minutes))
+
+    out = {k: v for k, v in plan.items() if k != "days"}
+    out.update(
+        {
+            "format": "columnar",
+            "shape": shape,
+            "subjects": subjects,
+            "topics": topics,
+            "days": {
+                "date": day_date,
+                "weekday": day_weekday,
+                "total_minutes": day_total,
+                "blocks": day_blocks,
+            },
+            "blocks": {"minutes": block_minutes, "entries": block_entries},
+            "entries": {"subject": entry_subject, "topic": entry_topic, "minutes": entry_minutes},
+        }
+    )
+    if any(block_placed):
+        out["blocks"]["placed"] = block_placed
+        out["blocks"]["slots"] = block_slots
+        out["slots"] = {"start": slot_start, "end": slot_end}
+    return out
+
+
+def from_columnar(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Expand a `to_columnar` encoding back into the public plan shape.
+    """
+    exam_shape = data["shape"] == "exam"
+    subjects = data["subjects"]
+    topics = data["topics"]
+    days_col = data["days"]
+    blocks_col = data["blocks"]
+    entries_col = data["entries"]
+    slots_col = data.get("slots")
+
+    days: List[Dict[str, Any]] = []
+    for i, date_str in enumerate(days_col["date"]):
+        weekday = days_col["weekday"][i]
+        blocks: List[Dict[str, Any]] = []
+
+        for j in range(days_col["blocks"][i], days_col["blocks"][i + 1]):
+            entries: List[Dict[str, Any]] = []
+            for k in range(blocks_col["entries"][j], blocks_col["entries"][j + 1]):
+                subject = subjects[entries_col["subject"][k]]
+                topic_idx = entries_col["topic"][k]
+                entries.append(
+                    {
+                        "id": subject["id"],
+                        "name": subject["name"],
+                        "minutes": entries_col["minutes"][k],
+                        "topic": topics[topic_idx] if topic_idx >= 0 else None,
+                        "difficulty": subject["difficulty"],
+                    }
+                )
+
+            block: Dict[str, Any] = {"minutes": blocks_col["minutes"][j]}
+            if exam_shape:
+                if entries:
+                    block["subject"] = entries[0]
+            else:
+                block["subjects"] = entries
+            if slots_col is not None and blocks_col["placed"][j]:
+                _expand_slots(block, slots_col, blocks_col["slots"][j], blocks_col["slots"][j + 1])
+            blocks.append(block)
+
+        days.append(
+            {
+                "date": date_str,
+                "weekday": WEEKDAYS[weekday] if weekday >= 0 else None,
+                "total_minutes": days_col["total_minutes"][i],
+                "blocks": blocks,
+            }
+        )
+
+    plan = {
+        k: v
+        for k, v in data.items()
+        if k not in ("format", "shape", "subjects", "topics", "days", "blocks", "entries", "slots")
+    }
+    plan["days"] = days
+    return plan
+
+
+# ---------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------
+
+def _expand_slots(block: Dict[str, Any], slots_col: Dict[str, List[str]], lo: int, hi: int) -> None:
+    block["slots"] = [
+        {"start": slots_col["start"][k], "end": slots_col["end"][k]} for k in range(lo, hi)
+    ]
+    if lo < hi:
+        block["start"] = slots_col["start"][lo]
+        block["end"] = slots_col["end"][hi - 1]
+
+
+def _intern_topic(
+    topic: Dict[str, Any] | None,
+    topics: List[Dict[str, Any]],
+    index: Dict[Any, int],
+) -> int:
+    if not topic:
+        return -1
+
+    # Keyed by the full content, not the id: topic ids are only unique
+    # within a subject, and two subjects may both have a topic "t1".
+    key = tuple(sorted(topic.items()))
+    idx = index.get(key)
+    if idx is None:
+        idx = index[key] = len(topics)
+        topics.append(topic)
+    return idx
@@ -0,0 +1,23 @@
+# backend/core/utils/deadline.py
+from __future__ import annotations
+from typing import Optional
+import time
+
+
+class Deadline:
+    """
+    Cooperative compute budget for the allocators.
+
+    Loops call `expired()` at natural checkpoints (once per day, once per
+    block) and stop early when it returns True. The expiry is an absolute
+    time.monotonic() value, so a Deadline can be pickled into worker
+    processes on the same host.
+
+    Deadline(None) never expires.
+    """
+
+    def __init__(self, budget_ms: Optional[float] = None) -> None:
+        self.expires_at = None if budget_ms is None else time.monotonic() + budget_ms / 1000.0
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
@@ -0,0 +1,191 @@
+# backend/core/utils/ics_utils.py
+from __future__ import annotations
+from typing import Dict, Any, Iterable, Iterator, List
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+from ..engine.slot_placement import entry_segments
+
+
+PRODID = "-//Study Scheduler//Plan Export//EN"
+MAX_LINE_OCTETS = 75
+
+
+# ---------------------------------------------------------
+# Public API
+# ---------------------------------------------------------
+
+def render_plan_ics(
+    days: Iterable[Dict[str, Any]],
+    calendar_name: str = "Study plan",
+    now: datetime | None = None,
+) -> Iterator[bytes]:
+    """
+    Render a plan as an iCalendar (RFC 5545) file, yielding one chunk
+    per day.
+
+    Each subject entry of each block becomes an all-day VEVENT on its
+    day. Blocks placed into time windows (they carry "slots") become
+    timed, floating local-time VEVENTs instead, one per piece of the
+    entry's time. Days are consumed lazily, so only the current day's events are
+    held in memory.
+
+    Works with both public day shapes (exam `subject: {...}` blocks and
+    weekly `subjects: [...]` blocks).
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    dtstamp = "DTSTAMP:" + now.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    yield _join(
+        [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:" + PRODID,
+            "CALSCALE:GREGORIAN",
+            _fold("X-WR-CALNAME:" + _escape(calendar_name)),
+        ]
+    )
+
+    for day in days:
+        lines = _day_events(day, dtstamp)
+        if lines:
+            yield _join(lines)
+
+    yield _join(["END:VCALENDAR"])
+
+
+# ---------------------------------------------------------
+# Events
+# ---------------------------------------------------------
+
+def _day_events(day: Dict[str, Any], dtstamp: str) -> List[str]:
+    day_date = day["date"]
+    if isinstance(day_date, str):
+        day_date = date.fromisoformat(day_date)
+
+    dtstart, dtend = _date_props(day_date)
+    lines: List[str] = []
+
+    for b_idx, block in enumerate(day.get("blocks", [])):
+        if "subject" in block:
+            entries = [block["subject"]] if block["subject"] else []
+        else:
+            entries = block.get("subjects", [])
+
+        slots = block.get("slots")
+        if slots:
+            segments = entry_segments(slots, [int(s.get("minutes", 0)) for s in entries])
+        else:
+            segments = None
+
+        for s_idx, s in enumerate(entries):
+            topic = s.get("topic") or {}
+            uid = f"UID:{day_date:%Y%m%d}-{b_idx}-{s_idx}-{_uid_part(s.get('id'))}"
+            summary = _summary_line(s.get("name", ""), topic.get("name") or "", int(s.get("minutes", 0)))
+
+            if segments is None:
+                lines.extend(
+                    (
+                        "BEGIN:VEVENT",
+                        uid + "@study-scheduler",
+                        dtstamp,
+                        dtstart,
+                        dtend,
+                        summary,
+                        "TRANSP:TRANSPARENT",
+                        "END:VEVENT",
+                    )
+                )
+                continue
+
+            for p_idx, (start, end) in enumerate(segments[s_idx]):
+                lines.extend(
+                    (
+                        "BEGIN:VEVENT",
+                        f"{uid}-{p_idx}@study-scheduler",
+                        dtstamp,
+                        "DTSTART:" + _local_time(day_date, start),
+                        "DTEND:" + _local_time(day_date, end),
+                        summary,
+                        "TRANSP:OPAQUE",
+                        "END:VEVENT",
+                    )
+                )
+
+    return lines
+
+
+def _local_time(day_date: date, minutes: int) -> str:
+    """Floating local DATE-TIME; 24:00 becomes midnight of the next day."""
+    moment = datetime.combine(day_date, datetime.min.time()) + timedelta(minutes=minutes)
+    return f"{moment:%Y%m%dT%H%M%S}"
+
+
+@lru_cache(maxsize=1024)
+def _date_props(day_date: date) -> tuple:
+    return (
+        f"DTSTART;VALUE=DATE:{day_date:%Y%m%d}",
+        f"DTEND;VALUE=DATE:{day_date + timedelta(days=1):%Y%m%d}",
+    )
+
+
+@lru_cache(maxsize=4096)
+def _summary_line(subject_name: str, topic_name: str, minutes: int) -> str:
+    """
+    Escaped and folded SUMMARY line.
+
+    Subject/topic/minutes combinations repeat across a plan, so the
+    formatted line is built once and reused for every block.
+    """
+    text = f"{subject_name}: {topic_name}" if topic_name else subject_name
+    return _fold("SUMMARY:" + _escape(f"{text} ({minutes} min)"))
+
+
+@lru_cache(maxsize=1024)
+def _uid_part(value: Any) -> str:
+    if value is None:
+        return "x"
+    return "".join(ch for ch in str(value) if ch.isalnum() or ch in "-_") or "x"
+
+
+# ---------------------------------------------------------
+# Text helpers
+# ---------------------------------------------------------
+
+@lru_cache(maxsize=4096)
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets without splitting UTF-8 sequences."""
+    if len(line.encode("utf-8")) <= MAX_LINE_OCTETS:
+        return line
+
+    parts: List[str] = []
+    current = ""
+    current_len = 0
+    limit = MAX_LINE_OCTETS
+    for ch in line:
+        ch_len = len(ch.encode("utf-8"))
+        if current_len + ch_len > limit:
+            parts.append(current)
+            current = ""
+            current_len = 0
+            # continuation lines start with a space, which counts
+            limit = MAX_LINE_OCTETS - 1
+        current += ch
+        current_len += ch_len
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+
+def _join(lines: List[str]) -> bytes:
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
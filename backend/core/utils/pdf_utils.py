@@ -0,0 +1,198 @@
+# backend/core/utils/pdf_utils.py
+from __future__ import annotations
+from typing import Dict, Any, Iterable, Iterator, List
+from functools import lru_cache
+
+
+# ---------------------------------------------------------
+# Page geometry (A4 portrait, points)
+# ---------------------------------------------------------
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+MARGIN = 56
+FONT_SIZE = 10
+LINE_HEIGHT = 14
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+
+# Fixed object numbers; page objects are numbered from FIRST_PAGE_OBJ.
+CATALOG_OBJ = 1
+PAGES_OBJ = 2
+FONT_OBJ = 3
+BOLD_FONT_OBJ = 4
+FIRST_PAGE_OBJ = 5
+
+
+# ---------------------------------------------------------
+# Public API
+# ---------------------------------------------------------
+
+def render_plan_pdf(days: Iterable[Dict[str, Any]], title: str = "Study plan") -> Iterator[bytes]:
+    """
+    Render a plan into a PDF document, yielding the file in chunks.
+
+    `days` is consumed lazily, one day at a time, and each page is
+    emitted as soon as it is full. Only the current page's lines and
+    the per-object byte offsets (needed for the xref table) are kept in
+    memory, so memory stays flat regardless of plan length.
+
+    Works with both public day shapes:
+        exam:   {"date", "weekday", "total_minutes", "blocks": [{"minutes", "subject": {...}}]}
+        weekly: {"date", "weekday", "total_minutes", "blocks": [{"minutes", "subjects": [...]}]}
+    """
+    offsets: List[int] = []
+    position = 0
+
+    def emit(chunk: bytes) -> bytes:
+        nonlocal position
+        position += len(chunk)
+        return chunk
+
+    def emit_object(obj_num: int, body: bytes) -> bytes:
+        # Objects are written in numeric order, so the offset list doubles
+        # as the xref table.
+        offsets.append(position)
+        return emit(b"%d 0 obj\n" % obj_num + body + b"\nendobj\n")
+
+    yield emit(_header())
+    yield emit_object(CATALOG_OBJ, b"<< /Type /Catalog /Pages %d 0 R >>" % PAGES_OBJ)
+    # The page tree is written after the pages; reserve its slot so the
+    # xref stays in object order.
+    offsets.append(-1)
+    yield emit_object(FONT_OBJ, _font_object("Helvetica"))
+    yield emit_object(BOLD_FONT_OBJ, _font_object("Helvetica-Bold"))
+
+    page_count = 0
+    for lines in _paginate(days, title):
+        obj_num = FIRST_PAGE_OBJ + 2 * page_count
+        stream = _content_stream(lines)
+        yield emit_object(
+            obj_num,
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        )
+        yield emit_object(obj_num + 1, _page_template() % obj_num)
+        page_count += 1
+
+    kids = b" ".join(b"%d 0 R" % (FIRST_PAGE_OBJ + 2 * i + 1) for i in range(page_count))
+    pages_offset = position
+    yield emit(
+        b"%d 0 obj\n<< /Type /Pages /Kids [%s] /Count %d >>\nendobj\n"
+        % (PAGES_OBJ, kids, page_count)
+    )
+    offsets[PAGES_OBJ - 1] = pages_offset
+
+    xref_offset = position
+    xref = [b"xref\n0 %d\n" % (len(offsets) + 1), b"0000000000 65535 f \n"]
+    xref.extend(b"%010d 00000 n \n" % off for off in offsets)
+    yield emit(b"".join(xref))
+    yield emit(
+        b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(offsets) + 1, CATALOG_OBJ, xref_offset)
+    )
+
+
+# ---------------------------------------------------------
+# Layout
+# ---------------------------------------------------------
+
+def _paginate(days: Iterable[Dict[str, Any]], title: str) -> Iterator[List[tuple]]:
+    """
+    Turn days into pages of (is_heading, text) lines.
+    A day heading is never left alone at the bottom of a page.
+    """
+    page: List[tuple] = [(True, title), (False, "")]
+
+    for day in days:
+        day_lines = _day_lines(day)
+
+        if len(page) + min(len(day_lines), 2) > LINES_PER_PAGE:
+            yield page
+            page = []
+
+        for line in day_lines:
+            if len(page) >= LINES_PER_PAGE:
+                yield page
+                page = []
+            page.append(line)
+
+    # Always emit at least one page, even for an empty plan.
+    yield page
+
+
+def _day_lines(day: Dict[str, Any]) -> List[tuple]:
+    date_str = day.get("date")
+    if not isinstance(date_str, str):
+        date_str = date_str.isoformat()
+
+    lines: List[tuple] = [
+        (True, f"{day.get('weekday', '')} {date_str} - {day.get('total_minutes', 0)} min")
+    ]
+
+    for block in day.get("blocks", []):
+        if "subject" in block:
+            entries = [block["subject"]] if block["subject"] else []
+        else:
+            entries = block.get("subjects", [])
+
+        for s in entries:
+            topic = s.get("topic") or {}
+            text = _entry_text(s.get("minutes", 0), s.get("name", ""), topic.get("name") or "")
+            lines.append((False, text))
+
+    lines.append((False, ""))
+    return lines
+
+
+@lru_cache(maxsize=4096)
+def _entry_text(minutes: int, subject_name: str, topic_name: str) -> str:
+    if topic_name:
+        return f"    {minutes:>3} min  {subject_name}: {topic_name}"
+    return f"    {minutes:>3} min  {subject_name}"
+
+
+# ---------------------------------------------------------
+# PDF primitives (cached across requests)
+# ---------------------------------------------------------
+
+@lru_cache(maxsize=1)
+def _header() -> bytes:
+    # Binary comment marks the file as binary for transfer tools.
+    return b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+
+
+@lru_cache(maxsize=None)
+def _font_object(base_font: str) -> bytes:
+    return (
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>"
+        % base_font.encode("ascii")
+    )
+
+
+@lru_cache(maxsize=1)
+def _page_template() -> bytes:
+    """Page dictionary with a single %d slot for the content object number."""
+    return (
+        b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+        % (PAGES_OBJ, PAGE_WIDTH, PAGE_HEIGHT)
+        + b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> " % (FONT_OBJ, BOLD_FONT_OBJ)
+        + b"/Contents %d 0 R >>"
+    )
+
+
+@lru_cache(maxsize=4096)
+def _encode_text(text: str) -> bytes:
+    raw = text.encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _content_stream(lines: List[tuple]) -> bytes:
+    parts = [b"BT\n%d TL\n%d %d Td\n" % (LINE_HEIGHT, MARGIN, PAGE_HEIGHT - MARGIN)]
+    current_font = None
+    for is_heading, text in lines:
+        font = b"/F2" if is_heading else b"/F1"
+        if font != current_font:
+            parts.append(b"%s %d Tf\n" % (font, FONT_SIZE))
+            current_font = font
+        parts.append(b"(" + _encode_text(text) + b") '\n")
+    parts.append(b"ET")
+    return b"".join(parts)
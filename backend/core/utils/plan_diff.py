@@ -0,0 +1,131 @@
+# backend/core/utils/plan_diff.py
+from __future__ import annotations
+from typing import Dict, Any, List
+import hashlib
+import json
+
+
+# ---------------------------------------------------------
+# Public API
+# ---------------------------------------------------------
+
+def plan_etag(plan: Dict[str, Any]) -> str:
+    """Content hash of a plan; equal plans share an ETag."""
+    body = json.dumps(plan, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]
+
+
+def diff_plans(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Day- and block-level patch that turns `old` into `new`.
+
+        {
+            "days": [                          # changed days, in date order
+                {"date": str, "op": "remove"},
+                {"date": str, "op": "add", "day": {...}},
+                {
+                    "date": str,
+                    "op": "update",
+                    "total_minutes": int,
+                    "block_count": int,        # blocks in the new day
+                    "blocks": {"3": {...}},    # new blocks by index, changed only
+                },
+            ],
+            "set": {key: value},               # changed top-level keys
+            "unset": [key, ...],               # top-level keys dropped
+        }
+
+    Both plans list days in date order (as both allocators emit them),
+    so the days are merged in a single pass: O(days + blocks).
+    Unchanged days and blocks are omitted.
+    """
+    old_days = old.get("days", [])
+    new_days = new.get("days", [])
+    changes: List[Dict[str, Any]] = []
+
+    i = j = 0
+    while i < len(old_days) or j < len(new_days):
+        old_date = old_days[i]["date"] if i < len(old_days) else None
+        new_date = new_days[j]["date"] if j < len(new_days) else None
+
+        if new_date is None or (old_date is not None and old_date < new_date):
+            changes.append({"date": old_date, "op": "remove"})
+            i += 1
+        elif old_date is None or new_date < old_date:
+            changes.append({"date": new_date, "op": "add", "day": new_days[j]})
+            j += 1
+        else:
+            update = _diff_day(old_days[i], new_days[j])
+            if update is not None:
+                changes.append(update)
+            i += 1
+            j += 1
+
+    patch: Dict[str, Any] = {"days": changes, "set": {}, "unset": []}
+    for key, value in new.items():
+        if key != "days" and old.get(key) != value:
+            patch["set"][key] = value
+    patch["unset"] = [key for key in old if key != "days" and key not in new]
+    return patch
+
+
+def apply_plan_patch(old: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Inverse of `diff_plans`: apply_plan_patch(old, diff_plans(old, new)) == new.
+    `old` is not modified.
+    """
+    changes = iter(patch.get("days", []))
+    change = next(changes, None)
+    days: List[Dict[str, Any]] = []
+
+    for day in old.get("days", []):
+        # Days added before this one.
+        while change is not None and change["op"] == "add" and change["date"] < day["date"]:
+            days.append(change["day"])
+            change = next(changes, None)
+
+        if change is None or change["date"] != day["date"]:
+            days.append(day)
+            continue
+
+        if change["op"] == "update":
+            blocks = list(day.get("blocks", []))[: change["block_count"]]
+            blocks.extend({} for _ in range(change["block_count"] - len(blocks)))
+            for index, block in change["blocks"].items():
+                blocks[int(index)] = block
+            days.append(dict(day, total_minutes=change["total_minutes"], blocks=blocks))
+        change = next(changes, None)
+
+    while change is not None:
+        days.append(change["day"])
+        change = next(changes, None)
+
+    plan = {k: v for k, v in old.items() if k != "days" and k not in patch.get("unset", [])}
+    plan.update(patch.get("set", {}))
+    plan["days"] = days
+    return plan
+
+
+# ---------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------
+
+def _diff_day(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any] | None:
+    if old == new:
+        return None
+
+    old_blocks = old.get("blocks", [])
+    new_blocks = new.get("blocks", [])
+    changed = {
+        str(k): block
+        for k, block in enumerate(new_blocks)
+        if k >= len(old_blocks) or old_blocks[k] != block
+    }
+
+    return {
+        "date": new["date"],
+        "op": "update",
+        "total_minutes": new.get("total_minutes", 0),
+        "block_count": len(new_blocks),
+        "blocks": changed,
+    }
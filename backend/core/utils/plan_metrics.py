@@ -0,0 +1,194 @@
+# backend/core/utils/plan_metrics.py
+from __future__ import annotations
+from array import array
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+from ..allocator.cognitive_load import CLSettings
+from .time_utils import parse_date
+
+
+# ---------------------------------------------------------
+# Public API
+# ---------------------------------------------------------
+
+def compute_plan_metrics(plan: Dict[str, Any], settings: CLSettings | None = None) -> Dict[str, Any]:
+    """
+    Cognitive-load metrics of a finished plan (exam or weekly public
+    shape), for the optional "metrics" section of plan responses:
+
+        {
+            "dates": ["YYYY-MM-DD", ...],       # first to last plan date
+            "subjects": [subject id, ...],      # column order below
+            "subject_minutes": [int, ...],      # per subject
+            "daily": {                          # per date
+                "total_minutes": [int, ...],
+                "hard_minutes": [int, ...],     # difficulty >= hard threshold
+                "distinct_subjects": [int, ...],
+                "load": [float, ...],           # difficulty-weighted hours
+            },
+            "load": {"mean": float, "peak": float, "peak_date": "YYYY-MM-DD" | None},
+            "streaks": {
+                "longest_study_days": int,      # consecutive dates with study
+                "longest_rest_days": int,       # ... without
+                "subjects": {subject id: int},  # consecutive dates per subject
+            },
+            "violations": {                     # CLSettings limits exceeded
+                "subjects_per_day": int,        # days
+                "hard_subjects_per_day": int,   # days
+                "subjects_per_block": int,      # blocks
+                "short_sessions": int,          # entries < min_light_session
+            },
+        }
+
+    A day's load is its minutes weighted by difficulty / 3, in hours
+    (an hour of a difficulty-3 subject counts 1.0).
+
+    Exam plans leave out days without study; those dates are filled in
+    as empty days, so daily arrays, the mean load and rest streaks cover
+    every calendar date of the plan, as they do for weekly plans.
+
+    The plan is read once into dense arrays (days x subjects minutes,
+    flat row-major, plus per-day columns); every metric is then a sweep
+    over those arrays. The plan is not modified.
+    """
+    if settings is None:
+        settings = CLSettings()
+
+    dates, days = _calendar(plan.get("days", []))
+    subject_ids, difficulty, entries = _intern_subjects(days)
+    n_days, n_subjects = len(days), len(subject_ids)
+
+    minutes = array("l", bytes(n_days * n_subjects * array("l").itemsize))
+    hard_minutes = array("l", bytes(n_days * array("l").itemsize))
+    hard_entries = array("l", bytes(n_days * array("l").itemsize))
+    violations = {"subjects_per_day": 0, "hard_subjects_per_day": 0, "subjects_per_block": 0, "short_sessions": 0}
+
+    for d, day_entries in enumerate(entries):
+        row = d * n_subjects
+        for block in day_entries:
+            if len(block) > settings.max_subjects_per_block:
+                violations["subjects_per_block"] += 1
+            for s, m in block:
+                minutes[row + s] += m
+                if 0 < m < settings.min_light_session:
+                    violations["short_sessions"] += 1
+                if difficulty[s] >= settings.hard_subject_threshold:
+                    hard_minutes[d] += m
+                    hard_entries[d] += 1
+
+    total = [0] * n_days
+    distinct = [0] * n_days
+    load = [0.0] * n_days
+    subject_minutes = [0] * n_subjects
+    weight = [difficulty[s] / 3 for s in range(n_subjects)]
+
+    for d in range(n_days):
+        row = minutes[d * n_subjects:(d + 1) * n_subjects]
+        weighted = 0.0
+        for s, m in enumerate(row):
+            if m:
+                total[d] += m
+                distinct[d] += 1
+                subject_minutes[s] += m
+                weighted += m * weight[s]
+        load[d] = round(weighted / 60, 3)
+
+        if distinct[d] > settings.max_subjects_per_day:
+            violations["subjects_per_day"] += 1
+        if hard_entries[d] > settings.max_hard_subjects_per_day:
+            violations["hard_subjects_per_day"] += 1
+
+    peak = max(range(n_days), key=load.__getitem__) if n_days else None
+
+    return {
+        "dates": [d.isoformat() for d in dates],
+        "subjects": subject_ids,
+        "subject_minutes": subject_minutes,
+        "daily": {
+            "total_minutes": total,
+            "hard_minutes": hard_minutes.tolist(),
+            "distinct_subjects": distinct,
+            "load": load,
+        },
+        "load": {
+            "mean": round(sum(load) / n_days, 3) if n_days else 0.0,
+            "peak": load[peak] if peak is not None else 0.0,
+            "peak_date": dates[peak].isoformat() if peak is not None else None,
+        },
+        "streaks": {
+            "longest_study_days": _longest_run([t > 0 for t in total]),
+            "longest_rest_days": _longest_run([t == 0 for t in total]),
+            "subjects": {
+                sid: _longest_run([minutes[d * n_subjects + s] > 0 for d in range(n_days)])
+                for s, sid in enumerate(subject_ids)
+            },
+        },
+        "violations": violations,
+    }
+
+
+# ---------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------
+
+def _calendar(days: List[Dict[str, Any]]) -> Tuple[List[date], List[Dict[str, Any]]]:
+    """
+    Every date from the first to the last plan day, and the plan day
+    for each (an empty day where the plan has none).
+    """
+    by_date = {_as_date(day["date"]): day for day in days}
+    if not by_date:
+        return [], []
+
+    first, last = min(by_date), max(by_date)
+    dates = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+    return dates, [by_date.get(d, {"blocks": []}) for d in dates]
+
+
+def _intern_subjects(
+    days: List[Dict[str, Any]],
+) -> Tuple[List[Any], List[int], List[List[List[Tuple[int, int]]]]]:
+    """
+    Subject ids in first-seen order, their difficulty, and per day per
+    block the (subject index, minutes) entries.
+    """
+    index: Dict[Any, int] = {}
+    subject_ids: List[Any] = []
+    difficulty: List[int] = []
+    entries: List[List[List[Tuple[int, int]]]] = []
+
+    for day in days:
+        day_entries = []
+        for block in day.get("blocks", []):
+            if "subjects" in block:
+                block_subjects = block["subjects"]
+            else:
+                block_subjects = [block["subject"]] if block.get("subject") else []
+
+            block_entries = []
+            for s in block_subjects:
+                sid = s.get("id") or s.get("name")
+                i = index.get(sid)
+                if i is None:
+                    i = index[sid] = len(subject_ids)
+                    subject_ids.append(sid)
+                    difficulty.append(s.get("difficulty") or 0)
+                block_entries.append((i, s.get("minutes", 0)))
+            day_entries.append(block_entries)
+        entries.append(day_entries)
+
+    return subject_ids, difficulty, entries
+
+
+def _as_date(value: Any) -> date:
+    return value if isinstance(value, date) else parse_date(value)
+
+
+def _longest_run(flags: List[bool]) -> int:
+    """Longest run of flagged days (days are consecutive dates)."""
+    best = run = 0
+    for flag in flags:
+        run = run + 1 if flag else 0
+        best = max(best, run)
+    return best
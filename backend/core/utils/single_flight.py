@@ -0,0 +1,69 @@
+# backend/core/utils/single_flight.py
+from __future__ import annotations
+from typing import Any, Callable, Dict, Optional
+from concurrent.futures import Future
+import hashlib
+import json
+import threading
+
+
+def canonical_key(namespace: str, data: Any) -> str:
+    """
+    Stable key for a JSON-like request body: key order and whitespace do
+    not matter, so byte-identical (and reordered) requests share a key.
+    """
+    body = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return namespace + ":" + hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    Run at most one in-flight call per key.
+
+    The first caller for a key (the leader) runs the function; callers
+    that arrive while it is running wait for the leader's result, or
+    exception, instead of computing it again. Once the call finishes the
+    key is released, so later callers compute afresh (this is not a
+    cache).
+
+    Waiters receive the very same result object as the leader; treat it
+    as read-only.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """
+        Return fn()'s result, sharing it with concurrent callers of `key`.
+
+        Waiters give up after `timeout` seconds with
+        concurrent.futures.TimeoutError; the leader is never interrupted.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result(timeout=timeout)
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,181 @@
+# backend/core/utils/syllabus.py
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Set
+import codecs
+import csv
+import json
+import uuid
+
+
+SYLLABUS_FORMATS = ("csv", "ndjson")
+
+# Fixed namespaces for topic IDs derived from (subject, name) and
+# subject IDs derived from a name.
+TOPIC_ID_NAMESPACE = uuid.UUID("5b1e4a52-8d6e-4d8b-9a43-0f6f2f7c1d10")
+SUBJECT_ID_NAMESPACE = uuid.UUID("970f96d2-dc44-4ec7-9e59-cc57e5776213")
+
+# A single line longer than this is rejected rather than buffered.
+MAX_LINE_CHARS = 64 * 1024
+
+
+class SyllabusError(ValueError):
+    """A syllabus row that cannot be imported; `line` is 1-based."""
+
+    def __init__(self, line: int, message: str) -> None:
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+def stable_topic_id(subject: str, name: str) -> str:
+    """Same subject and topic name -> same ID, across imports."""
+    return uuid.uuid5(TOPIC_ID_NAMESPACE, f"{subject}\x1f{name}").hex
+
+
+def stable_subject_id(name: str) -> str:
+    """Same subject name -> same ID, across requests."""
+    return uuid.uuid5(SUBJECT_ID_NAMESPACE, name).hex
+
+
+# ---------------------------------------------------------
+# Streaming parser
+# ---------------------------------------------------------
+
+class SyllabusParser:
+    """
+    Push parser for syllabus uploads, one topic per row:
+
+        subject, name, priority (1-5, default 3),
+        familiarity (1-5, default 3), id (optional)
+
+    CSV starts with a header row naming these columns (any order; other
+    columns are ignored); quoted fields cannot span lines. NDJSON has
+    one JSON object per line. Blank lines are skipped in both.
+
+    Feed the body in byte chunks as it arrives; each call returns the
+    topics completed by that chunk:
+
+        parser = SyllabusParser("csv")
+        for chunk in body:
+            store(parser.feed(chunk))
+        store(parser.close())
+
+    Only the current partial line is held between calls (plus the IDs
+    seen so far, to reject duplicates). A row without an id gets
+    `stable_topic_id(subject, name)`, so re-importing a syllabus yields
+    the same IDs. Bad rows raise SyllabusError with their line number.
+    """
+
+    def __init__(self, fmt: str) -> None:
+        if fmt not in SYLLABUS_FORMATS:
+            raise ValueError(f"Unknown syllabus format: {fmt!r}")
+        self.fmt = fmt
+        self.line = 0
+        self.count = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._tail = ""
+        self._header: Optional[List[str]] = None
+        self._seen: Set[str] = set()
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        lines = self._split(self._decode(chunk, final=False))
+        if len(self._tail) > MAX_LINE_CHARS:
+            raise SyllabusError(self.line + 1, f"line longer than {MAX_LINE_CHARS} characters")
+        return self._parse_lines(lines)
+
+    def close(self) -> List[Dict[str, Any]]:
+        lines = self._split(self._decode(b"", final=True))
+        if self._tail:
+            lines.append(self._tail.rstrip("\r"))
+            self._tail = ""
+        topics = self._parse_lines(lines)
+        if self.fmt == "csv" and self._header is None:
+            raise SyllabusError(max(self.line, 1), "missing CSV header row")
+        return topics
+
+    # -----------------------------------------------------
+
+    def _decode(self, chunk: bytes, final: bool) -> str:
+        try:
+            return self._decoder.decode(chunk, final)
+        except UnicodeDecodeError:
+            raise SyllabusError(self.line + 1, "not valid UTF-8")
+
+    def _split(self, text: str) -> List[str]:
+        lines = (self._tail + text).split("\n")
+        self._tail = lines.pop()
+        return [line.rstrip("\r") for line in lines]
+
+    def _parse_lines(self, lines: List[str]) -> List[Dict[str, Any]]:
+        topics: List[Dict[str, Any]] = []
+        for text in lines:
+            self.line += 1
+            if not text.strip():
+                continue
+
+            if self.fmt == "csv":
+                fields = next(csv.reader([text]))
+                if self._header is None:
+                    self._header = self._parse_header(fields)
+                    continue
+                if len(fields) != len(self._header):
+                    raise SyllabusError(
+                        self.line, f"expected {len(self._header)} fields, got {len(fields)}"
+                    )
+                row: Any = dict(zip(self._header, fields))
+            else:
+                try:
+                    row = json.loads(text)
+                except ValueError as exc:
+                    raise SyllabusError(self.line, f"invalid JSON ({exc.args[0]})")
+                if not isinstance(row, dict):
+                    raise SyllabusError(self.line, "expected a JSON object")
+
+            topics.append(self._topic(row))
+        self.count += len(topics)
+        return topics
+
+    def _parse_header(self, fields: List[str]) -> List[str]:
+        header = [f.strip().lower() for f in fields]
+        for required in ("subject", "name"):
+            if required not in header:
+                raise SyllabusError(self.line, f"CSV header has no {required!r} column")
+        return header
+
+    def _topic(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        subject = self._text(row, "subject")
+        name = self._text(row, "name")
+        if not subject or not name:
+            raise SyllabusError(self.line, "subject and name are required")
+
+        topic_id = self._text(row, "id") or stable_topic_id(subject, name)
+        if topic_id in self._seen:
+            raise SyllabusError(self.line, f"duplicate topic {topic_id!r}")
+        self._seen.add(topic_id)
+
+        return {
+            "subject": subject,
+            "id": topic_id,
+            "name": name,
+            "priority": self._level(row, "priority"),
+            "familiarity": self._level(row, "familiarity"),
+        }
+
+    def _text(self, row: Dict[str, Any], field: str) -> str:
+        value = row.get(field)
+        if value is None:
+            return ""
+        if not isinstance(value, (str, int)) or isinstance(value, bool):
+            raise SyllabusError(self.line, f"{field} must be a string")
+        return str(value).strip()
+
+    def _level(self, row: Dict[str, Any], field: str) -> int:
+        value = row.get(field)
+        if value is None or value == "":
+            return 3
+        try:
+            level = int(value)
+        except (TypeError, ValueError):
+            level = 0
+        if isinstance(value, (bool, float)) or not 1 <= level <= 5:
+            raise SyllabusError(self.line, f"{field} must be an integer from 1 to 5")
+        return level
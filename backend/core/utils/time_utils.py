@@ -0,0 +1,76 @@
+# backend/core/utils/time_utils.py
+from __future__ import annotations
+from typing import Dict, Any, List, Iterable, Tuple, Optional
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value: str) -> date:
+    """
+    Parse "YYYY-MM-DD". Cached: plans repeat the same few dates (exam
+    dates, rest dates, window bounds) across subjects and requests.
+    """
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def week_start(d: date) -> date:
+    """Monday of the ISO week containing `d`."""
+    return d - timedelta(days=d.weekday())
+
+
+def fill_days_in_order(
+    days: List[Dict[str, Any]],
+    total_minutes: int,
+    until: Optional[date] = None,
+) -> List[Tuple[date, int]]:
+    """
+    Greedily pour `total_minutes` into days (each with "date" and
+    "available_minutes"), earliest first, stopping before `until`.
+
+    This is the daily load profile both allocators converge to when they
+    fill each day before moving on, computed without building blocks.
+    """
+    loads: List[Tuple[date, int]] = []
+    remaining = total_minutes
+
+    for day in days:
+        if until is not None and day["date"] >= until:
+            break
+        minutes = min(day["available_minutes"], max(remaining, 0))
+        loads.append((day["date"], minutes))
+        remaining -= minutes
+
+    return loads
+
+
+def summarize_day_loads(loads: Iterable[Tuple[date, int]]) -> Dict[str, Any]:
+    """
+    Aggregate (date, minutes) pairs into per-weekday and per-week totals:
+
+        {
+            "weekdays": {"Monday": int, ..., "Sunday": int},
+            "weeks": [{"week_start": "YYYY-MM-DD", "minutes": int}, ...],
+            "total_minutes": int,
+        }
+    """
+    weekdays = {name: 0 for name in WEEKDAYS}
+    weeks: Dict[date, int] = {}
+    total = 0
+
+    for d, minutes in loads:
+        weekdays[WEEKDAYS[d.weekday()]] += minutes
+        ws = week_start(d)
+        weeks[ws] = weeks.get(ws, 0) + minutes
+        total += minutes
+
+    return {
+        "weekdays": weekdays,
+        "weeks": [
+            {"week_start": ws.isoformat(), "minutes": m} for ws, m in sorted(weeks.items())
+        ],
+        "total_minutes": total,
+    }
@@ -0,0 +1,107 @@
+# backend/database/catalog_store.py
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+import time
+import uuid
+
+from .db import connect, init_db, transaction
+
+
+class CatalogStore:
+    """
+    Imported syllabus catalogs: topics per subject, with stable IDs.
+
+    An import creates the catalog as "importing", appends topics in
+    batches as the upload is parsed and marks it "ready" at the end
+    (or discards it on error). Readers only see ready catalogs, which
+    never change afterwards; a re-import creates a new catalog.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        init_db(self.path)
+
+    def create(self, name: str) -> str:
+        catalog_id = uuid.uuid4().hex
+        conn = connect(self.path)
+        try:
+            conn.execute(
+                "INSERT INTO catalogs (id, name, status, topic_count, created_at) "
+                "VALUES (?, ?, 'importing', 0, ?)",
+                (catalog_id, name, time.time()),
+            )
+        finally:
+            conn.close()
+        return catalog_id
+
+    def add_topics(self, catalog_id: str, topics: Iterable[Dict[str, Any]]) -> None:
+        with transaction(self.path) as conn:
+            conn.executemany(
+                "INSERT INTO catalog_topics (catalog_id, subject, id, name, priority, familiarity) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (catalog_id, t["subject"], t["id"], t["name"], t["priority"], t["familiarity"])
+                    for t in topics
+                ),
+            )
+
+    def finish(self, catalog_id: str, topic_count: int) -> None:
+        conn = connect(self.path)
+        try:
+            conn.execute(
+                "UPDATE catalogs SET status = 'ready', topic_count = ? WHERE id = ?",
+                (topic_count, catalog_id),
+            )
+        finally:
+            conn.close()
+
+    def discard(self, catalog_id: str) -> None:
+        with transaction(self.path) as conn:
+            conn.execute("DELETE FROM catalog_topics WHERE catalog_id = ?", (catalog_id,))
+            conn.execute("DELETE FROM catalogs WHERE id = ?", (catalog_id,))
+
+    def exists(self, catalog_id: str) -> bool:
+        conn = connect(self.path)
+        try:
+            row = conn.execute(
+                "SELECT 1 FROM catalogs WHERE id = ? AND status = 'ready'", (catalog_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row is not None
+
+    def get(self, catalog_id: str) -> Optional[Dict[str, Any]]:
+        """Catalog metadata with per-subject topic counts, or None."""
+        conn = connect(self.path)
+        try:
+            row = conn.execute(
+                "SELECT id, name, topic_count, created_at FROM catalogs "
+                "WHERE id = ? AND status = 'ready'",
+                (catalog_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            subjects = conn.execute(
+                "SELECT subject, COUNT(*) AS n FROM catalog_topics WHERE catalog_id = ? "
+                "GROUP BY subject ORDER BY MIN(rowid)",
+                (catalog_id,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return {**dict(row), "subjects": {s["subject"]: s["n"] for s in subjects}}
+
+    def topics(self, catalog_id: str, subject: str) -> List[Dict[str, Any]]:
+        """A subject's topics in upload order (empty if none)."""
+        conn = connect(self.path)
+        try:
+            rows = conn.execute(
+                "SELECT t.id, t.name, t.priority, t.familiarity FROM catalog_topics t "
+                "JOIN catalogs c ON c.id = t.catalog_id "
+                "WHERE t.catalog_id = ? AND t.subject = ? AND c.status = 'ready' "
+                "ORDER BY t.rowid",
+                (catalog_id, subject),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [dict(r) for r in rows]
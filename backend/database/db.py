@@ -0,0 +1,76 @@
+# backend/database/db.py
+"""
+SQLite access for the local, broker-free persistence layer.
+
+Each call to `connect` opens its own connection, so it is safe to use
+from worker threads and from several uvicorn worker processes sharing
+one database file (WAL mode + busy timeout).
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+import sqlite3
+
+SCHEMA_PATH = Path(__file__).with_name("schema.sql")
+
+# Columns added to existing tables after they first shipped (table ->
+# [(column, declaration)]), mirroring the ALTER TABLE migrations.
+# `CREATE TABLE IF NOT EXISTS` leaves older databases without them.
+ADDED_COLUMNS = {
+    "jobs": [("heartbeat_at", "REAL")],  # migrations/006_job_leases.sql
+    "plans": [("lineage", "TEXT")],  # migrations/007_plan_lineage.sql
+}
+
+BUSY_TIMEOUT_SECONDS = 30.0
+
+
+def connect(path: str | Path) -> sqlite3.Connection:
+    """Open a connection in autocommit mode; use `transaction` for atomic work."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(str(path), timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def init_db(path: str | Path) -> None:
+    """Create all tables and add missing columns (idempotent)."""
+    conn = connect(path)
+    try:
+        conn.executescript(SCHEMA_PATH.read_text())
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for column, declaration in columns:
+                if column not in existing:
+                    try:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+                    except sqlite3.OperationalError:
+                        # Another process added it first.
+                        pass
+    finally:
+        conn.close()
+
+
+@contextmanager
+def transaction(path: str | Path) -> Iterator[sqlite3.Connection]:
+    """
+    Write transaction that takes the database write lock up front
+    (BEGIN IMMEDIATE), so read-then-update sequences are atomic across
+    threads and processes.
+    """
+    conn = connect(path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+    finally:
+        conn.close()
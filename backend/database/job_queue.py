@@ -0,0 +1,169 @@
+# backend/database/job_queue.py
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+from uuid import uuid4
+import json
+import time
+
+from .db import connect, init_db, transaction
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobQueue:
+    """
+    Persistent FIFO job queue in SQLite.
+
+    Jobs survive restarts. `claim` is atomic, so any number of worker
+    threads or processes can pull from the same database file.
+
+    A running job holds a lease that its process renews with
+    `heartbeat`; `requeue_stale` only takes back jobs whose lease ran
+    out, so a job running in another live process is never run twice.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        init_db(self.path)
+
+    def enqueue(self, kind: str, payload: Dict[str, Any]) -> str:
+        job_id = uuid4().hex
+        conn = connect(self.path)
+        try:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, json.dumps(payload), time.time()),
+            )
+        finally:
+            conn.close()
+        return job_id
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Mark the oldest queued job as running and return it
+        ({"id", "kind", "payload"}), or None when the queue is empty.
+        """
+        with transaction(self.path) as conn:
+            row = conn.execute(
+                "SELECT id, kind, payload FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                (QUEUED,),
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ? WHERE id = ?",
+                (RUNNING, now, now, row["id"]),
+            )
+        return {"id": row["id"], "kind": row["kind"], "payload": json.loads(row["payload"])}
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        self._finish(job_id, DONE, result=json.dumps(result, default=str))
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._finish(job_id, FAILED, error=error)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job status and, once done, its result; None if unknown."""
+        conn = connect(self.path)
+        try:
+            row = conn.execute(
+                "SELECT id, kind, status, result, error, created_at, started_at, finished_at "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+
+        return {
+            "id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "result": json.loads(row["result"]) if row["result"] is not None else None,
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+        }
+
+    def iter_done(
+        self, kind: Optional[str] = None, since: float = 0.0, limit: int = -1
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Finished jobs, newest first, as {"kind", "payload", "result",
+        "created_at"}. Rows are read as the caller iterates, so memory
+        does not grow with the number of jobs.
+        """
+        conn = connect(self.path)
+        try:
+            cur = conn.execute(
+                "SELECT kind, payload, result, created_at FROM jobs "
+                "WHERE status = ? AND created_at >= ? AND (? IS NULL OR kind = ?) "
+                "ORDER BY created_at DESC LIMIT ?",
+                (DONE, since, kind, kind, limit),
+            )
+            for row in cur:
+                yield {
+                    "kind": row["kind"],
+                    "payload": json.loads(row["payload"]),
+                    "result": json.loads(row["result"]),
+                    "created_at": row["created_at"],
+                }
+        finally:
+            conn.close()
+
+    def heartbeat(self, job_ids: Iterable[str]) -> None:
+        """Renew the lease of running jobs held by the caller."""
+        now = time.time()
+        with transaction(self.path) as conn:
+            conn.executemany(
+                "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?",
+                [(now, job_id, RUNNING) for job_id in job_ids],
+            )
+
+    def requeue_stale(self, older_than: float) -> int:
+        """
+        Put back running jobs whose lease was not renewed for more than
+        `older_than` seconds (their process died). Returns how many were
+        requeued.
+        """
+        with transaction(self.path) as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL, heartbeat_at = NULL "
+                "WHERE status = ? AND COALESCE(heartbeat_at, started_at) < ?",
+                (QUEUED, RUNNING, time.time() - older_than),
+            )
+            return cur.rowcount
+
+    def purge_finished(self, older_than: float) -> int:
+        """
+        Delete done and failed jobs that finished more than `older_than`
+        seconds ago. Returns how many were deleted.
+        """
+        conn = connect(self.path)
+        try:
+            cur = conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (DONE, FAILED, time.time() - older_than),
+            )
+            return cur.rowcount
+        finally:
+            conn.close()
+
+    def _finish(self, job_id: str, status: str, result: str | None = None, error: str | None = None) -> None:
+        conn = connect(self.path)
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, result, error, time.time(), job_id),
+            )
+        finally:
+            conn.close()
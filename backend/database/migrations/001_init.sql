@@ -0,0 +1,16 @@
+-- backend/database/migrations/001_init.sql
+
+-- Background plan jobs (POST /exam/jobs, POST /weekly/jobs).
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    kind        TEXT NOT NULL,          -- "exam" | "weekly"
+    status      TEXT NOT NULL,          -- "queued" | "running" | "done" | "failed"
+    payload     TEXT NOT NULL,          -- request body, JSON
+    result      TEXT,                   -- plan, JSON (status = "done")
+    error       TEXT,                   -- failure detail (status = "failed")
+    created_at  REAL NOT NULL,
+    started_at  REAL,
+    finished_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
@@ -0,0 +1,11 @@
+-- backend/database/migrations/002_plans.sql
+
+-- Recently served plans, for re-plan diffs (POST /exam/diff, POST /weekly/diff).
+CREATE TABLE IF NOT EXISTS plans (
+    etag        TEXT PRIMARY KEY,       -- content hash of the plan
+    kind        TEXT NOT NULL,          -- "exam" | "weekly"
+    plan        TEXT NOT NULL,          -- plan, JSON
+    created_at  REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS plans_created ON plans (created_at);
@@ -0,0 +1,13 @@
+-- backend/database/migrations/003_plan_cache.sql
+
+-- Computed plans by request key (canonical request hash + allocator
+-- version), shared by all workers and kept across restarts.
+CREATE TABLE IF NOT EXISTS plan_cache (
+    key         TEXT PRIMARY KEY,
+    plan        BLOB NOT NULL,          -- zlib-compressed plan JSON
+    size        INTEGER NOT NULL,       -- len(plan), for the size bound
+    created_at  REAL NOT NULL,
+    last_used   REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS plan_cache_last_used ON plan_cache (last_used);
@@ -0,0 +1,24 @@
+-- backend/database/migrations/004_catalogs.sql
+
+-- Imported syllabus catalogs (POST /catalogs). Immutable once "ready";
+-- rows of an import still "importing" are invisible to plan requests.
+CREATE TABLE IF NOT EXISTS catalogs (
+    id          TEXT PRIMARY KEY,
+    name        TEXT NOT NULL,
+    status      TEXT NOT NULL,          -- "importing" | "ready"
+    topic_count INTEGER NOT NULL,
+    created_at  REAL NOT NULL
+);
+
+-- Topics of a catalog, in upload order (rowid).
+CREATE TABLE IF NOT EXISTS catalog_topics (
+    catalog_id  TEXT NOT NULL,
+    subject     TEXT NOT NULL,
+    id          TEXT NOT NULL,          -- stable topic ID
+    name        TEXT NOT NULL,
+    priority    INTEGER NOT NULL,
+    familiarity INTEGER NOT NULL,
+    UNIQUE (catalog_id, id)
+);
+
+CREATE INDEX IF NOT EXISTS catalog_topics_subject ON catalog_topics (catalog_id, subject);
@@ -0,0 +1,14 @@
+-- backend/database/migrations/005_profiles.sql
+
+-- Saved subject profiles per user (POST /profiles), referenced by plan
+-- requests through profile_id.
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id     TEXT NOT NULL,          -- X-User-Id of the owner
+    id          TEXT NOT NULL,
+    kind        TEXT NOT NULL,          -- "exam" | "weekly"
+    name        TEXT NOT NULL,
+    body        TEXT NOT NULL,          -- {"subjects": [...], "availability": {...}}, JSON
+    version     INTEGER NOT NULL,       -- bumped on every write
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (user_id, id)
+);
@@ -0,0 +1,5 @@
+-- backend/database/migrations/006_job_leases.sql
+
+-- Running jobs hold a lease renewed by their process; jobs whose lease
+-- ran out are requeued (see JobQueue.requeue_stale).
+ALTER TABLE jobs ADD COLUMN heartbeat_at REAL;
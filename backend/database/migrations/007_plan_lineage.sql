@@ -0,0 +1,5 @@
+-- backend/database/migrations/007_plan_lineage.sql
+
+-- Re-plans record the chain they continue, so analytics can count each
+-- chain once (see PlanStore.put). Older rows start their own chain.
+ALTER TABLE plans ADD COLUMN lineage TEXT;
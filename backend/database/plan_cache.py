@@ -0,0 +1,79 @@
+# backend/database/plan_cache.py
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Optional
+import json
+import time
+import zlib
+
+from .db import connect, init_db, transaction
+
+
+# A hit only rewrites last_used when it is older than this, so hot keys
+# do not turn every read into a write.
+TOUCH_INTERVAL_SECONDS = 60.0
+
+
+class PlanCache:
+    """
+    Computed plans by request key, on disk.
+
+    Survives restarts and is shared by every uvicorn worker process that
+    opens the same file (WAL mode; eviction runs under the write lock).
+    Plans are stored as zlib-compressed JSON. Once the stored bytes
+    exceed `max_bytes`, the least recently used plans are evicted.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        init_db(self.path)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        conn = connect(self.path)
+        try:
+            row = conn.execute(
+                "SELECT plan, last_used FROM plan_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row["last_used"] > TOUCH_INTERVAL_SECONDS:
+                conn.execute("UPDATE plan_cache SET last_used = ? WHERE key = ?", (now, key))
+        finally:
+            conn.close()
+        return json.loads(zlib.decompress(row["plan"]))
+
+    def put(self, key: str, plan: Dict[str, Any]) -> None:
+        blob = zlib.compress(json.dumps(plan, separators=(",", ":"), default=str).encode("utf-8"))
+        if len(blob) > self.max_bytes:
+            return
+
+        now = time.time()
+        with transaction(self.path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO plan_cache (key, plan, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM plan_cache").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            excess = total - self.max_bytes
+            victims = []
+            for row in conn.execute(
+                "SELECT key, size FROM plan_cache WHERE key != ? ORDER BY last_used, rowid", (key,)
+            ):
+                victims.append((row["key"],))
+                excess -= row["size"]
+                if excess <= 0:
+                    break
+            conn.executemany("DELETE FROM plan_cache WHERE key = ?", victims)
+
+    def clear(self) -> None:
+        conn = connect(self.path)
+        try:
+            conn.execute("DELETE FROM plan_cache")
+        finally:
+            conn.close()
@@ -0,0 +1,78 @@
+# backend/database/plan_store.py
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+import json
+import time
+
+from .db import connect, init_db
+
+
+class PlanStore:
+    """
+    Recently served plans by ETag, so re-plans can be sent as diffs.
+
+    Bounded: once more than `max_plans` are stored, the oldest are
+    dropped. A client whose base plan was dropped gets a full plan.
+
+    A plan stored as a re-plan of a stored base joins the base's
+    lineage (the ETag of the first plan of the chain); other plans
+    start their own.
+    """
+
+    def __init__(self, path: str | Path, max_plans: int) -> None:
+        self.path = Path(path)
+        self.max_plans = max_plans
+        init_db(self.path)
+
+    def put(self, etag: str, kind: str, plan: Dict[str, Any], base_etag: Optional[str] = None) -> None:
+        conn = connect(self.path)
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO plans (etag, kind, plan, created_at, lineage) VALUES (?, ?, ?, ?, "
+                "COALESCE((SELECT COALESCE(lineage, etag) FROM plans WHERE etag = ? AND kind = ?), ?))",
+                (etag, kind, json.dumps(plan, default=str), time.time(), base_etag, kind, etag),
+            )
+            conn.execute(
+                "DELETE FROM plans WHERE etag IN "
+                "(SELECT etag FROM plans ORDER BY created_at DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                (self.max_plans,),
+            )
+        finally:
+            conn.close()
+
+    def get(self, etag: str, kind: str) -> Optional[Dict[str, Any]]:
+        conn = connect(self.path)
+        try:
+            row = conn.execute(
+                "SELECT plan FROM plans WHERE etag = ? AND kind = ?", (etag, kind)
+            ).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row["plan"]) if row is not None else None
+
+    def iter_plans(
+        self, kind: Optional[str] = None, since: float = 0.0, limit: int = -1
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stored plans, newest first, as {"etag", "lineage", "kind",
+        "plan", "created_at"}; read as the caller iterates.
+        """
+        conn = connect(self.path)
+        try:
+            cur = conn.execute(
+                "SELECT etag, COALESCE(lineage, etag) AS lineage, kind, plan, created_at FROM plans "
+                "WHERE created_at >= ? AND (? IS NULL OR kind = ?) "
+                "ORDER BY created_at DESC LIMIT ?",
+                (since, kind, kind, limit),
+            )
+            for row in cur:
+                yield {
+                    "etag": row["etag"],
+                    "lineage": row["lineage"],
+                    "kind": row["kind"],
+                    "plan": json.loads(row["plan"]),
+                    "created_at": row["created_at"],
+                }
+        finally:
+            conn.close()
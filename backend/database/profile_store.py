@@ -0,0 +1,107 @@
+# backend/database/profile_store.py
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import time
+import uuid
+
+from .db import connect, init_db, transaction
+
+
+class ProfileStore:
+    """
+    Saved subject profiles (subjects + availability) per user.
+
+    Every write bumps the profile's version, so callers can cache what
+    they derive from a profile under (profile id, version) and only
+    re-read the body when it changed.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        init_db(self.path)
+
+    def create(self, user_id: str, kind: str, name: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        profile_id = uuid.uuid4().hex
+        now = time.time()
+        conn = connect(self.path)
+        try:
+            conn.execute(
+                "INSERT INTO profiles (user_id, id, kind, name, body, version, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 1, ?)",
+                (user_id, profile_id, kind, name, json.dumps(body, separators=(",", ":")), now),
+            )
+        finally:
+            conn.close()
+        return {"id": profile_id, "kind": kind, "name": name, "version": 1, "updated_at": now}
+
+    def replace(
+        self, user_id: str, profile_id: str, kind: str, name: str, body: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """New metadata after the write, or None if there is no such profile."""
+        now = time.time()
+        with transaction(self.path) as conn:
+            row = conn.execute(
+                "SELECT version FROM profiles WHERE user_id = ? AND id = ?", (user_id, profile_id)
+            ).fetchone()
+            if row is None:
+                return None
+            version = row["version"] + 1
+            conn.execute(
+                "UPDATE profiles SET kind = ?, name = ?, body = ?, version = ?, updated_at = ? "
+                "WHERE user_id = ? AND id = ?",
+                (kind, name, json.dumps(body, separators=(",", ":")), version, now, user_id, profile_id),
+            )
+        return {"id": profile_id, "kind": kind, "name": name, "version": version, "updated_at": now}
+
+    def get(self, user_id: str, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Metadata plus "body", or None."""
+        conn = connect(self.path)
+        try:
+            row = conn.execute(
+                "SELECT id, kind, name, body, version, updated_at FROM profiles "
+                "WHERE user_id = ? AND id = ?",
+                (user_id, profile_id),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        profile = dict(row)
+        profile["body"] = json.loads(profile["body"])
+        return profile
+
+    def version(self, user_id: str, profile_id: str) -> Optional[Tuple[str, int]]:
+        """(kind, version) without reading the body, or None."""
+        conn = connect(self.path)
+        try:
+            row = conn.execute(
+                "SELECT kind, version FROM profiles WHERE user_id = ? AND id = ?",
+                (user_id, profile_id),
+            ).fetchone()
+        finally:
+            conn.close()
+        return (row["kind"], row["version"]) if row is not None else None
+
+    def list(self, user_id: str) -> List[Dict[str, Any]]:
+        conn = connect(self.path)
+        try:
+            rows = conn.execute(
+                "SELECT id, kind, name, version, updated_at FROM profiles "
+                "WHERE user_id = ? ORDER BY updated_at DESC",
+                (user_id,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [dict(r) for r in rows]
+
+    def delete(self, user_id: str, profile_id: str) -> bool:
+        conn = connect(self.path)
+        try:
+            cur = conn.execute(
+                "DELETE FROM profiles WHERE user_id = ? AND id = ?", (user_id, profile_id)
+            )
+        finally:
+            conn.close()
+        return cur.rowcount > 0
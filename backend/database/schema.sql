@@ -0,0 +1,77 @@
+-- backend/database/schema.sql
+-- Current schema of the local SQLite database (see database/db.py).
+
+-- Background plan jobs (POST /exam/jobs, POST /weekly/jobs).
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    kind        TEXT NOT NULL,          -- "exam" | "weekly"
+    status      TEXT NOT NULL,          -- "queued" | "running" | "done" | "failed"
+    payload     TEXT NOT NULL,          -- request body, JSON
+    result      TEXT,                   -- plan, JSON (status = "done")
+    error       TEXT,                   -- failure detail (status = "failed")
+    created_at  REAL NOT NULL,
+    started_at  REAL,
+    heartbeat_at REAL,                  -- lease, renewed while running
+    finished_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+
+-- Recently served plans, for re-plan diffs (POST /exam/diff, POST /weekly/diff).
+CREATE TABLE IF NOT EXISTS plans (
+    etag        TEXT PRIMARY KEY,       -- content hash of the plan
+    kind        TEXT NOT NULL,          -- "exam" | "weekly"
+    plan        TEXT NOT NULL,          -- plan, JSON
+    created_at  REAL NOT NULL,
+    lineage     TEXT                    -- etag of the first plan of its re-plan chain
+);
+
+CREATE INDEX IF NOT EXISTS plans_created ON plans (created_at);
+
+-- Computed plans by request key (canonical request hash + allocator
+-- version), shared by all workers and kept across restarts.
+CREATE TABLE IF NOT EXISTS plan_cache (
+    key         TEXT PRIMARY KEY,
+    plan        BLOB NOT NULL,          -- zlib-compressed plan JSON
+    size        INTEGER NOT NULL,       -- len(plan), for the size bound
+    created_at  REAL NOT NULL,
+    last_used   REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS plan_cache_last_used ON plan_cache (last_used);
+
+-- Imported syllabus catalogs (POST /catalogs). Immutable once "ready";
+-- rows of an import still "importing" are invisible to plan requests.
+CREATE TABLE IF NOT EXISTS catalogs (
+    id          TEXT PRIMARY KEY,
+    name        TEXT NOT NULL,
+    status      TEXT NOT NULL,          -- "importing" | "ready"
+    topic_count INTEGER NOT NULL,
+    created_at  REAL NOT NULL
+);
+
+-- Topics of a catalog, in upload order (rowid).
+CREATE TABLE IF NOT EXISTS catalog_topics (
+    catalog_id  TEXT NOT NULL,
+    subject     TEXT NOT NULL,
+    id          TEXT NOT NULL,          -- stable topic ID
+    name        TEXT NOT NULL,
+    priority    INTEGER NOT NULL,
+    familiarity INTEGER NOT NULL,
+    UNIQUE (catalog_id, id)
+);
+
+CREATE INDEX IF NOT EXISTS catalog_topics_subject ON catalog_topics (catalog_id, subject);
+
+-- Saved subject profiles per user (POST /profiles), referenced by plan
+-- requests through profile_id.
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id     TEXT NOT NULL,          -- X-User-Id of the owner
+    id          TEXT NOT NULL,
+    kind        TEXT NOT NULL,          -- "exam" | "weekly"
+    name        TEXT NOT NULL,
+    body        TEXT NOT NULL,          -- {"subjects": [...], "availability": {...}}, JSON
+    version     INTEGER NOT NULL,       -- bumped on every write
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (user_id, id)
+);
@@ -0,0 +1,96 @@
+// frontend/src/api/columnar.ts
+//
+// Expands the `?format=columnar` plan encoding (backend
+// core/utils/columnar.py) back into the regular plan shape.
+
+import type { PlanTopic, Weekday } from "../types/domain";
+
+const WEEKDAYS: Weekday[] = [
+  "Monday",
+  "Tuesday",
+  "Wednesday",
+  "Thursday",
+  "Friday",
+  "Saturday",
+  "Sunday",
+];
+
+export interface ColumnarPlan {
+  format: "columnar";
+  shape: "exam" | "weekly";
+  subjects: { id: string; name: string; difficulty: number }[];
+  topics: PlanTopic[];
+  days: {
+    date: string[];
+    weekday: number[];
+    total_minutes: number[];
+    blocks: number[]; // offsets into blocks, length days + 1
+  };
+  blocks: {
+    minutes: number[];
+    entries: number[]; // offsets into entries, length blocks + 1
+    placed?: number[]; // 1 = block was placed into time windows
+    slots?: number[]; // offsets into slots, length blocks + 1
+  };
+  entries: {
+    subject: number[];
+    topic: number[]; // -1 = no topic
+    minutes: number[];
+  };
+  slots?: { start: string[]; end: string[] };
+  [extra: string]: unknown;
+}
+
+export function expandColumnarPlan(data: ColumnarPlan): Record<string, unknown> {
+  const { format, shape, subjects, topics, days, blocks, entries, slots, ...rest } = data;
+  void format;
+
+  const outDays = days.date.map((date, i) => {
+    const dayBlocks = [];
+    for (let j = days.blocks[i]; j < days.blocks[i + 1]; j++) {
+      const items = [];
+      for (let k = blocks.entries[j]; k < blocks.entries[j + 1]; k++) {
+        const subject = subjects[entries.subject[k]];
+        const topicIdx = entries.topic[k];
+        items.push({
+          id: subject.id,
+          name: subject.name,
+          minutes: entries.minutes[k],
+          topic: topicIdx >= 0 ? topics[topicIdx] : null,
+          difficulty: subject.difficulty,
+        });
+      }
+
+      const block: Record<string, unknown> =
+        shape === "exam"
+          ? items.length
+            ? { minutes: blocks.minutes[j], subject: items[0] }
+            : { minutes: blocks.minutes[j] }
+          : { minutes: blocks.minutes[j], subjects: items };
+
+      if (slots && blocks.placed && blocks.slots && blocks.placed[j]) {
+        const lo = blocks.slots[j];
+        const hi = blocks.slots[j + 1];
+        const blockSlots = [];
+        for (let k = lo; k < hi; k++) {
+          blockSlots.push({ start: slots.start[k], end: slots.end[k] });
+        }
+        block.slots = blockSlots;
+        if (lo < hi) {
+          block.start = slots.start[lo];
+          block.end = slots.end[hi - 1];
+        }
+      }
+      dayBlocks.push(block);
+    }
+
+    return {
+      date,
+      weekday: WEEKDAYS[days.weekday[i]],
+      total_minutes: days.total_minutes[i],
+      blocks: dayBlocks,
+    };
+  });
+
+  return { ...rest, days: outDays };
+}
@@ -0,0 +1,60 @@
+// frontend/src/api/planDiff.ts
+//
+// Applies a re-plan patch from POST /exam/diff or /weekly/diff
+// (backend core/utils/plan_diff.py) to the plan the client already has.
+
+type Day = { date: string; total_minutes: number; blocks: unknown[]; [key: string]: unknown };
+
+export type DayChange =
+  | { date: string; op: "remove" }
+  | { date: string; op: "add"; day: Day }
+  | {
+      date: string;
+      op: "update";
+      total_minutes: number;
+      block_count: number;
+      blocks: Record<string, unknown>;
+    };
+
+export interface PlanPatch {
+  days: DayChange[];
+  set: Record<string, unknown>;
+  unset: string[];
+}
+
+export function applyPlanPatch<P extends { days: Day[] }>(old: P, patch: PlanPatch): P {
+  const days: Day[] = [];
+  let c = 0;
+
+  for (const day of old.days) {
+    while (c < patch.days.length && patch.days[c].op === "add" && patch.days[c].date < day.date) {
+      days.push((patch.days[c] as { day: Day }).day);
+      c++;
+    }
+
+    const change = patch.days[c];
+    if (!change || change.date !== day.date) {
+      days.push(day);
+      continue;
+    }
+
+    if (change.op === "update") {
+      const blocks = day.blocks.slice(0, change.block_count);
+      while (blocks.length < change.block_count) blocks.push({});
+      for (const [index, block] of Object.entries(change.blocks)) {
+        blocks[Number(index)] = block;
+      }
+      days.push({ ...day, total_minutes: change.total_minutes, blocks });
+    }
+    c++;
+  }
+
+  for (; c < patch.days.length; c++) {
+    days.push((patch.days[c] as { day: Day }).day);
+  }
+
+  const plan: Record<string, unknown> = { ...old };
+  for (const key of patch.unset) delete plan[key];
+  Object.assign(plan, patch.set, { days });
+  return plan as P;
+}
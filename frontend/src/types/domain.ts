@@ -32,6 +32,9 @@ export interface SubjectBase {
   // 1–5
   confidence: number;
   topics?: Topic[];
+  // Subject key in the request's catalog (defaults to name); used when
+  // topics is empty.
+  catalog_subject?: string;
 }
 
 // Exam mode: each subject has its own exam date.
@@ -48,6 +51,8 @@ export interface AvailabilityBase {
   start_date: string;
   // Concrete dates to skip, "YYYY-MM-DD".
   rest_dates: string[];
+  // Optional time-of-day windows, e.g. { Monday: ["07:00-08:00"] }.
+  windows_per_weekday?: Partial<Record<Weekday, string[]>>;
 }
 
 // Exam: requires end_date (last study day, day before exam).
@@ -67,12 +72,26 @@ export interface WeeklyAvailability extends AvailabilityBase {
 export interface ExamPlanRequest {
   subjects: ExamSubject[];
   availability: ExamAvailability;
+  // Imported syllabus (POST /catalogs) to take topics from.
+  catalog_id?: string;
+  // Saved profile (POST /profiles) to start from; subjects then only
+  // need the additions and replacements (by id), availability may be
+  // omitted by sending the profile's.
+  profile_id?: string;
+  remove_subjects?: string[];
 }
 
+// How weekly sessions are placed into days; see the API contract.
+export type WeeklyPlacement = "greedy" | "ffd" | "best_fit";
+
 export interface WeeklyPlanRequest {
   subjects: WeeklySubject[];
   weekly_hours: number;
   availability: WeeklyAvailability;
+  placement?: WeeklyPlacement;
+  catalog_id?: string;
+  profile_id?: string;
+  remove_subjects?: string[];
 }
 
 // ---------- Allocator / API output types ----------
@@ -85,6 +104,12 @@ export interface PlanTopic {
   familiarity: number;
 }
 
+// Time slot of a placed block, "HH:MM".
+export interface PlanSlot {
+  start: string;
+  end: string;
+}
+
 // Subject inside a block (exam mode: single subject per block).
 export interface ExamBlockSubject {
   id: string;
@@ -97,6 +122,10 @@ export interface ExamBlockSubject {
 export interface ExamPlanBlock {
   minutes: number;
   subject: ExamBlockSubject;
+  // Set only when the request had windows_per_weekday for this weekday.
+  start?: string;
+  end?: string;
+  slots?: PlanSlot[];
 }
 
 export interface ExamPlanDay {
@@ -108,6 +137,7 @@ export interface ExamPlanDay {
 
 export interface ExamPlan {
   days: ExamPlanDay[];
+  metrics?: PlanMetrics;
 }
 
 // Weekly mode: blocks can contain multiple subjects.
@@ -122,6 +152,9 @@ export interface WeeklyBlockSubject {
 export interface WeeklyPlanBlock {
   minutes: number;
   subjects: WeeklyBlockSubject[];
+  start?: string;
+  end?: string;
+  slots?: PlanSlot[];
 }
 
 export interface WeeklyPlanDay {
@@ -131,9 +164,71 @@ export interface WeeklyPlanDay {
   blocks: WeeklyPlanBlock[];
 }
 
+// Packing report, present when placement is "ffd" or "best_fit".
+export interface WeeklyPlacementReport {
+  mode: WeeklyPlacement;
+  requested_minutes: number;
+  placed_minutes: number;
+  utilization: number;
+  splits: number;
+  unplaced_minutes: number;
+}
+
 export interface WeeklyPlan {
   week_start: string; // "YYYY-MM-DD"
   days: WeeklyPlanDay[];
+  placement?: WeeklyPlacementReport;
+  metrics?: PlanMetrics;
+}
+
+// Cognitive-load metrics, present when the plan was requested with
+// ?metrics=true. Per-day arrays follow metrics.dates (every date from the
+// first to the last plan day, including days the plan leaves out);
+// per-subject ones follow metrics.subjects.
+export interface PlanMetrics {
+  dates: string[];
+  subjects: string[];
+  subject_minutes: number[];
+  daily: {
+    total_minutes: number[];
+    hard_minutes: number[];
+    distinct_subjects: number[];
+    load: number[];
+  };
+  load: { mean: number; peak: number; peak_date: string | null };
+  streaks: {
+    longest_study_days: number;
+    longest_rest_days: number;
+    subjects: Record<string, number>;
+  };
+  violations: {
+    subjects_per_day: number;
+    hard_subjects_per_day: number;
+    subjects_per_block: number;
+    short_sessions: number;
+  };
+}
+
+// GET /analytics/cohort. Per-date arrays follow dates.date; capacity
+// figures only cover plans whose availability is known.
+export interface CohortReport {
+  sample: string; // which plans the figures are drawn from
+  plans: number;
+  dates: {
+    date: string[];
+    plans: number[];
+    total_minutes: number[];
+    mean_minutes: number[];
+    capacity_used: (number | null)[];
+  };
+  subjects: { name: string; plans: number; minutes: number; share: number }[];
+  subjects_per_plan: Record<string, number>;
+  capacity: {
+    minutes: number;
+    capacity: number;
+    used: number | null;
+    plans: number[]; // utilization histogram, 10% buckets
+  };
 }
 
 // API response envelopes (current backend behavior: { plan: { ... } })
@@ -0,0 +1,124 @@
+# tests/cohort_report.py
+"""
+Offline cohort load analytics over the server's stored plans.
+
+    python tests/cohort_report.py --kind weekly --since 1767225600
+    python tests/cohort_report.py --jobs-db data/jobs.sqlite3 --out cohort.json
+    python tests/cohort_report.py --synthetic 100000
+
+Reads finished jobs (JOBS_DB_PATH) and re-plan plans (PLANS_DB_PATH)
+like GET /analytics/cohort, each plan once and each re-plan chain by
+its newest version, but without its ANALYTICS_MAX_PLANS cap and outside
+of a server worker, and writes the report as JSON (to stdout
+unless --out is given). Timings for reading and aggregating go to
+stderr.
+
+--synthetic N skips the databases and aggregates N generated plans
+(seeded, with availability), to measure the aggregation itself.
+"""
+from __future__ import annotations
+from datetime import date, timedelta
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import argparse
+import json
+import random
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.config import settings  # noqa: E402
+from backend.core.utils.cohort_analytics import (  # noqa: E402
+    Record,
+    collect,
+    cohort_report,
+    distinct_records,
+    job_records,
+    stored_records,
+)
+from backend.database.job_queue import JobQueue  # noqa: E402
+from backend.database.plan_store import PlanStore  # noqa: E402
+
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+KINDS = ("exam", "weekly")
+
+SUBJECT_NAMES = [f"Subject {i}" for i in range(40)]
+
+
+def synthetic_records(n: int, seed: int = 1) -> Iterator[Record]:
+    """
+    `n` weekly-shaped plans over a shared term: 5-12 subjects each,
+    1-3 blocks a day, with per-weekday availability.
+    """
+    rng = random.Random(seed)
+    term_start = date(2026, 9, 7)
+    for _ in range(n):
+        start = term_start + timedelta(days=rng.randrange(0, 84))
+        subjects = rng.sample(SUBJECT_NAMES, rng.randint(5, 12))
+        minutes_per_weekday = {w: rng.choice((0, 60, 90, 120, 180)) for w in WEEKDAYS}
+        days = []
+        for offset in range(7):
+            day = start + timedelta(days=offset)
+            budget = minutes_per_weekday[WEEKDAYS[day.weekday()]]
+            blocks = []
+            while budget >= 30 and len(blocks) < 3:
+                minutes = min(budget, rng.choice((30, 45, 60)))
+                budget -= minutes
+                name = rng.choice(subjects)
+                blocks.append({"subject": {"id": name, "name": name, "minutes": minutes}})
+            days.append({
+                "date": day.isoformat(),
+                "total_minutes": sum(b["subject"]["minutes"] for b in blocks),
+                "blocks": blocks,
+            })
+        yield {"week_start": start.isoformat(), "days": days}, {"minutes_per_weekday": minutes_per_weekday}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--kind", choices=KINDS)
+    parser.add_argument("--since", type=float, default=0.0, help="unix seconds")
+    parser.add_argument("--limit", type=int, default=-1, help="most plans read (default: all)")
+    parser.add_argument("--jobs-db", type=Path, default=settings.JOBS_DB_PATH)
+    parser.add_argument("--plans-db", type=Path, default=settings.PLANS_DB_PATH)
+    parser.add_argument("--synthetic", type=int, metavar="N")
+    parser.add_argument("--out", type=Path)
+    args = parser.parse_args(argv)
+
+    limit = args.limit if args.limit >= 0 else None
+    started = time.perf_counter()
+    if args.synthetic is not None:
+        columns = collect(synthetic_records(args.synthetic), limit=limit)
+    else:
+        columns = collect(
+            distinct_records(chain(
+                job_records(JobQueue(args.jobs_db).iter_done(args.kind, args.since, args.limit)),
+                stored_records(PlanStore(args.plans_db, settings.PLAN_STORE_MAX_PLANS).iter_plans(args.kind, args.since)),
+            )),
+            limit=limit,
+        )
+    read = time.perf_counter()
+    report: Dict[str, Any] = cohort_report(columns)
+    done = time.perf_counter()
+
+    print(
+        f"{columns.plans} plans, {len(columns.day_plan)} days, {len(columns.entry_plan)} entries: "
+        f"read {read - started:.2f}s, aggregate {done - read:.2f}s",
+        file=sys.stderr,
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        args.out.write_text(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+# tests/fuzz_allocators.py
+"""
+Seeded worst-case input fuzzer for the allocators.
+
+    python tests/fuzz_allocators.py --seed 1 --iterations 300 --save
+
+Random requests are drawn with a bias towards boundary values (session
+lengths around the 20/25/30/40-minute thresholds, tiny weekly_hours,
+zero-minute weekdays, long windows). Each case runs in a child process
+with a wall-clock limit, so a hang shows up as a "timeout" instead of
+wedging the run. A case fails when it:
+
+    - timeout: does not finish within the time limit
+    - error:   raises
+    - slow:    takes longer than SLOW_BASE_SECONDS + SLOW_SECONDS_PER_UNIT
+               per cost unit (days x subjects x topics per subject)
+    - output:  returns more than OUTPUT_BYTES_PER_CELL of JSON per
+               (day, subject) cell
+
+Failing cases are shrunk (drop subjects, topics, rest dates, weekdays;
+shorten the window; halve numbers) while they keep failing the same way.
+With --save the minimized payloads are written to tests/fixtures/fuzz/,
+where test_fuzz_regressions.py replays them.
+
+The same seed always produces the same cases.
+"""
+from __future__ import annotations
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import argparse
+import hashlib
+import json
+import multiprocessing
+import random
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.core.allocator.exam_allocator import generate_exam_plan, SCHEDULER_MODES  # noqa: E402
+from backend.core.allocator.weekly_allocator import generate_weekly_plan  # noqa: E402
+from backend.core.utils.admission import estimate_cost  # noqa: E402
+
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures" / "fuzz"
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Minute values that sit on or next to allocator thresholds.
+EDGE_MINUTES = [0, 1, 19, 20, 21, 22, 24, 25, 26, 29, 30, 31, 39, 40, 41, 45, 59, 60, 61, 75, 89, 90, 91]
+
+DEFAULT_TIME_LIMIT = 2.0
+SLOW_BASE_SECONDS = 0.5
+SLOW_SECONDS_PER_UNIT = 5e-6
+OUTPUT_BYTES_PER_CELL = 5_000
+
+# Each shrink step may cost a full time limit; bound the total.
+MAX_SHRINK_STEPS = 200
+
+
+# ---------------------------------------------------------
+# Case generation
+# ---------------------------------------------------------
+
+def generate_cases(seed: int, iterations: int) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    for _ in range(iterations):
+        yield exam_case(rng) if rng.random() < 0.5 else weekly_case(rng)
+
+
+def _minutes(rng: random.Random, high: int = 600) -> int:
+    return rng.choice(EDGE_MINUTES) if rng.random() < 0.7 else rng.randint(0, high)
+
+
+def _topics(rng: random.Random, prefix: str) -> List[Dict[str, Any]]:
+    count = rng.choice([0, 1, 2, 3, rng.randint(0, 40)])
+    return [
+        {
+            "id": f"{prefix}t{j}",
+            "name": f"Topic {j}",
+            "priority": rng.randint(1, 5),
+            "familiarity": rng.randint(1, 5),
+        }
+        for j in range(count)
+    ]
+
+
+def _weekday_minutes(rng: random.Random) -> Dict[str, int]:
+    return {d: _minutes(rng) for d in WEEKDAYS if rng.random() < 0.85}
+
+
+def exam_case(rng: random.Random) -> Dict[str, Any]:
+    start = date(2026, 1, 5) + timedelta(days=rng.randint(0, 6))
+    window = rng.choice([1, 2, 7, 30, rng.randint(1, 400)])
+    end = start + timedelta(days=window - 1)
+
+    subjects = [
+        {
+            "id": f"e{i}",
+            "name": f"Exam {i}",
+            # Some exams fall before, on or after the window edges.
+            "exam_date": (start + timedelta(days=rng.randint(-2, window + 3))).isoformat(),
+            "difficulty": rng.randint(1, 5),
+            "confidence": rng.randint(1, 5),
+            "topics": _topics(rng, f"e{i}"),
+        }
+        for i in range(rng.choice([1, 2, 3, rng.randint(1, 15)]))
+    ]
+    rest = sorted({(start + timedelta(days=rng.randint(0, window))).isoformat()
+                   for _ in range(rng.randint(0, 5))})
+
+    return {
+        "mode": "exam",
+        "scheduler": rng.choice(SCHEDULER_MODES),
+        "subjects": subjects,
+        "availability": {
+            "minutes_per_weekday": _weekday_minutes(rng),
+            "rest_dates": rest,
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+        },
+    }
+
+
+def weekly_case(rng: random.Random) -> Dict[str, Any]:
+    start = date(2026, 1, 5) + timedelta(days=rng.randint(0, 6))
+    subjects = [
+        {
+            "id": f"s{i}",
+            "name": f"Subject {i}",
+            "difficulty": rng.randint(1, 5),
+            "confidence": rng.randint(1, 5),
+            "topics": _topics(rng, f"s{i}"),
+        }
+        for i in range(rng.choice([1, 2, 3, rng.randint(1, 15)]))
+    ]
+    mpw = _weekday_minutes(rng)
+    if rng.random() < 0.5:
+        # Ask for about as much time as the week has: days fill up exactly
+        # and sessions end up competing for the last few minutes.
+        hours = round(sum(mpw.values()) / 60 * rng.choice([0.5, 0.9, 1.0, 1.1]), 4)
+    else:
+        hours = rng.choice([0.1, 0.35, 0.4, 0.5, 0.75, 1, round(rng.uniform(0.05, 60), 2)])
+
+    return {
+        "mode": "weekly",
+        "weekly_hours": hours,
+        "subjects": subjects,
+        "availability": {
+            "minutes_per_weekday": mpw,
+            "rest_dates": [],
+            "start_date": start.isoformat(),
+        },
+    }
+
+
+# ---------------------------------------------------------
+# Running a case
+# ---------------------------------------------------------
+
+def case_units(case: Dict[str, Any]) -> Tuple[int, int]:
+    """(days, cost units) of a case."""
+    avail = case["availability"]
+    if case["mode"] == "exam":
+        days = (date.fromisoformat(avail["end_date"]) - date.fromisoformat(avail["start_date"])).days + 1
+    else:
+        days = 7
+    days = max(days, 1)
+    topics = sum(len(s.get("topics", [])) for s in case["subjects"])
+    return days, estimate_cost(days, len(case["subjects"]), topics)
+
+
+def _generate(case: Dict[str, Any]) -> Dict[str, Any]:
+    if case["mode"] == "exam":
+        return generate_exam_plan(
+            case["subjects"], case["availability"], scheduler=case["scheduler"], max_workers=1
+        )
+    return generate_weekly_plan(case["subjects"], case["weekly_hours"], case["availability"])
+
+
+def _child(case: Dict[str, Any], conn: Any) -> None:
+    started = time.perf_counter()
+    try:
+        plan = _generate(case)
+        conn.send(("ok", time.perf_counter() - started, len(json.dumps(plan, default=str)), ""))
+    except Exception as exc:  # reported, not raised: errors are findings
+        conn.send(("error", time.perf_counter() - started, 0, f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+
+def run_case(case: Dict[str, Any], time_limit: float = DEFAULT_TIME_LIMIT) -> Tuple[str, str]:
+    """
+    Run one case in a child process. Returns (kind, detail) where kind is
+    "ok", "timeout", "error", "slow" or "output".
+    """
+    parent, child = multiprocessing.Pipe(duplex=False)
+    proc = multiprocessing.Process(target=_child, args=(case, child), daemon=True)
+    proc.start()
+    child.close()
+
+    if not parent.poll(time_limit):
+        proc.kill()
+        proc.join()
+        return "timeout", f"no result after {time_limit:.1f}s"
+
+    status, elapsed, size, detail = parent.recv()
+    proc.join()
+    if status == "error":
+        return "error", detail
+
+    days, units = case_units(case)
+    if elapsed > SLOW_BASE_SECONDS + SLOW_SECONDS_PER_UNIT * units:
+        return "slow", f"{elapsed:.2f}s for {units} cost units"
+
+    cells = days * max(len(case["subjects"]), 1)
+    if size > OUTPUT_BYTES_PER_CELL * cells:
+        return "output", f"{size} bytes for {cells} day-subject cells"
+
+    return "ok", ""
+
+
+# ---------------------------------------------------------
+# Minimization
+# ---------------------------------------------------------
+
+def _candidates(case: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Smaller variants of `case`, biggest reductions first."""
+    subjects = case["subjects"]
+    avail = case["availability"]
+
+    for i in range(len(subjects)):
+        if len(subjects) > 1:
+            yield dict(case, subjects=subjects[:i] + subjects[i + 1:])
+
+    for i, s in enumerate(subjects):
+        topics = s.get("topics", [])
+        if topics:
+            halved = dict(s, topics=topics[: len(topics) // 2])
+            yield dict(case, subjects=subjects[:i] + [halved] + subjects[i + 1:])
+
+    if avail.get("rest_dates"):
+        yield dict(case, availability=dict(avail, rest_dates=[]))
+
+    for day in list(avail["minutes_per_weekday"]):
+        mpw = {d: m for d, m in avail["minutes_per_weekday"].items() if d != day}
+        yield dict(case, availability=dict(avail, minutes_per_weekday=mpw))
+
+    if case["mode"] == "exam":
+        start = date.fromisoformat(avail["start_date"])
+        end = date.fromisoformat(avail["end_date"])
+        if end > start:
+            shorter = start + timedelta(days=(end - start).days // 2)
+            yield dict(case, availability=dict(avail, end_date=shorter.isoformat()))
+    elif case["weekly_hours"] > 0.1:
+        yield dict(case, weekly_hours=round(case["weekly_hours"] / 2, 2))
+
+
+def minimize(
+    case: Dict[str, Any],
+    kind: str,
+    check: Callable[[Dict[str, Any]], str],
+    max_steps: int = MAX_SHRINK_STEPS,
+) -> Dict[str, Any]:
+    """
+    Greedy shrinking: keep taking the first smaller variant that still
+    fails with the same `kind` until none does (or max_steps runs out).
+    """
+    steps = 0
+    improved = True
+    while improved and steps < max_steps:
+        improved = False
+        for candidate in _candidates(case):
+            steps += 1
+            if check(candidate) == kind:
+                case = candidate
+                improved = True
+                break
+            if steps >= max_steps:
+                break
+    return case
+
+
+# ---------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------
+
+def save_fixture(case: Dict[str, Any], kind: str, detail: str, seed: int) -> Path:
+    body = json.dumps(case, sort_keys=True)
+    name = f"{case['mode']}-{kind}-{hashlib.sha256(body.encode()).hexdigest()[:8]}.json"
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    path = FIXTURE_DIR / name
+    path.write_text(
+        json.dumps({"kind": kind, "detail": detail, "seed": seed, "case": case}, indent=2) + "\n"
+    )
+    return path
+
+
+def load_fixtures() -> List[Tuple[str, Dict[str, Any]]]:
+    return [
+        (path.name, json.loads(path.read_text())["case"])
+        for path in sorted(FIXTURE_DIR.glob("*.json"))
+    ]
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=200, help="cases to try (the run's cap)")
+    parser.add_argument("--time-limit", type=float, default=DEFAULT_TIME_LIMIT, help="seconds per case")
+    parser.add_argument("--save", action="store_true", help="write minimized failures to tests/fixtures/fuzz/")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for n, case in enumerate(generate_cases(args.seed, args.iterations)):
+        kind, detail = run_case(case, args.time_limit)
+        if kind == "ok":
+            continue
+
+        failures += 1
+        small = minimize(case, kind, lambda c: run_case(c, args.time_limit)[0])
+        _, detail = run_case(small, args.time_limit)
+        print(f"case {n}: {kind} ({detail})")
+        print("  " + json.dumps(small, sort_keys=True))
+        if args.save:
+            print(f"  saved {save_fixture(small, kind, detail, args.seed)}")
+
+    print(f"{args.iterations} cases, {failures} failures (seed {args.seed})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
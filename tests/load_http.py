@@ -0,0 +1,418 @@
+# tests/load_http.py
+"""
+HTTP load generator for the API, run against local uvicorn servers.
+
+    python tests/load_http.py --workers 1 --workers 4 --mode sync --mode jobs
+    python tests/load_http.py --mix weekly=1,exam=3 --concurrency 64 --threads 8
+
+For every (uvicorn worker count, executor mode, threadpool size)
+combination a fresh `uvicorn api.app:app` is started from backend/ on a
+free port. Clients (one keep-alive connection each, `--concurrency` of
+them) then send requests for `--duration` seconds, picking weekly or
+exam payloads from the weighted `--mix`. Requests finished during the
+`--warmup` are not counted.
+
+Executor modes:
+
+    sync:      POST /{kind}/generate; the allocator runs on the server's
+               threadpool (exam plans scheduled inline)
+    segmented: as sync, but exam plans use scheduler="segmented" with a
+               process pool of --segment-workers per server worker
+    jobs:      POST /{kind}/jobs, then poll GET /jobs/{id} until the job
+               is done; latency is submit-to-result
+
+Payloads come from memory_profile.py (`--size`). Every request gets a
+distinct payload unless `--duplicate-rate` says otherwise, because
+identical in-flight requests are coalesced by the server.
+
+Reported per run: completed requests, throughput, p50/p95/p99 latency in
+milliseconds and error rate (non-2xx, connection errors, failed jobs).
+
+Only the standard library is used on the client side; the server needs
+the backend requirements (uvicorn, fastapi, pydantic).
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import copy
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+TESTS_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = TESTS_DIR.parent / "backend"
+if str(TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(TESTS_DIR))
+
+from memory_profile import SIZES, exam_payload, weekly_payload  # noqa: E402
+
+
+MODES = ("sync", "segmented", "jobs")
+KINDS = ("weekly", "exam")
+
+HOST = "127.0.0.1"
+STARTUP_TIMEOUT_SECONDS = 30.0
+REQUEST_TIMEOUT_SECONDS = 120.0
+JOB_POLL_SECONDS = 0.05
+
+
+# ---------------------------------------------------------
+# Payloads
+# ---------------------------------------------------------
+
+class PayloadMix:
+    """
+    Weighted weekly/exam request bodies, pre-encoded.
+
+    Each body is a variant of the base payload for its kind (one
+    subject renamed), so no two requests coalesce on the server unless
+    drawn as duplicates.
+    """
+
+    def __init__(self, mix: Dict[str, int], size: str, mode: str, duplicate_rate: float, seed: int) -> None:
+        self.rng = random.Random(seed)
+        self.kinds = [k for k in KINDS if mix.get(k, 0) > 0]
+        self.weights = [mix[k] for k in self.kinds]
+        self.duplicate_rate = duplicate_rate
+        self.base = {"weekly": weekly_payload(size), "exam": exam_payload(size)}
+        if mode == "segmented":
+            self.base["exam"]["scheduler"] = "segmented"
+        self.sent: Dict[str, List[bytes]] = {k: [] for k in KINDS}
+        self.counter = 0
+
+    def next(self) -> Tuple[str, bytes]:
+        kind = self.rng.choices(self.kinds, self.weights)[0]
+        sent = self.sent[kind]
+        if sent and self.rng.random() < self.duplicate_rate:
+            return kind, self.rng.choice(sent)
+
+        self.counter += 1
+        payload = copy.deepcopy(self.base[kind])
+        payload["subjects"][0]["name"] += f" #{self.counter}"
+        body = json.dumps(payload).encode("utf-8")
+        sent.append(body)
+        return kind, body
+
+
+# ---------------------------------------------------------
+# HTTP client
+# ---------------------------------------------------------
+
+class Connection:
+    """Minimal HTTP/1.1 keep-alive client over asyncio streams."""
+
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, body: bytes = b"") -> Tuple[int, bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(HOST, self.port)
+
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {HOST}:{self.port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "\r\n"
+        )
+        try:
+            self.writer.write(head.encode("ascii") + body)
+            await self.writer.drain()
+            return await self._read_response()
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            await self.close()
+            raise
+
+    async def _read_response(self) -> Tuple[int, bytes]:
+        assert self.reader is not None
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("server closed the connection")
+        status = int(status_line.split()[1])
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            body = b"".join(chunks)
+        else:
+            body = await self.reader.readexactly(int(headers.get("content-length", 0)))
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, body
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+
+# ---------------------------------------------------------
+# Load
+# ---------------------------------------------------------
+
+@dataclass
+class Results:
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: {k: [] for k in KINDS})
+    errors: Dict[str, int] = field(default_factory=lambda: {k: 0 for k in KINDS})
+    error_samples: List[str] = field(default_factory=list)
+
+    def record(self, kind: str, latency: float, error: Optional[str]) -> None:
+        if error is None:
+            self.latencies[kind].append(latency)
+            return
+        self.errors[kind] += 1
+        if len(self.error_samples) < 5:
+            self.error_samples.append(f"{kind}: {error}")
+
+
+async def _one_request(conn: Connection, mode: str, kind: str, body: bytes) -> Optional[str]:
+    """Send one plan request; returns an error description or None."""
+    if mode != "jobs":
+        status, data = await conn.request("POST", f"/{kind}/generate", body)
+        return None if status == 200 else f"HTTP {status} {data[:120]!r}"
+
+    status, data = await conn.request("POST", f"/{kind}/jobs", body)
+    if status != 202:
+        return f"HTTP {status} {data[:120]!r}"
+    job_id = json.loads(data)["job_id"]
+
+    while True:
+        await asyncio.sleep(JOB_POLL_SECONDS)
+        status, data = await conn.request("GET", f"/jobs/{job_id}")
+        if status != 200:
+            return f"HTTP {status} {data[:120]!r}"
+        job = json.loads(data)
+        if job["status"] == "done":
+            return None
+        if job["status"] == "failed":
+            return f"job failed: {job.get('error')}"
+
+
+async def _client(port: int, mode: str, payloads: PayloadMix, results: Results,
+                  measure_from: float, stop_at: float) -> None:
+    conn = Connection(port)
+    try:
+        while time.perf_counter() < stop_at:
+            kind, body = payloads.next()
+            started = time.perf_counter()
+            try:
+                error = await asyncio.wait_for(_one_request(conn, mode, kind, body), REQUEST_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                error = "timeout"
+                await conn.close()
+            except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            finished = time.perf_counter()
+            if started >= measure_from:
+                results.record(kind, finished - started, error)
+    finally:
+        await conn.close()
+
+
+async def run_load(port: int, mode: str, payloads: PayloadMix, concurrency: int,
+                   duration: float, warmup: float) -> Tuple[Results, float]:
+    """Drive the server; returns the results and the measured wall time."""
+    results = Results()
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+    await asyncio.gather(
+        *(_client(port, mode, payloads, results, measure_from, stop_at) for _ in range(concurrency))
+    )
+    # Requests started before stop_at may finish after it.
+    return results, max(time.perf_counter() - measure_from, 1e-9)
+
+
+# ---------------------------------------------------------
+# Server
+# ---------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, env_overrides: Dict[str, str], data_dir: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update(env_overrides)
+    env["STUDY_DATA_DIR"] = data_dir
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "api.app:app",
+            "--host", HOST, "--port", str(port),
+            "--workers", str(workers),
+            "--log-level", "warning",
+            "--no-access-log",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+        try:
+            with socket.create_connection((HOST, port), timeout=0.5):
+                # Give the remaining workers a moment to bind as well.
+                time.sleep(0.2 * workers)
+                return proc
+        except OSError:
+            time.sleep(0.1)
+
+    stop_server(proc)
+    raise RuntimeError("uvicorn did not start listening in time")
+
+
+def stop_server(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+# ---------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an unsorted list (0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize(results: Results, elapsed: float, kind: Optional[str] = None) -> Dict[str, float]:
+    kinds = [kind] if kind else list(KINDS)
+    latencies = [x for k in kinds for x in results.latencies[k]]
+    errors = sum(results.errors[k] for k in kinds)
+    total = len(latencies) + errors
+    return {
+        "requests": total,
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+        "error_rate": errors / total if total else 0.0,
+    }
+
+
+HEADER = (
+    f"{'workers':>7} {'mode':<9} {'threads':>7} {'kind':<6} {'requests':>8} "
+    f"{'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+)
+
+
+def format_row(workers: int, mode: str, threads: int, kind: str, s: Dict[str, float]) -> str:
+    return (
+        f"{workers:>7} {mode:<9} {threads or 'default':>7} {kind:<6} {s['requests']:>8} "
+        f"{s['rps']:>8.1f} {s['p50']:>8.0f} {s['p95']:>8.0f} {s['p99']:>8.0f} {s['error_rate']:>7.1%}"
+    )
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+
+def _parse_mix(text: str) -> Dict[str, int]:
+    mix: Dict[str, int] = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind.strip() not in KINDS:
+            raise argparse.ArgumentTypeError(f"unknown kind {kind!r} (expected weekly/exam)")
+        mix[kind.strip()] = int(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("mix needs at least one positive weight")
+    return mix
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, action="append", help="uvicorn worker counts (default: 1)")
+    parser.add_argument("--mode", choices=MODES, action="append", help="executor modes (default: sync)")
+    parser.add_argument("--threads", type=int, action="append",
+                        help="threadpool sizes, STUDY_THREADPOOL_SIZE (default: 0 = AnyIO default)")
+    parser.add_argument("--mix", type=_parse_mix, default={"weekly": 3, "exam": 1})
+    parser.add_argument("--size", choices=sorted(SIZES), default="small")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.0)
+    parser.add_argument("--segment-workers", type=int, default=2)
+    parser.add_argument("--budget-ms", type=int, help="STUDY_PLAN_BUDGET_MS for the server")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"mix={args.mix} size={args.size} concurrency={args.concurrency} "
+          f"duration={args.duration}s warmup={args.warmup}s")
+    print(HEADER)
+
+    any_errors = False
+    for workers in args.workers or [1]:
+        for mode in args.mode or ["sync"]:
+            for threads in args.threads or [0]:
+                env = {
+                    "STUDY_THREADPOOL_SIZE": str(threads),
+                    "STUDY_SEGMENT_WORKERS": str(args.segment_workers if mode == "segmented" else 1),
+                }
+                if args.budget_ms is not None:
+                    env["STUDY_PLAN_BUDGET_MS"] = str(args.budget_ms)
+
+                payloads = PayloadMix(args.mix, args.size, mode, args.duplicate_rate, args.seed)
+                port = _free_port()
+                with tempfile.TemporaryDirectory() as data_dir:
+                    proc = start_server(port, workers, env, data_dir)
+                    try:
+                        results, elapsed = asyncio.run(
+                            run_load(port, mode, payloads, args.concurrency, args.duration, args.warmup)
+                        )
+                    finally:
+                        stop_server(proc)
+
+                print(format_row(workers, mode, threads, "all", summarize(results, elapsed)))
+                for kind in payloads.kinds:
+                    print(format_row(workers, mode, threads, kind, summarize(results, elapsed, kind)))
+                for sample in results.error_samples:
+                    print("    error:", sample)
+                any_errors = any_errors or any(results.errors.values())
+
+    return 1 if any_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+# tests/memory_profile.py
+"""
+Peak and retained memory of the allocators, per pipeline stage.
+
+    python tests/memory_profile.py --size large
+    python tests/memory_profile.py --size medium --kind exam --scheduler edf
+
+Each run builds a synthetic request of the given size (days x subjects
+x topics per subject) outside of the measurement, then runs the
+allocator under tracemalloc with its stage functions wrapped:
+
+    peak:     highest traced memory while the stage ran, above what was
+              live when it started (worst call for per-day stages)
+    retained: memory still live when the stage returned (summed over
+              calls); for "total" this is the returned plan itself
+
+Stages nest (the segmented scheduler runs the proportional one per
+segment); a parent's peak includes its children, and a stage nested in
+itself is only counted once.
+
+BUDGETS holds per-size limits in KiB. A measurement above its budget is
+reported as a violation and the CLI exits non-zero;
+test_memory_budgets.py checks the small size on every test run.
+
+Runs are inline (max_workers=1): tracemalloc cannot see worker
+processes.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import argparse
+import sys
+import tracemalloc
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.core.allocator import exam_allocator, weekly_allocator  # noqa: E402
+
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# (days, subjects, topics per subject); weekly plans always span one
+# week, so only the subject and topic counts apply to them.
+SIZES: Dict[str, Tuple[int, int, int]] = {
+    "small": (30, 5, 20),
+    "medium": (120, 15, 100),
+    "large": (365, 30, 500),
+}
+
+KINDS = ("exam", "weekly")
+
+# Wrapped module attributes per kind: stage name -> function names.
+EXAM_STAGES: Dict[str, Tuple[str, ...]] = {
+    "parse": ("_parse_subjects_as_exams", "_parse_availability"),
+    "calendar": ("_build_calendar_days",),
+    "schedule": ("_distribute_minutes_into_days", "_schedule_edf", "_schedule_segmented"),
+    "fairness": ("adjust_for_fairness",),
+    "validate": ("validate_day_plan",),
+    "publish": ("_to_public_days",),
+    "place": ("place_blocks",),
+}
+WEEKLY_STAGES: Dict[str, Tuple[str, ...]] = {
+    "parse": ("_parse_subjects", "_parse_availability"),
+    "sessions": ("_expand_into_sessions",),
+    "schedule": ("_fill_week_blocks", "_pack_week_blocks"),
+    "fairness": ("adjust_for_fairness",),
+    "validate": ("validate_day_plan",),
+    "place": ("place_blocks",),
+}
+
+# KiB limits per (kind, size); "total" is the whole call. Roughly 2x
+# the measured figures (worst scheduler), so a new intermediate copy of
+# the plan trips them while allocator noise does not. "publish" converts
+# blocks in place; a copy there costs about a third of the plan.
+BUDGETS: Dict[Tuple[str, str], Dict[str, Dict[str, int]]] = {
+    ("exam", "small"): {
+        "total": {"peak": 256, "retained": 160},
+        "parse": {"peak": 16},
+        "schedule": {"peak": 192},
+        "publish": {"peak": 8},
+    },
+    ("exam", "medium"): {
+        "total": {"peak": 1_536, "retained": 640},
+        "parse": {"peak": 576},
+        "schedule": {"peak": 896},
+        "publish": {"peak": 32},
+    },
+    ("exam", "large"): {
+        "total": {"peak": 8_192, "retained": 1_792},
+        "parse": {"peak": 5_632},
+        "schedule": {"peak": 2_816},
+        "publish": {"peak": 64},
+    },
+    ("weekly", "small"): {
+        "total": {"peak": 64, "retained": 48},
+        "parse": {"peak": 16},
+        "schedule": {"peak": 48},
+    },
+    ("weekly", "medium"): {
+        "total": {"peak": 640, "retained": 64},
+        "parse": {"peak": 576},
+        "schedule": {"peak": 48},
+    },
+    ("weekly", "large"): {
+        "total": {"peak": 5_632, "retained": 64},
+        "parse": {"peak": 5_632},
+        "schedule": {"peak": 64},
+    },
+}
+
+
+# ---------------------------------------------------------
+# Payloads
+# ---------------------------------------------------------
+
+def _subjects(n_subjects: int, n_topics: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"s{i}",
+            "name": f"Subject {i}",
+            "difficulty": 1 + i % 5,
+            "confidence": 1 + (i * 2) % 5,
+            "topics": [
+                {"id": f"s{i}t{j}", "name": f"Topic {i}.{j}", "priority": 1 + j % 5, "familiarity": 1 + j % 3}
+                for j in range(n_topics)
+            ],
+        }
+        for i in range(n_subjects)
+    ]
+
+
+def exam_payload(size: str) -> Dict[str, Any]:
+    n_days, n_subjects, n_topics = SIZES[size]
+    start = date(2025, 1, 6)
+    subjects = _subjects(n_subjects, n_topics)
+    # Exams spread over the last quarter of the window.
+    for i, s in enumerate(subjects):
+        s["exam_date"] = (start + timedelta(days=n_days - (n_days // 4) * i // n_subjects)).isoformat()
+    return {
+        "subjects": subjects,
+        "availability": {
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=n_days - 1)).isoformat(),
+            "minutes_per_weekday": {d: 300 if d in ("Saturday", "Sunday") else 180 for d in WEEKDAYS},
+            "rest_dates": [],
+        },
+    }
+
+
+def weekly_payload(size: str) -> Dict[str, Any]:
+    _, n_subjects, n_topics = SIZES[size]
+    return {
+        "subjects": _subjects(n_subjects, n_topics),
+        "weekly_hours": 30,
+        "availability": {
+            "start_date": "2025-01-06",
+            "minutes_per_weekday": {d: 300 for d in WEEKDAYS},
+            "rest_dates": [],
+        },
+    }
+
+
+# ---------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------
+
+class StageRecorder:
+    """Per-stage peak/retained bytes from tracemalloc around wrapped calls."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, Dict[str, int]] = {}
+        # [stage, start bytes, highest absolute peak seen by nested stages]
+        self._stack: List[List[Any]] = []
+
+    def wrap(self, stage: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # reset_peak below would lose the parent's peak so far.
+                self._stack[-1][2] = max(self._stack[-1][2], peak)
+            tracemalloc.reset_peak()
+            self._stack.append([stage, current, current])
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _, start, nested_peak = self._stack.pop()
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, nested_peak)
+                if self._stack:
+                    self._stack[-1][2] = max(self._stack[-1][2], peak)
+                if all(frame[0] != stage for frame in self._stack):
+                    self._record(stage, peak - start, current - start)
+
+        return wrapper
+
+    def _record(self, stage: str, peak: int, retained: int) -> None:
+        entry = self.stages.setdefault(stage, {"peak": 0, "retained": 0, "calls": 0})
+        entry["peak"] = max(entry["peak"], peak)
+        entry["retained"] += retained
+        entry["calls"] += 1
+
+
+@contextmanager
+def _wrapped(module: Any, stages: Dict[str, Tuple[str, ...]], recorder: StageRecorder) -> Iterator[None]:
+    originals = {}
+    for stage, names in stages.items():
+        for name in names:
+            originals[name] = getattr(module, name)
+            setattr(module, name, recorder.wrap(stage, originals[name]))
+    try:
+        yield
+    finally:
+        for name, fn in originals.items():
+            setattr(module, name, fn)
+
+
+def profile(kind: str, size: str, scheduler: str = "proportional") -> Dict[str, Dict[str, int]]:
+    """
+    Stage table for one run: {stage: {"peak", "retained", "calls"}} in
+    bytes, plus a "total" row for the whole call.
+    """
+    if kind == "exam":
+        payload = exam_payload(size)
+        module, stages = exam_allocator, EXAM_STAGES
+
+        def run() -> Dict[str, Any]:
+            return exam_allocator.generate_exam_plan(
+                payload["subjects"], payload["availability"], scheduler=scheduler, max_workers=1
+            )
+    else:
+        payload = weekly_payload(size)
+        module, stages = weekly_allocator, WEEKLY_STAGES
+
+        def run() -> Dict[str, Any]:
+            return weekly_allocator.generate_weekly_plan(
+                payload["subjects"], payload["weekly_hours"], payload["availability"]
+            )
+
+    # Warm the lru caches (dates, weekdays) so they are not charged to
+    # the first stage that happens to fill them.
+    run()
+
+    recorder = StageRecorder()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        with _wrapped(module, stages, recorder):
+            total = recorder.wrap("total", run)
+            plan = total()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    del plan
+    return recorder.stages
+
+
+def check_budgets(kind: str, size: str, stages: Dict[str, Dict[str, int]]) -> List[str]:
+    """Human-readable budget violations (empty when within budget)."""
+    violations = []
+    for stage, limits in BUDGETS.get((kind, size), {}).items():
+        measured = stages.get(stage)
+        if measured is None:
+            continue
+        for metric, limit_kib in limits.items():
+            value_kib = measured[metric] / 1024
+            if value_kib > limit_kib:
+                violations.append(f"{kind}/{size} {stage}.{metric}: {value_kib:,.0f} KiB > {limit_kib:,} KiB")
+    return violations
+
+
+def format_table(stages: Dict[str, Dict[str, int]]) -> str:
+    lines = [f"{'stage':<10} {'calls':>6} {'peak KiB':>10} {'retained KiB':>13}"]
+    for stage, m in stages.items():
+        lines.append(f"{stage:<10} {m['calls']:>6} {m['peak'] / 1024:>10,.0f} {m['retained'] / 1024:>13,.0f}")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", choices=sorted(SIZES), default="medium")
+    parser.add_argument("--kind", choices=KINDS, action="append")
+    parser.add_argument("--scheduler", choices=exam_allocator.SCHEDULER_MODES, action="append")
+    args = parser.parse_args(argv)
+
+    violations: List[str] = []
+    for kind in args.kind or KINDS:
+        schedulers = (args.scheduler or exam_allocator.SCHEDULER_MODES) if kind == "exam" else ("-",)
+        for scheduler in schedulers:
+            stages = profile(kind, args.size, scheduler if kind == "exam" else "proportional")
+            label = f"{kind} {args.size}" + (f" ({scheduler})" if kind == "exam" else "")
+            print(f"\n{label}, {'x'.join(map(str, SIZES[args.size]))}")
+            print(format_table(stages))
+            violations.extend(check_budgets(kind, args.size, stages))
+
+    for line in violations:
+        print("OVER BUDGET", line)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+# tests/test_admission.py
+import pytest
+
+from backend.core.utils.admission import (
+    AdmissionController, AdmissionPolicy, AdmissionRejected, ACCEPT, DOWNGRADE, estimate_cost,
+)
+
+def test_estimate_cost_scales_with_days_subjects_topics():
+    assert estimate_cost(7, 3, 0) == 21
+    assert estimate_cost(365, 30, 300) == 365 * 30 * 10
+    assert estimate_cost(1825, 80, 40000) > estimate_cost(365, 30, 300) * 100
+
+def test_admission_decisions():
+    policy = AdmissionPolicy(max_cost=1000, capacity=100, downgrade_cost=50, max_queue=0, queue_timeout=0.01)
+    controller = AdmissionController(policy)
+
+    with pytest.raises(AdmissionRejected) as too_big:
+        with controller.admit(1001):
+            pass
+    assert too_big.value.status_code == 413
+
+    with controller.admit(80) as first:
+        assert first == ACCEPT
+        # busy: large requests are downgraded, small ones have nowhere to queue
+        with controller.admit(60) as second:
+            assert second == DOWNGRADE
+        with pytest.raises(AdmissionRejected) as busy:
+            with controller.admit(30):
+                pass
+        assert busy.value.status_code == 429
+
+    assert controller.in_flight_cost() == 0
+    # a request above capacity still runs when the server is idle
+    with controller.admit(500) as alone:
+        assert alone == ACCEPT
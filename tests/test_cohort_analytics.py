@@ -0,0 +1,179 @@
+# tests/test_cohort_analytics.py
+from itertools import chain
+
+from backend.core.allocator.exam_allocator import generate_exam_plan
+from backend.core.utils.cohort_analytics import (
+    collect,
+    cohort_report,
+    distinct_records,
+    job_records,
+    stored_records,
+)
+from backend.database.job_queue import JobQueue
+from backend.database.plan_store import PlanStore
+
+
+def _entry(name, minutes):
+    return {"id": name.lower(), "name": name, "minutes": minutes}
+
+
+# 2025-01-06 is a Monday.
+WEEKLY = {
+    "week_start": "2025-01-06",
+    "days": [
+        {"date": "2025-01-06", "total_minutes": 90, "blocks": [
+            {"minutes": 90, "subjects": [_entry("Maths", 60), _entry("History", 30)]},
+        ]},
+        {"date": "2025-01-07", "total_minutes": 60, "blocks": [
+            {"minutes": 60, "subjects": [_entry("Maths", 60)]},
+        ]},
+    ],
+}
+
+EXAM = {
+    "days": [
+        {"date": "2025-01-07", "total_minutes": 45, "blocks": [
+            {"subject": _entry("Maths", 45), "minutes": 45},
+        ]},
+        {"date": "2025-01-09", "total_minutes": 30, "blocks": [
+            {"subject": _entry("Chemistry", 30), "minutes": 30},
+        ]},
+    ],
+}
+
+AVAILABILITY = {
+    "minutes_per_weekday": {"Monday": 120, "Tuesday": 60},
+    "rest_dates": [],
+}
+
+
+def test_cohort_report_aggregates():
+    report = cohort_report(collect([(WEEKLY, AVAILABILITY), (EXAM, None)]))
+
+    assert report["plans"] == 2
+    # The weekly plan covers its whole week, the exam plan (without
+    # availability) only its days.
+    assert report["dates"] == {
+        "date": [f"2025-01-{d:02d}" for d in range(6, 13)],
+        "plans": [1, 2, 1, 2, 1, 1, 1],
+        "total_minutes": [90, 105, 0, 30, 0, 0, 0],
+        "mean_minutes": [90.0, 52.5, 0.0, 15.0, 0.0, 0.0, 0.0],
+        # Only the weekly plan has a known capacity, on Monday and Tuesday.
+        "capacity_used": [0.75, 1.0, None, None, None, None, None],
+    }
+    assert report["subjects"] == [
+        {"name": "Maths", "plans": 2, "minutes": 165, "share": round(165 / 225, 4)},
+        {"name": "Chemistry", "plans": 1, "minutes": 30, "share": round(30 / 225, 4)},
+        {"name": "History", "plans": 1, "minutes": 30, "share": round(30 / 225, 4)},
+    ]
+    assert report["subjects_per_plan"] == {"2": 2}
+
+    capacity = report["capacity"]
+    assert (capacity["minutes"], capacity["capacity"], capacity["used"]) == (150, 180, 0.8333)
+    assert capacity["plans"] == [0] * 8 + [1, 0]
+
+
+def test_rest_dates_and_windows_cap_capacity():
+    availability = {
+        "minutes_per_weekday": {"Monday": 120, "Tuesday": 120},
+        "rest_dates": ["2025-01-07"],
+        "windows_per_weekday": {"Monday": ["18:00-19:30"]},
+    }
+    report = cohort_report(collect([(WEEKLY, availability)]))
+
+    assert report["capacity"]["capacity"] == 90
+    assert report["dates"]["capacity_used"][:2] == [1.0, None]
+    # Over capacity lands in the last bucket.
+    assert report["capacity"]["plans"][-1] == 1
+
+
+def test_capacity_covers_days_exam_plans_leave_out():
+    # 60 minutes a day for two weeks, but the exam is on day 5: the EDF
+    # scheduler only plans the days before it.
+    weekdays = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    availability = {
+        "start_date": "2026-03-02",
+        "end_date": "2026-03-15",
+        "minutes_per_weekday": {w: 60 for w in weekdays},
+        "rest_dates": ["2026-03-03"],
+    }
+    plan = generate_exam_plan(
+        subjects=[{
+            "name": "Maths", "exam_date": "2026-03-06", "difficulty": 3, "confidence": 3,
+            "topics": [{"name": "Algebra", "priority": 3, "familiarity": 3}],
+        }],
+        availability=availability,
+        scheduler="edf",
+    )
+    studied = sum(day["total_minutes"] for day in plan["days"])
+    assert 0 < studied <= 180 and len(plan["days"]) < 14
+
+    report = cohort_report(collect([(plan, availability)]))
+
+    assert report["capacity"]["capacity"] == 13 * 60
+    assert report["capacity"]["minutes"] == studied
+    assert report["capacity"]["used"] == round(studied / 780, 4)
+    assert report["capacity"]["plans"][-1] == 0
+    assert len(report["dates"]["date"]) == 14
+    assert report["dates"]["capacity_used"][1] is None  # rest date
+
+
+def test_empty_cohort():
+    report = cohort_report(collect([]))
+    assert report["plans"] == 0
+    assert report["dates"]["date"] == []
+    assert report["subjects"] == [] and report["subjects_per_plan"] == {}
+    assert report["capacity"]["used"] is None
+
+
+def test_store_records_and_limit(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    weekly_job = queue.enqueue("weekly", {"availability": AVAILABILITY})
+    queue.claim()
+    queue.complete(weekly_job, WEEKLY)
+    summary_job = queue.enqueue("weekly", {"availability": AVAILABILITY})
+    queue.claim()
+    queue.complete(summary_job, {"mode": "summary"})
+    queue.enqueue("exam", {})  # never finished
+
+    store = PlanStore(tmp_path / "plans.sqlite3", max_plans=10)
+    store.put("e1", "exam", EXAM)
+
+    assert [j["kind"] for j in queue.iter_done()] == ["weekly", "weekly"]
+    assert list(queue.iter_done(kind="exam")) == []
+    assert [p["plan"] for p in store.iter_plans(kind="exam")] == [EXAM]
+    assert list(store.iter_plans(since=10 ** 12)) == []
+
+    # Summary-only plans are skipped.
+    columns = collect(job_records(queue.iter_done()), stored_records(store.iter_plans()))
+    report = cohort_report(columns)
+    assert report["plans"] == 2
+    assert report["capacity"]["capacity"] == 180
+
+    assert collect(job_records(queue.iter_done()), stored_records(store.iter_plans()), limit=1).plans == 1
+
+
+def test_each_plan_and_replan_chain_counts_once(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    job = queue.enqueue("weekly", {"availability": AVAILABILITY})
+    queue.claim()
+    queue.complete(job, WEEKLY)
+
+    replanned = dict(EXAM, partial=True)
+    store = PlanStore(tmp_path / "plans.sqlite3", max_plans=10)
+    store.put("w", "weekly", WEEKLY)  # the job's plan, also sent as a diff
+    store.put("e1", "exam", EXAM)
+    store.put("e2", "exam", replanned, base_etag="e1")
+    store.put("x", "exam", EXAM, base_etag="unknown")
+
+    rows = list(store.iter_plans())
+    assert {r["etag"]: r["lineage"] for r in rows} == {"w": "w", "e1": "e1", "e2": "e1", "x": "x"}
+
+    # Newest first; e2 stands for its chain, so e1 is skipped.
+    records = list(stored_records(rows))
+    assert [plan for plan, _ in records] == [EXAM, replanned, WEEKLY]
+
+    report = cohort_report(collect(distinct_records(chain(job_records(queue.iter_done()), records))))
+    assert report["plans"] == 3
+    # The weekly plan counts once, from its job (with capacity).
+    assert report["capacity"]["capacity"] == 180
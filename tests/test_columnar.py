@@ -0,0 +1,98 @@
+# tests/test_columnar.py
+import json
+from datetime import date, timedelta
+
+from backend.core.allocator.exam_allocator import generate_exam_plan
+from backend.core.utils.columnar import to_columnar, from_columnar
+
+
+def _long_exam_plan():
+    start = date(2025, 1, 6)
+    subjects = [
+        {
+            "name": f"Subject {i}",
+            "exam_date": (start + timedelta(days=120 + i)).isoformat(),
+            "difficulty": 1 + i % 5,
+            "confidence": 1 + (i * 2) % 5,
+            "topics": [
+                {"name": f"Topic {i}.{t}", "priority": 1 + t % 5, "familiarity": 1 + t % 3}
+                for t in range(6)
+            ],
+        }
+        for i in range(4)
+    ]
+    availability = {
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=119)).isoformat(),
+        "minutes_per_weekday": {d: 180 for d in
+                                ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]},
+        "rest_dates": [],
+    }
+    return generate_exam_plan(subjects, availability, scheduler="edf")
+
+
+def test_columnar_round_trip_exam():
+    plan = _long_exam_plan()
+    encoded = to_columnar(plan)
+
+    assert encoded["shape"] == "exam"
+    assert "shortfall" in encoded
+    assert len(encoded["subjects"]) == 4
+    assert encoded["days"]["blocks"][-1] == len(encoded["blocks"]["minutes"])
+    assert from_columnar(json.loads(json.dumps(encoded))) == plan
+
+    # Repeated subject/topic dicts are what columnar saves.
+    assert len(json.dumps(encoded)) * 4 < len(json.dumps(plan))
+
+
+def test_columnar_round_trip_weekly_shape():
+    topic = {"id": "t1", "name": "Limits", "priority": 3, "familiarity": 2}
+    entry = {"id": "s1", "name": "Math", "minutes": 30, "topic": topic, "difficulty": 4}
+    plan = {
+        "week_start": "2025-01-06",
+        "days": [
+            {
+                "date": "2025-01-06",
+                "weekday": "Monday",
+                "total_minutes": 60,
+                "blocks": [{"minutes": 60, "subjects": [entry, dict(entry, topic=None)]}],
+            },
+            {"date": "2025-01-07", "weekday": "Tuesday", "total_minutes": 0, "blocks": []},
+        ],
+    }
+
+    encoded = to_columnar(plan)
+
+    assert encoded["shape"] == "weekly"
+    assert encoded["week_start"] == "2025-01-06"
+    assert encoded["entries"]["topic"] == [0, -1]
+    assert from_columnar(encoded) == plan
+
+
+def test_columnar_round_trip_duplicate_topic_ids():
+    # Topic ids are only unique within a subject.
+    math = {"id": "s1", "name": "Math", "minutes": 30, "difficulty": 4,
+            "topic": {"id": "t1", "name": "Limits", "priority": 3, "familiarity": 2}}
+    physics = {"id": "s2", "name": "Physics", "minutes": 45, "difficulty": 3,
+               "topic": {"id": "t1", "name": "Optics", "priority": 2, "familiarity": 4}}
+    plan = {
+        "days": [
+            {
+                "date": "2025-01-06",
+                "weekday": "Monday",
+                "total_minutes": 75,
+                "blocks": [{"minutes": 30, "subject": math}, {"minutes": 45, "subject": physics}],
+            },
+            {
+                "date": "2025-01-07",
+                "weekday": "Tuesday",
+                "total_minutes": 30,
+                "blocks": [{"minutes": 30, "subject": math}],
+            },
+        ],
+    }
+
+    encoded = to_columnar(plan)
+
+    assert len(encoded["topics"]) == 2
+    assert from_columnar(json.loads(json.dumps(encoded))) == plan
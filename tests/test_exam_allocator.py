@@ -46,4 +46,295 @@ def test_generate_exam_plan_basic():
     for d in days:
         for b in d.get("blocks", []):
             assert "subject" in b
-            assert b.get("minutes", 0) >= 25
\ No newline at end of file
+            assert b.get("minutes", 0) >= 25
+
+def test_generate_exam_plan_edf_respects_exam_dates():
+    start = date(2026, 1, 1)
+    exams = [
+        {"id": "a", "name": "Math", "exam_date": _mk_date_str(start + timedelta(days=4)),
+         "difficulty": 5, "confidence": 1, "topics": []},
+        {"id": "b", "name": "History", "exam_date": _mk_date_str(start + timedelta(days=19)),
+         "difficulty": 2, "confidence": 4, "topics": []},
+    ]
+    availability = {
+        "start_date": _mk_date_str(start),
+        "end_date": _mk_date_str(start + timedelta(days=24)),
+        "minutes_per_weekday": {
+            "Monday": 120, "Tuesday": 120, "Wednesday": 120, "Thursday": 120,
+            "Friday": 120, "Saturday": 120, "Sunday": 120
+        },
+        "rest_dates": []
+    }
+
+    plan = generate_exam_plan(exams, availability, scheduler="edf")
+    exam_dates = {e["id"]: e["exam_date"] for e in exams}
+
+    placed = 0
+    for d in plan["days"]:
+        for b in d["blocks"]:
+            assert d["date"] < exam_dates[b["subject"]["id"]]
+            placed += b["minutes"]
+
+    # Math cannot get its full share in 4 days; the rest goes to History
+    assert plan["shortfall"]["a"] > 0
+    assert plan["shortfall"]["b"] == 0
+    assert placed == 19 * 120
+
+
+def test_check_exam_feasibility_reports_slack():
+    from backend.core.allocator.exam_allocator import check_exam_feasibility
+
+    start = date(2026, 1, 1)
+    exams = [
+        {"id": "a", "name": "Math", "exam_date": _mk_date_str(start + timedelta(days=3)),
+         "difficulty": 5, "confidence": 1, "topics": []},
+        {"id": "b", "name": "History", "exam_date": _mk_date_str(start + timedelta(days=30)),
+         "difficulty": 2, "confidence": 4, "topics": []},
+    ]
+    availability = {
+        "start_date": _mk_date_str(start),
+        "end_date": _mk_date_str(start + timedelta(days=29)),
+        "minutes_per_weekday": {
+            "Monday": 60, "Tuesday": 60, "Wednesday": 60, "Thursday": 60,
+            "Friday": 60, "Saturday": 60, "Sunday": 60
+        },
+        "rest_dates": []
+    }
+
+    result = check_exam_feasibility(exams, availability)
+    by_id = {e["id"]: e for e in result["exams"]}
+
+    assert result["total_capacity"] == 30 * 60
+    assert by_id["a"]["capacity_minutes"] == 3 * 60
+    assert by_id["a"]["slack_minutes"] < 0
+    assert not result["feasible"]
+
+
+def test_summarize_exam_plan_totals():
+    from backend.core.allocator.exam_allocator import summarize_exam_plan
+
+    start = date(2026, 1, 5)  # Monday
+    exams = [
+        {"id": "a", "name": "Math", "exam_date": _mk_date_str(start + timedelta(days=20)),
+         "difficulty": 5, "confidence": 1, "topics": []},
+        {"id": "b", "name": "History", "exam_date": _mk_date_str(start + timedelta(days=20)),
+         "difficulty": 2, "confidence": 4, "topics": []},
+    ]
+    availability = {
+        "start_date": _mk_date_str(start),
+        "end_date": _mk_date_str(start + timedelta(days=13)),
+        "minutes_per_weekday": {
+            "Monday": 100, "Tuesday": 100, "Wednesday": 100, "Thursday": 100,
+            "Friday": 100, "Saturday": 0, "Sunday": 0
+        },
+        "rest_dates": []
+    }
+
+    summary = summarize_exam_plan(exams, availability)
+
+    assert summary["mode"] == "summary"
+    subject_total = sum(s["minutes"] for s in summary["subjects"])
+    assert summary["total_minutes"] == subject_total
+    assert summary["weekdays"]["Saturday"] == 0
+    assert [w["week_start"] for w in summary["weeks"]] == ["2026-01-05", "2026-01-12"]
+
+
+def test_sweep_exam_settings_matches_single_runs():
+    from backend.core.allocator.exam_allocator import (
+        sweep_exam_settings, AllocatorSettings, _parse_subjects_as_exams,
+        _parse_availability, _build_calendar_days, _compute_exam_weights,
+        _allocate_minutes_per_exam,
+    )
+
+    start = date(2026, 1, 1)
+    exams = [
+        {"id": f"e{i}", "name": f"Exam {i}", "exam_date": _mk_date_str(start + timedelta(days=5 + 7 * i)),
+         "difficulty": i % 5 + 1, "confidence": (3 * i) % 5 + 1, "topics": []}
+        for i in range(6)
+    ]
+    availability = {
+        "start_date": _mk_date_str(start),
+        "end_date": _mk_date_str(start + timedelta(days=45)),
+        "minutes_per_weekday": {
+            "Monday": 90, "Tuesday": 90, "Wednesday": 90, "Thursday": 90,
+            "Friday": 90, "Saturday": 120, "Sunday": 0
+        },
+        "rest_dates": []
+    }
+    grid = [AllocatorSettings(d / 4, c / 4, u / 4) for d in range(5) for c in range(5) for u in range(5)]
+
+    results = sweep_exam_settings(exams, availability, grid)
+    assert len(results) == len(grid)
+
+    exams_model = _parse_subjects_as_exams(exams)
+    avail_model = _parse_availability(availability)
+    calendar_days = _build_calendar_days(avail_model)
+    for settings, result in zip(grid, results):
+        expected = _allocate_minutes_per_exam(
+            calendar_days, _compute_exam_weights(exams_model, avail_model, settings)
+        )
+        assert result["minutes"] == expected
+
+
+def test_generate_exam_plan_segmented_is_deterministic():
+    start = date(2026, 1, 1)
+    exams = [
+        {"id": f"e{i}", "name": f"Exam {i}", "exam_date": _mk_date_str(start + timedelta(days=6 + 5 * i)),
+         "difficulty": i % 5 + 1, "confidence": 3,
+         "topics": [{"id": f"t{i}_{j}", "name": f"T{j}", "priority": j % 5 + 1, "familiarity": 3} for j in range(4)]}
+        for i in range(6)
+    ]
+    availability = {
+        "start_date": _mk_date_str(start),
+        "end_date": _mk_date_str(start + timedelta(days=40)),
+        "minutes_per_weekday": {
+            "Monday": 120, "Tuesday": 120, "Wednesday": 120, "Thursday": 120,
+            "Friday": 120, "Saturday": 120, "Sunday": 0
+        },
+        "rest_dates": []
+    }
+
+    inline = generate_exam_plan(exams, availability, scheduler="segmented", max_workers=1)
+    pooled = generate_exam_plan(exams, availability, scheduler="segmented", max_workers=2)
+    assert inline == pooled
+
+    exam_dates = {e["id"]: e["exam_date"] for e in exams}
+    for d in inline["days"]:
+        for b in d["blocks"]:
+            if "subject" in b:
+                assert d["date"] < exam_dates[b["subject"]["id"]]
+
+
+def test_generate_exam_plan_accepts_typed_models():
+    from backend.core.allocator.exam_allocator import _parse_subjects_as_exams, _parse_availability
+
+    start = date(2026, 3, 2)
+    exams = [
+        {"id": f"e{i}", "name": f"Exam {i}", "exam_date": _mk_date_str(start + timedelta(days=10 + 3 * i)),
+         "difficulty": 4 - i, "confidence": 2 + i,
+         "topics": [{"id": f"t{i}", "name": "Topic", "priority": 3, "familiarity": 2}]}
+        for i in range(3)
+    ]
+    availability = {
+        "start_date": _mk_date_str(start),
+        "end_date": _mk_date_str(start + timedelta(days=9)),
+        "minutes_per_weekday": {"Monday": 90, "Wednesday": 90, "Friday": 60},
+        "rest_dates": [_mk_date_str(start + timedelta(days=2))],
+    }
+
+    typed_exams = _parse_subjects_as_exams(exams)
+    typed_availability = _parse_availability(availability)
+
+    assert _parse_subjects_as_exams(typed_exams) == typed_exams
+    assert generate_exam_plan(typed_exams, typed_availability) == generate_exam_plan(exams, availability)
+
+
+def test_generate_exam_plan_budget_exhausted_returns_partial_plan():
+    start = date(2026, 3, 2)
+    exams = [
+        {"id": f"e{i}", "name": f"Exam {i}", "exam_date": _mk_date_str(start + timedelta(days=8 + 4 * i)),
+         "difficulty": 2 + i, "confidence": 3,
+         "topics": [{"id": f"t{i}_{j}", "name": f"T{j}", "priority": 3, "familiarity": 2} for j in range(3)]}
+        for i in range(3)
+    ]
+    availability = {
+        "start_date": _mk_date_str(start),
+        "end_date": _mk_date_str(start + timedelta(days=15)),
+        "minutes_per_weekday": {"Monday": 120, "Tuesday": 120, "Wednesday": 120, "Thursday": 120,
+                                "Friday": 120, "Saturday": 60, "Sunday": 60},
+        "rest_dates": [],
+    }
+
+    for scheduler in ("proportional", "edf", "segmented"):
+        assert "partial" not in generate_exam_plan(exams, availability, scheduler=scheduler, max_workers=1)
+
+        plan = generate_exam_plan(exams, availability, scheduler=scheduler, max_workers=1, budget_ms=0)
+        assert plan["partial"] is True
+        assert plan["days"]
+        exam_dates = {e["id"]: e["exam_date"] for e in exams}
+        for day in plan["days"]:
+            for b in day["blocks"]:
+                if "subject" in b:
+                    assert day["date"] < exam_dates[b["subject"]["id"]]
+
+
+def test_generate_exam_plan_places_blocks_in_windows():
+    start = date(2026, 3, 2)
+    exams = [
+        {"id": "m", "name": "Math", "exam_date": _mk_date_str(start + timedelta(days=10)),
+         "difficulty": 4, "confidence": 2,
+         "topics": [{"id": "t1", "name": "Limits", "priority": 4, "familiarity": 2}]},
+    ]
+    availability = {
+        "start_date": _mk_date_str(start),
+        "end_date": _mk_date_str(start + timedelta(days=9)),
+        "minutes_per_weekday": {"Monday": 240, "Tuesday": 60},
+        "rest_dates": [],
+        "windows_per_weekday": {"Monday": ["07:00-08:00", "18:00-19:00"]},
+    }
+
+    plan = generate_exam_plan(exams, availability)
+
+    for day in plan["days"]:
+        if day["weekday"] == "Monday":
+            assert day["total_minutes"] <= 120
+            for b in day["blocks"]:
+                assert b["slots"] and "07:00" <= b["start"] < b["end"] <= "19:00"
+        else:
+            assert all("slots" not in b for b in day["blocks"])
+
+
+def test_coalesce_blocks_merges_adjacent_and_absorbs_tails():
+    from backend.core.allocator.exam_allocator import _coalesce_blocks
+
+    def block(sid, minutes, difficulty=3):
+        return {"minutes": minutes, "subjects": [{"id": sid, "name": sid, "minutes": minutes,
+                                                  "topic": {"id": f"{sid}-{minutes}"}, "difficulty": difficulty}]}
+
+    blocks = [block("a", 30), block("a", 30), block("a", 20), block("b", 45), block("a", 10), block("c", 15)]
+    total = sum(b["minutes"] for b in blocks)
+    out = _coalesce_blocks(blocks)
+
+    # a: 30+30 merged (= preferred 60), 20 and 10 are tails; the 20 tail
+    # goes into the merged block, the 10 tail then has no host left
+    # within the preferred length and stays. c has no host at all.
+    assert [(b["subjects"][0]["id"], b["minutes"]) for b in out] == [("a", 80), ("b", 45), ("a", 10), ("c", 15)]
+    assert out[0]["subjects"][0]["minutes"] == 80
+    assert out[0]["subjects"][0]["topic"] == {"id": "a-30"}
+    assert sum(b["minutes"] for b in out) == total
+
+    # Tails always go to the currently shortest host, earlier first on ties.
+    blocks = [block("a", 45), block("b", 45), block("a", 30), block("b", 45), block("a", 30)]
+    for _ in range(4):
+        blocks += [block("c", 15), block("a", 10)]
+    out = _coalesce_blocks(blocks)
+    assert [b["minutes"] for b in out if b["subjects"][0]["id"] == "a"] == [45, 50, 50]
+
+
+def test_generate_exam_plan_has_no_foldable_tails():
+    start = date(2026, 3, 2)
+    exams = [
+        {"id": f"e{i}", "name": f"Exam {i}", "exam_date": _mk_date_str(start + timedelta(days=12 + 3 * i)),
+         "difficulty": 2 + i, "confidence": 2,
+         "topics": [{"id": f"t{i}", "name": "T", "priority": 3, "familiarity": 2}]}
+        for i in range(3)
+    ]
+    availability = {
+        "start_date": _mk_date_str(start),
+        "end_date": _mk_date_str(start + timedelta(days=11)),
+        "minutes_per_weekday": {"Monday": 200, "Tuesday": 110, "Wednesday": 95, "Thursday": 170,
+                                "Friday": 130, "Saturday": 250, "Sunday": 40},
+        "rest_dates": [],
+    }
+
+    for scheduler in ("proportional", "edf", "segmented"):
+        plan = generate_exam_plan(exams, availability, scheduler=scheduler, max_workers=1)
+        for day in plan["days"]:
+            blocks = [b for b in day["blocks"] if "subject" in b]
+            for prev, cur in zip(blocks, blocks[1:]):
+                if prev["subject"]["id"] == cur["subject"]["id"]:
+                    assert prev["minutes"] + cur["minutes"] > 75
+            for b in blocks:
+                if b["minutes"] < 25:
+                    others = [o for o in blocks if o is not b and o["subject"]["id"] == b["subject"]["id"]]
+                    assert all(o["minutes"] > 75 or o["minutes"] < 25 for o in others)
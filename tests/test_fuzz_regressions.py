@@ -0,0 +1,12 @@
+# tests/test_fuzz_regressions.py
+"""
+Replays the minimized failures saved by fuzz_allocators.py.
+"""
+import pytest
+
+from fuzz_allocators import load_fixtures, run_case
+
+
+@pytest.mark.parametrize("name,case", load_fixtures(), ids=lambda v: v if isinstance(v, str) else "")
+def test_fuzz_fixture_passes(name, case):
+    assert run_case(case, time_limit=5.0) == ("ok", "")
@@ -0,0 +1,62 @@
+# tests/test_ics_utils.py
+from datetime import datetime, timezone
+from backend.core.utils.ics_utils import render_plan_ics
+
+def test_render_plan_ics_events_and_folding():
+    days = [
+        {
+            "date": "2026-01-05",
+            "weekday": "Monday",
+            "total_minutes": 150,
+            "blocks": [
+                {"minutes": 90, "subject": {"id": "c1", "name": "Chemistry", "minutes": 90, "topic": {"name": "Acids, bases; salts"}}},
+                {"minutes": 60, "subject": {"id": "h1", "name": "History " * 12, "minutes": 60, "topic": {"name": "WW1"}}},
+            ],
+        },
+        {
+            "date": "2026-01-06",
+            "weekday": "Tuesday",
+            "total_minutes": 60,
+            "blocks": [{"minutes": 60, "subjects": [{"id": "c1", "name": "Chemistry", "minutes": 60, "topic": {"name": "Air"}}]}],
+        },
+    ]
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    ics = b"".join(render_plan_ics(iter(days), now=now)).decode("utf-8")
+
+    assert ics.startswith("BEGIN:VCALENDAR\r\n")
+    assert ics.endswith("END:VCALENDAR\r\n")
+    assert ics.count("BEGIN:VEVENT") == 3
+    assert "SUMMARY:Chemistry: Acids\\, bases\\; salts (90 min)" in ics
+    assert "DTSTART;VALUE=DATE:20260106" in ics
+    for line in ics.split("\r\n"):
+        assert len(line.encode("utf-8")) <= 75
+
+
+def test_render_plan_ics_timed_events_for_placed_blocks():
+    days = [
+        {
+            "date": "2026-01-05",
+            "weekday": "Monday",
+            "total_minutes": 90,
+            "blocks": [
+                {
+                    "minutes": 90,
+                    "subjects": [
+                        {"id": "c1", "name": "Chemistry", "minutes": 45, "topic": None},
+                        {"id": "h1", "name": "History", "minutes": 45, "topic": None},
+                    ],
+                    "start": "07:00",
+                    "end": "24:00",
+                    "slots": [{"start": "07:00", "end": "08:00"}, {"start": "23:30", "end": "24:00"}],
+                }
+            ],
+        }
+    ]
+    ics = b"".join(render_plan_ics(days)).decode("utf-8")
+
+    assert ics.count("BEGIN:VEVENT") == 3
+    assert "DTSTART:20260105T070000" in ics
+    assert "DTEND:20260105T074500" in ics
+    assert "DTEND:20260106T000000" in ics
+    assert "TRANSP:OPAQUE" in ics
+    assert "VALUE=DATE" not in ics
@@ -0,0 +1,105 @@
+# tests/test_job_queue.py
+import sqlite3
+import time
+
+from backend.database.job_queue import JobQueue, QUEUED, RUNNING, DONE, FAILED
+
+
+def test_enqueue_claim_complete(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    first = queue.enqueue("exam", {"n": 1})
+    second = queue.enqueue("weekly", {"n": 2})
+
+    assert queue.get(first)["status"] == QUEUED
+
+    job = queue.claim()
+    assert job == {"id": first, "kind": "exam", "payload": {"n": 1}}
+    assert queue.get(first)["status"] == RUNNING
+
+    queue.complete(first, {"days": []})
+    done = queue.get(first)
+    assert done["status"] == DONE
+    assert done["result"] == {"days": []}
+
+    assert queue.claim()["id"] == second
+    queue.fail(second, "boom")
+    failed = queue.get(second)
+    assert failed["status"] == FAILED and failed["error"] == "boom"
+
+    assert queue.claim() is None
+    assert queue.get("missing") is None
+
+
+def test_requeue_stale_and_persistence(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    queue = JobQueue(path)
+    job_id = queue.enqueue("exam", {})
+    queue.claim()
+
+    # A fresh lease is left alone; an expired one goes back to the queue.
+    assert queue.requeue_stale(older_than=60) == 0
+    assert queue.requeue_stale(older_than=-1) == 1
+
+    reopened = JobQueue(path)
+    assert reopened.get(job_id)["status"] == QUEUED
+    assert reopened.claim()["id"] == job_id
+
+
+def test_heartbeat_keeps_lease(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    held = queue.enqueue("exam", {})
+    orphaned = queue.enqueue("exam", {})
+    queue.claim()
+    queue.claim()
+
+    time.sleep(0.05)
+    queue.heartbeat([held])
+
+    # Only the job whose lease was not renewed goes back to the queue.
+    assert queue.requeue_stale(older_than=0.03) == 1
+    assert queue.get(held)["status"] == RUNNING
+    assert queue.get(orphaned)["status"] == QUEUED
+
+    # Heartbeats do not touch jobs that are no longer running.
+    queue.heartbeat([orphaned])
+    assert queue.get(orphaned)["status"] == QUEUED
+
+
+def test_purge_finished(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3")
+    done = queue.enqueue("exam", {})
+    failed = queue.enqueue("exam", {})
+    running = queue.enqueue("exam", {})
+    queued = queue.enqueue("exam", {})
+    for _ in range(3):
+        queue.claim()
+    queue.complete(done, {"days": []})
+    queue.fail(failed, "boom")
+
+    assert queue.purge_finished(older_than=60) == 0
+    assert queue.purge_finished(older_than=-1) == 2
+    assert queue.get(done) is None and queue.get(failed) is None
+    assert queue.get(running)["status"] == RUNNING
+    assert queue.get(queued)["status"] == QUEUED
+
+
+def test_old_database_gets_lease_column(tmp_path):
+    # A jobs table as created before leases existed.
+    path = tmp_path / "jobs.sqlite3"
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+        "payload TEXT NOT NULL, result TEXT, error TEXT, created_at REAL NOT NULL, "
+        "started_at REAL, finished_at REAL)"
+    )
+    conn.execute(
+        "INSERT INTO jobs (id, kind, status, payload, created_at) VALUES ('old', 'exam', 'queued', '{}', 0)"
+    )
+    conn.commit()
+    conn.close()
+
+    queue = JobQueue(path)
+    assert queue.claim()["id"] == "old"
+    queue.heartbeat(["old"])
+    assert queue.requeue_stale(older_than=60) == 0
+    assert JobQueue(path).get("old")["status"] == RUNNING
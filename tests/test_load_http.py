@@ -0,0 +1,59 @@
+# tests/test_load_http.py
+import asyncio
+import json
+
+from load_http import PayloadMix, percentile, run_load, summarize
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_payload_mix_distinct_bodies_unless_duplicated():
+    mix = PayloadMix({"weekly": 1, "exam": 1}, "small", "segmented", duplicate_rate=0.0, seed=1)
+    bodies = [mix.next() for _ in range(20)]
+    assert len({body for _, body in bodies}) == 20
+    assert all(json.loads(body)["scheduler"] == "segmented" for kind, body in bodies if kind == "exam")
+
+    mix = PayloadMix({"weekly": 1}, "small", "sync", duplicate_rate=1.0, seed=1)
+    assert len({mix.next()[1] for _ in range(20)}) == 1
+
+
+def test_run_load_against_local_server():
+    async def scenario():
+        async def handle(reader, writer):
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line == b"\r\n":
+                        break
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                await reader.readexactly(length)
+                status = b"200 OK" if b"/weekly/" in request_line else b"503 Service Unavailable"
+                body = b'{"plan": {}}'
+                writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+                await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            payloads = PayloadMix({"weekly": 1, "exam": 1}, "small", "sync", 0.0, seed=2)
+            return await run_load(port, "sync", payloads, concurrency=4, duration=0.3, warmup=0.05)
+
+    results, elapsed = asyncio.run(scenario())
+
+    weekly = summarize(results, elapsed, "weekly")
+    exam = summarize(results, elapsed, "exam")
+    assert weekly["requests"] > 0 and weekly["error_rate"] == 0.0
+    assert exam["requests"] > 0 and exam["error_rate"] == 1.0
+    assert results.error_samples[0].startswith("exam: HTTP 503")
@@ -0,0 +1,19 @@
+# tests/test_memory_budgets.py
+"""
+Small-size run of memory_profile.py; larger sizes are run by hand.
+"""
+import pytest
+
+from memory_profile import check_budgets, profile
+
+
+@pytest.mark.parametrize(
+    "kind,scheduler",
+    [("exam", "proportional"), ("exam", "edf"), ("exam", "segmented"), ("weekly", "proportional")],
+)
+def test_small_plans_stay_within_memory_budget(kind, scheduler):
+    stages = profile(kind, "small", scheduler)
+
+    assert stages["total"]["calls"] == 1
+    assert stages["schedule"]["calls"] == 1
+    assert check_budgets(kind, "small", stages) == []
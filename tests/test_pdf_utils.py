@@ -0,0 +1,37 @@
+# tests/test_pdf_utils.py
+from backend.core.utils.pdf_utils import render_plan_pdf
+
+def _day(i):
+    return {
+        "date": f"2026-01-{i % 28 + 1:02d}",
+        "weekday": "Monday",
+        "total_minutes": 90,
+        "blocks": [{"minutes": 90, "subject": {"name": "Chemistry (AS)", "minutes": 90, "topic": {"name": "Air"}}}],
+    }
+
+def test_render_plan_pdf_is_well_formed():
+    pdf = b"".join(render_plan_pdf(_day(i) for i in range(365)))
+    assert pdf.startswith(b"%PDF-1.4")
+    assert pdf.endswith(b"%%EOF\n")
+
+    # every xref entry must point at its object
+    xref_at = pdf.rindex(b"\nxref\n") + 1
+    assert int(pdf.split(b"startxref\n")[1].split(b"\n")[0]) == xref_at
+    entries = pdf[xref_at:].split(b"\n")[3:]
+    count = int(pdf[xref_at:].split(b"\n")[1].split()[1])
+    for obj_num in range(1, count):
+        offset = int(entries[obj_num - 1][:10])
+        assert pdf[offset:].startswith(b"%d 0 obj" % obj_num)
+
+def test_render_plan_pdf_consumes_days_lazily():
+    consumed = []
+
+    def days():
+        for i in range(200):
+            consumed.append(i)
+            yield _day(i)
+
+    chunks = render_plan_pdf(days())
+    for _ in range(6):  # header, catalog, fonts, first page
+        next(chunks)
+    assert len(consumed) < 200
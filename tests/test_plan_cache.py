@@ -0,0 +1,63 @@
+# tests/test_plan_cache.py
+import json
+import multiprocessing
+import zlib
+
+from backend.database import plan_cache
+from backend.database.plan_cache import PlanCache
+
+
+def _plan(i, days=20):
+    return {"days": [{"date": f"2025-01-{d + 1:02d}", "total_minutes": i, "blocks": []} for d in range(days)]}
+
+
+def test_get_put_and_persistence(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = PlanCache(path, max_bytes=1_000_000)
+
+    assert cache.get("k1") is None
+    cache.put("k1", _plan(1))
+    assert cache.get("k1") == _plan(1)
+
+    # A new instance (restart, other worker) sees the same plans.
+    assert PlanCache(path, max_bytes=1_000_000).get("k1") == _plan(1)
+
+
+def test_evicts_least_recently_used_over_size_bound(tmp_path, monkeypatch):
+    monkeypatch.setattr(plan_cache, "TOUCH_INTERVAL_SECONDS", -1.0)
+    cache = PlanCache(tmp_path / "cache.sqlite3", max_bytes=1)
+    cache.put("too-big", _plan(1))
+    assert cache.get("too-big") is None
+
+    size = len(zlib.compress(json.dumps(_plan(0), separators=(",", ":")).encode("utf-8")))
+
+    # Room for two plans of this size.
+    cache.max_bytes = size * 2 + size // 2
+    cache.put("k1", _plan(1))
+    cache.put("k2", _plan(2))
+    assert cache.get("k1") is not None  # k1 is now the most recently used
+    cache.put("k3", _plan(3))
+
+    assert cache.get("k2") is None
+    assert cache.get("k1") == _plan(1)
+    assert cache.get("k3") == _plan(3)
+
+
+def _writer(path, start):
+    cache = PlanCache(path, max_bytes=10_000_000)
+    for i in range(start, start + 20):
+        cache.put(f"k{i}", _plan(i))
+
+
+def test_shared_by_processes(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    PlanCache(path, max_bytes=10_000_000)
+    procs = [multiprocessing.Process(target=_writer, args=(path, n * 20)) for n in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+
+    cache = PlanCache(path, max_bytes=10_000_000)
+    assert all(cache.get(f"k{i}") == _plan(i) for i in range(60))
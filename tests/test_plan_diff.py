@@ -0,0 +1,62 @@
+# tests/test_plan_diff.py
+import copy
+from datetime import date, timedelta
+
+from backend.core.allocator.exam_allocator import generate_exam_plan
+from backend.core.utils.plan_diff import diff_plans, apply_plan_patch, plan_etag
+from backend.database.plan_store import PlanStore
+
+
+def _plan(days=20, minutes=120):
+    start = date(2026, 2, 2)
+    exams = [
+        {"id": f"e{i}", "name": f"Exam {i}", "exam_date": (start + timedelta(days=days + i)).isoformat(),
+         "difficulty": 2 + i, "confidence": 3,
+         "topics": [{"id": f"t{i}{j}", "name": f"T{j}", "priority": 3, "familiarity": 2} for j in range(3)]}
+        for i in range(3)
+    ]
+    availability = {
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=days - 1)).isoformat(),
+        "minutes_per_weekday": {"Monday": minutes, "Tuesday": minutes, "Wednesday": minutes,
+                                "Thursday": minutes, "Friday": minutes, "Saturday": 60},
+        "rest_dates": [],
+    }
+    return generate_exam_plan(exams, availability, scheduler="edf")
+
+
+def test_diff_round_trip_and_is_small_for_small_edits():
+    old = _plan()
+    new = copy.deepcopy(old)
+    new["days"][3]["blocks"][0]["minutes"] += 5
+    new["days"][3]["total_minutes"] += 5
+    removed = new["days"].pop(7)["date"]
+    new["days"].append(dict(new["days"][-1], date="2026-12-31"))
+    new["partial"] = True
+    del new["shortfall"]
+
+    patch = diff_plans(old, new)
+
+    assert [c["op"] for c in patch["days"]] == ["update", "remove", "add"]
+    assert patch["days"][1]["date"] == removed
+    assert list(patch["days"][0]["blocks"]) == ["0"]
+    assert patch["set"] == {"partial": True} and patch["unset"] == ["shortfall"]
+    assert apply_plan_patch(old, patch) == new
+    assert diff_plans(old, old) == {"days": [], "set": {}, "unset": []}
+
+
+def test_diff_between_regenerated_plans():
+    old, new = _plan(minutes=120), _plan(minutes=90)
+    assert apply_plan_patch(old, diff_plans(old, new)) == new
+    assert apply_plan_patch(new, diff_plans(new, old)) == old
+
+
+def test_plan_store_is_bounded_and_scoped_by_kind(tmp_path):
+    store = PlanStore(tmp_path / "plans.sqlite3", max_plans=2)
+    plans = [{"days": [], "n": i} for i in range(3)]
+    for p in plans:
+        store.put(plan_etag(p), "exam", p)
+
+    assert store.get(plan_etag(plans[0]), "exam") is None
+    assert store.get(plan_etag(plans[2]), "exam") == plans[2]
+    assert store.get(plan_etag(plans[2]), "weekly") is None
@@ -0,0 +1,80 @@
+# tests/test_plan_metrics.py
+from backend.core.utils.plan_metrics import compute_plan_metrics
+
+
+def _entry(sid, minutes, difficulty):
+    return {"id": sid, "name": sid.upper(), "minutes": minutes, "difficulty": difficulty, "topic": None}
+
+
+def test_weekly_plan_metrics():
+    plan = {
+        "week_start": "2025-01-06",
+        "days": [
+            {"date": "2025-01-06", "weekday": "Monday", "total_minutes": 120, "blocks": [
+                {"minutes": 120, "subjects": [_entry("m", 60, 5), _entry("h", 60, 2)]},
+            ]},
+            {"date": "2025-01-07", "weekday": "Tuesday", "total_minutes": 0, "blocks": []},
+            {"date": "2025-01-08", "weekday": "Wednesday", "total_minutes": 205, "blocks": [
+                {"minutes": 100, "subjects": [_entry("m", 45, 5), _entry("c", 40, 4), _entry("p", 15, 4)]},
+                {"minutes": 105, "subjects": [_entry("h", 90, 2), _entry("m", 15, 5)]},
+            ]},
+            {"date": "2025-01-09", "weekday": "Thursday", "total_minutes": 60, "blocks": [
+                {"minutes": 60, "subjects": [_entry("m", 60, 5)]},
+            ]},
+        ],
+    }
+
+    m = compute_plan_metrics(plan)
+
+    assert m["subjects"] == ["m", "h", "c", "p"]
+    assert m["subject_minutes"] == [180, 150, 40, 15]
+    assert m["daily"]["total_minutes"] == [120, 0, 205, 60]
+    assert m["daily"]["hard_minutes"] == [60, 0, 115, 60]
+    assert m["daily"]["distinct_subjects"] == [2, 0, 4, 1]
+    # (60*5 + 60*2) / 3 / 60
+    assert m["daily"]["load"][0] == 2.333
+    assert m["load"]["peak_date"] == "2025-01-08"
+
+    assert m["streaks"]["longest_study_days"] == 2
+    assert m["streaks"]["longest_rest_days"] == 1
+    assert m["streaks"]["subjects"] == {"m": 2, "h": 1, "c": 1, "p": 1}
+
+    assert m["violations"] == {
+        "subjects_per_day": 1,       # Wednesday: 4 subjects
+        "hard_subjects_per_day": 1,  # Wednesday: 4 hard sessions
+        "subjects_per_block": 1,     # 3 subjects in one block
+        "short_sessions": 2,         # 15-minute sessions
+    }
+    assert "metrics" not in plan
+
+
+def test_exam_plan_metrics_and_date_gaps():
+    plan = {
+        "days": [
+            {"date": "2025-01-06", "total_minutes": 60, "blocks": [{"minutes": 60, "subject": _entry("m", 60, 3)}]},
+            # Exam plans leave out days without study: 01-07, 01-10 and
+            # 01-11 are rest days and streaks restart around them.
+            {"date": "2025-01-08", "total_minutes": 60, "blocks": [{"minutes": 60, "subject": _entry("m", 60, 3)}]},
+            {"date": "2025-01-09", "total_minutes": 30, "blocks": [{"minutes": 30, "subject": _entry("m", 30, 3)}]},
+            {"date": "2025-01-12", "total_minutes": 30, "blocks": [{"minutes": 30, "subject": _entry("m", 30, 3)}]},
+        ],
+    }
+
+    m = compute_plan_metrics(plan)
+
+    assert m["dates"] == [
+        "2025-01-06", "2025-01-07", "2025-01-08", "2025-01-09", "2025-01-10", "2025-01-11", "2025-01-12",
+    ]
+    assert m["daily"]["load"] == [1.0, 0.0, 1.0, 0.5, 0.0, 0.0, 0.5]
+    assert m["daily"]["total_minutes"] == [60, 0, 60, 30, 0, 0, 30]
+    assert m["load"]["mean"] == round(3.0 / 7, 3)
+    assert m["streaks"]["subjects"] == {"m": 2}
+    assert m["streaks"]["longest_study_days"] == 2
+    assert m["streaks"]["longest_rest_days"] == 2
+    assert m["violations"]["short_sessions"] == 0
+
+
+def test_empty_plan_metrics():
+    m = compute_plan_metrics({"days": []})
+    assert m["load"] == {"mean": 0.0, "peak": 0.0, "peak_date": None}
+    assert m["subjects"] == [] and m["dates"] == []
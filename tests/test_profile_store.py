@@ -0,0 +1,37 @@
+# tests/test_profile_store.py
+from backend.database.profile_store import ProfileStore
+
+
+def _body(n):
+    return {
+        "subjects": [{"id": f"s{i}", "name": f"S{i}", "topics": []} for i in range(n)],
+        "availability": {"start_date": "2025-01-06", "minutes_per_weekday": {"Monday": 60}},
+    }
+
+
+def test_profiles_are_versioned_and_scoped_per_user(tmp_path):
+    store = ProfileStore(tmp_path / "profiles.sqlite3")
+
+    meta = store.create("alice", "weekly", "Term 1", _body(2))
+    assert meta["version"] == 1
+    assert store.version("alice", meta["id"]) == ("weekly", 1)
+    assert store.get("alice", meta["id"])["body"] == _body(2)
+
+    # Other users see nothing of it.
+    assert store.get("bob", meta["id"]) is None
+    assert store.version("bob", meta["id"]) is None
+    assert store.replace("bob", meta["id"], "weekly", "x", _body(1)) is None
+    assert not store.delete("bob", meta["id"])
+    assert store.list("bob") == []
+
+    updated = store.replace("alice", meta["id"], "exam", "Finals", _body(3))
+    assert updated["version"] == 2
+    assert store.version("alice", meta["id"]) == ("exam", 2)
+    assert store.get("alice", meta["id"])["body"] == _body(3)
+
+    # A new instance (restart, other worker) sees the same profiles.
+    listed = ProfileStore(tmp_path / "profiles.sqlite3").list("alice")
+    assert [(p["id"], p["name"], p["version"]) for p in listed] == [(meta["id"], "Finals", 2)]
+
+    assert store.delete("alice", meta["id"])
+    assert store.get("alice", meta["id"]) is None
@@ -0,0 +1,156 @@
+# tests/test_profiles_api.py
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+# The api package imports core/config as top-level packages, as when
+# uvicorn runs from backend/.
+BACKEND = Path(__file__).resolve().parent.parent / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from fastapi import HTTPException, Request  # noqa: E402
+
+from api import profiles  # noqa: E402
+from api.auth import USER_HEADER, request_user  # noqa: E402
+from api.schemas import ExamPlanRequest, WeeklyPlanRequest  # noqa: E402
+from database.profile_store import ProfileStore  # noqa: E402
+
+
+AVAILABILITY = {
+    "start_date": "2025-01-06",
+    "end_date": "2025-02-28",
+    "minutes_per_weekday": {"Monday": 60, "Tuesday": 90},
+    "rest_dates": ["2025-01-14"],
+}
+
+
+def _subject(sid, name, topics=()):
+    return {
+        "id": sid,
+        "name": name,
+        "exam_date": "2025-03-01",
+        "topics": [{"id": f"{sid}-{t}", "name": t} for t in topics],
+    }
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ProfileStore(tmp_path / "profiles.sqlite3")
+    monkeypatch.setattr(profiles, "get_profile_store", lambda: store)
+    profiles._parsed_profile.cache_clear()
+    token = profiles.bind_user("alice")
+    yield store
+    profiles.unbind_user(token)
+    profiles._parsed_profile.cache_clear()
+
+
+def _exam_profile(store):
+    body = {
+        "subjects": [_subject("s1", "Maths", ["algebra"]), _subject("s2", "Physics"), _subject("s3", "History")],
+        "availability": AVAILABILITY,
+    }
+    return store.create("alice", "exam", "Finals", body)["id"]
+
+
+def test_profile_subjects_are_patched(store):
+    profile_id = _exam_profile(store)
+    payload = ExamPlanRequest(
+        profile_id=profile_id,
+        subjects=[_subject("s2", "Physics II"), _subject(None, "Chemistry"), _subject("s9", "Biology")],
+        remove_subjects=["s3"],
+    )
+
+    profiles.resolve_profile(payload, "exam")
+
+    # Profile order first (s2 replaced in place, s3 removed), then additions.
+    assert [(s.id, s.name) for s in payload.subjects] == [
+        ("s1", "Maths"), ("s2", "Physics II"), (None, "Chemistry"), ("s9", "Biology"),
+    ]
+    assert payload.availability.dict()["minutes_per_weekday"] == AVAILABILITY["minutes_per_weekday"]
+    # The request no longer depends on the profile.
+    assert payload.profile_id is None and payload.remove_subjects == []
+
+
+def test_request_availability_overrides_profile(store):
+    profile_id = _exam_profile(store)
+    own = {**AVAILABILITY, "minutes_per_weekday": {"Sunday": 120}}
+    payload = ExamPlanRequest(profile_id=profile_id, availability=own)
+
+    profiles.resolve_profile(payload, "exam")
+
+    assert payload.availability.minutes_per_weekday == {"Sunday": 120}
+    assert [s.id for s in payload.subjects] == ["s1", "s2", "s3"]
+
+
+def test_profile_errors(store):
+    profile_id = _exam_profile(store)
+
+    with pytest.raises(HTTPException) as exc:
+        profiles.resolve_profile(WeeklyPlanRequest(profile_id=profile_id, weekly_hours=5), "weekly")
+    assert exc.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc:
+        profiles.resolve_profile(ExamPlanRequest(profile_id="missing"), "exam")
+    assert exc.value.status_code == 404
+
+    # Without a profile, availability is required.
+    with pytest.raises(HTTPException) as exc:
+        profiles.resolve_profile(ExamPlanRequest(), "exam")
+    assert exc.value.status_code == 400
+
+    # Profiles belong to the user in the header.
+    token = profiles.bind_user(None)
+    try:
+        with pytest.raises(HTTPException) as exc:
+            profiles.resolve_profile(ExamPlanRequest(profile_id=profile_id), "exam")
+        assert exc.value.status_code == 401
+    finally:
+        profiles.unbind_user(token)
+
+
+def test_replaced_profile_is_parsed_again(store):
+    profile_id = _exam_profile(store)
+    first = ExamPlanRequest(profile_id=profile_id)
+    profiles.resolve_profile(first, "exam")
+
+    store.replace("alice", profile_id, "exam", "Finals", {
+        "subjects": [_subject("s4", "Geography")],
+        "availability": AVAILABILITY,
+    })
+    second = ExamPlanRequest(profile_id=profile_id)
+    profiles.resolve_profile(second, "exam")
+
+    assert [s.id for s in first.subjects] == ["s1", "s2", "s3"]
+    assert [s.id for s in second.subjects] == ["s4"]
+
+
+def test_resolved_requests_do_not_share_cached_models(store):
+    profile_id = _exam_profile(store)
+    first = ExamPlanRequest(profile_id=profile_id)
+    profiles.resolve_profile(first, "exam")
+
+    # In-place edits to one request (as catalog resolution does) must
+    # not reach the cached profile or other requests.
+    first.subjects[0].topics.clear()
+    first.subjects[0].name = "Changed"
+    first.availability.rest_dates.append("2025-01-21")
+
+    second = ExamPlanRequest(profile_id=profile_id)
+    profiles.resolve_profile(second, "exam")
+
+    assert second.subjects[0].name == "Maths"
+    assert [t.name for t in second.subjects[0].topics] == ["algebra"]
+    assert second.availability.rest_dates == ["2025-01-14"]
+
+
+def test_request_user_reads_the_proxy_header():
+    def request(headers):
+        return Request({"type": "http", "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()]})
+
+    assert request_user(request({USER_HEADER: "alice"})) == "alice"
+    assert request_user(request({USER_HEADER: ""})) is None
+    assert request_user(request({})) is None
@@ -0,0 +1,71 @@
+# tests/test_single_flight.py
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from backend.core.utils.single_flight import SingleFlight, canonical_key
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(2)
+        return {"days": []}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", compute, timeout=2))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    while flight.in_flight() == 0:
+        time.sleep(0.001)
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len(results) == 5
+    assert all(r is results[0] for r in results)
+    assert flight.in_flight() == 0
+
+def test_waiter_times_out_and_errors_propagate():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def slow_failure():
+        release.wait(2)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call(timeout):
+        try:
+            flight.do("k", slow_failure, timeout=timeout)
+        except Exception as exc:
+            errors.append(type(exc))
+
+    leader = threading.Thread(target=call, args=(None,))
+    leader.start()
+    while flight.in_flight() == 0:
+        time.sleep(0.001)
+
+    with pytest.raises(TimeoutError):
+        flight.do("k", slow_failure, timeout=0.01)
+
+    waiter = threading.Thread(target=call, args=(2,))
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join()
+    waiter.join()
+
+    assert errors == [ValueError, ValueError]
+
+def test_canonical_key_ignores_key_order():
+    assert canonical_key("exam", {"a": 1, "b": [1, 2]}) == canonical_key("exam", {"b": [1, 2], "a": 1})
+    assert canonical_key("exam", {"a": 1}) != canonical_key("weekly", {"a": 1})
@@ -0,0 +1,87 @@
+# tests/test_slot_placement.py
+import pytest
+
+from backend.core.allocator.weekly_allocator import generate_weekly_plan
+from backend.core.engine.slot_placement import (
+    FreeSlotIndex,
+    cap_minutes_to_windows,
+    entry_segments,
+    parse_windows,
+    place_blocks,
+)
+from backend.core.utils.columnar import to_columnar, from_columnar
+
+
+def test_free_slot_index_first_fit_and_take():
+    index = FreeSlotIndex([(420, 480), (1080, 1290), (540, 570)])
+
+    assert index.first_fit(0, 3, 90) == 1
+    assert index.take(1, 90) == (1080, 1170)
+    assert index.first_fit(0, 3, 60) == 0
+    assert index.first_fit(1, 3, 200) == -1
+    assert index.free(1) == 120
+
+
+def test_place_blocks_first_fit_and_split():
+    windows = parse_windows({"Monday": ["18:00-19:00", "07:00-08:00"]})
+    days = [
+        {"date": "2025-01-06", "weekday": "Monday", "blocks": [{"minutes": 45}, {"minutes": 60}]},
+        {"date": "2025-01-07", "weekday": "Tuesday", "blocks": [{"minutes": 30}]},
+    ]
+    place_blocks(days, windows)
+
+    first, second = days[0]["blocks"]
+    assert first["slots"] == [{"start": "07:00", "end": "07:45"}]
+    # 15 minutes left in the morning, 60 in the evening: fits whole.
+    assert second["start"] == "18:00" and second["end"] == "19:00"
+    assert "slots" not in days[1]["blocks"][0]
+
+    days = [{"date": "2025-01-06", "weekday": "Monday", "blocks": [{"minutes": 100}]}]
+    place_blocks(days, windows)
+    assert days[0]["blocks"][0]["slots"] == [
+        {"start": "07:00", "end": "08:00"},
+        {"start": "18:00", "end": "18:40"},
+    ]
+
+
+def test_parse_windows_errors_and_cap():
+    with pytest.raises(ValueError):
+        parse_windows({"Funday": ["07:00-08:00"]})
+    with pytest.raises(ValueError):
+        parse_windows({"Monday": ["07:00-08:00", "07:30-09:00"]})
+    with pytest.raises(ValueError):
+        parse_windows({"Monday": ["09:00-08:00"]})
+
+    windows = parse_windows({"Monday": ["07:00-08:00"]})
+    assert cap_minutes_to_windows({"Monday": 120, "Tuesday": 30}, windows) == {"Monday": 60, "Tuesday": 30}
+
+
+def test_entry_segments_follow_slots():
+    slots = [{"start": "07:00", "end": "07:30"}, {"start": "18:00", "end": "19:00"}]
+    assert entry_segments(slots, [20, 40]) == [[(420, 440)], [(440, 450), (1080, 1110)]]
+
+
+def test_weekly_plan_with_windows_round_trips_columnar():
+    subjects = [
+        {"name": "Math", "difficulty": 3, "confidence": 3, "topics": [{"name": "Limits", "priority": 3, "familiarity": 2}]},
+        {"name": "Physics", "difficulty": 2, "confidence": 4, "topics": []},
+    ]
+    availability = {
+        "start_date": "2025-01-06",
+        "minutes_per_weekday": {"Monday": 300, "Tuesday": 60},
+        "rest_dates": [],
+        "windows_per_weekday": {"Monday": ["07:00-08:00", "18:00-19:30"]},
+    }
+    plan = generate_weekly_plan(subjects, 4, availability)
+
+    monday = next(d for d in plan["days"] if d["weekday"] == "Monday")
+    assert monday["total_minutes"] <= 150
+    assert all(b["slots"] for b in monday["blocks"])
+    placed = sum(
+        int(s["end"][:2]) * 60 + int(s["end"][3:]) - int(s["start"][:2]) * 60 - int(s["start"][3:])
+        for b in monday["blocks"]
+        for s in b["slots"]
+    )
+    assert placed == monday["total_minutes"]
+
+    assert from_columnar(to_columnar(plan)) == plan
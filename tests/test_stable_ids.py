@@ -0,0 +1,71 @@
+# tests/test_stable_ids.py
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+# The api package imports core/config as top-level packages, as when
+# uvicorn runs from backend/.
+BACKEND = Path(__file__).resolve().parent.parent / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from api.generate_exam_plan import _run_allocator, _validate_exam_request  # noqa: E402
+from api.schemas import ExamPlanRequest  # noqa: E402
+from core.utils.plan_diff import diff_plans  # noqa: E402
+
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def _request(maths_difficulty=3):
+    # As the frontend sends it: no subject or topic ids.
+    return ExamPlanRequest(
+        subjects=[
+            {"name": "Maths", "exam_date": "2026-03-20", "difficulty": maths_difficulty,
+             "topics": [{"name": "Algebra"}, {"name": "Calculus"}, {"name": "Algebra"}]},
+            {"name": "Physics", "exam_date": "2026-03-25",
+             "topics": [{"name": "Optics"}, {"name": "Mechanics"}]},
+        ],
+        availability={
+            "start_date": "2026-03-02",
+            "end_date": "2026-03-24",
+            "minutes_per_weekday": {w: 90 for w in WEEKDAYS},
+        },
+        scheduler="edf",
+    )
+
+
+def _validate(payload):
+    _validate_exam_request(payload)
+    return payload
+
+
+def _ids(payload):
+    return [(s.id, [t.id for t in s.topics]) for s in payload.subjects]
+
+
+def test_ids_are_derived_from_names():
+    first, second = _request(), _request()
+    _validate_exam_request(first)
+    _validate_exam_request(second)
+
+    assert _ids(first) == _ids(second)
+    # Repeated topic names still get distinct ids.
+    maths_topics = _ids(first)[0][1]
+    assert all(maths_topics) and len(set(maths_topics)) == 3
+
+
+def test_replans_without_ids_diff_small():
+    old_request, new_request = _request(), _request(maths_difficulty=4)
+    _validate_exam_request(old_request)
+    _validate_exam_request(new_request)
+    old, new = _run_allocator(old_request), _run_allocator(new_request)
+
+    # Re-planning the same request changes nothing.
+    assert diff_plans(old, _run_allocator(_validate(_request())))["days"] == []
+    patch = diff_plans(old, new)
+    assert len(json.dumps(patch)) < len(json.dumps(new))
@@ -0,0 +1,97 @@
+# tests/test_syllabus_catalog.py
+import pytest
+
+from backend.core.utils.syllabus import SyllabusParser, SyllabusError, stable_topic_id
+from backend.database.catalog_store import CatalogStore
+
+
+def _parse(fmt, body, chunk_size=7):
+    parser = SyllabusParser(fmt)
+    topics = []
+    for i in range(0, len(body), chunk_size):
+        topics.extend(parser.feed(body[i:i + chunk_size]))
+    topics.extend(parser.close())
+    return topics
+
+
+def test_csv_parses_across_chunk_boundaries():
+    body = (
+        "﻿Name,Subject,Priority,familiarity,notes\r\n"
+        "Limits,Math,4,2,x\r\n"
+        "\r\n"
+        '"Séries, entières",Math,,,"quoted, field"\r\n'
+        "Kinematics,Physics,1,5,"
+    ).encode("utf-8")
+
+    topics = _parse("csv", body)
+
+    assert [(t["subject"], t["name"], t["priority"], t["familiarity"]) for t in topics] == [
+        ("Math", "Limits", 4, 2),
+        ("Math", "Séries, entières", 3, 3),
+        ("Physics", "Kinematics", 1, 5),
+    ]
+    assert topics[0]["id"] == stable_topic_id("Math", "Limits")
+
+
+def test_ndjson_keeps_explicit_ids_and_derives_stable_ones():
+    body = (
+        b'{"subject": "Math", "name": "Limits", "id": "m1", "priority": 5}\n'
+        b'\n'
+        b'{"subject": "Math", "name": "Series"}\n'
+    )
+
+    first = _parse("ndjson", body, chunk_size=5)
+    again = _parse("ndjson", body, chunk_size=64)
+
+    assert [t["id"] for t in first] == ["m1", stable_topic_id("Math", "Series")]
+    assert first == again
+
+
+@pytest.mark.parametrize(
+    "fmt, body, line",
+    [
+        ("csv", b"subject,title\nMath,Limits\n", 1),
+        ("csv", b"subject,name\nMath,Limits,extra\n", 2),
+        ("csv", b"subject,name,priority\nMath,Limits,9\n", 2),
+        ("csv", b"", 1),
+        ("ndjson", b'{"subject": "Math", "name": "A"}\n[1, 2]\n', 2),
+        ("ndjson", b'{"subject": "Math", "name": "A"}\n{"subject": "Math", "name": "A"}\n', 2),
+        ("ndjson", b'{"subject": "Math"}\n', 1),
+        ("ndjson", b'{"subject": "Math", "name": "A", "familiarity": 2.5}\n', 1),
+        ("ndjson", b'{"subject": "Math", "name": "\xff"}\n', 1),
+    ],
+)
+def test_bad_rows_report_their_line(fmt, body, line):
+    with pytest.raises(SyllabusError) as exc:
+        _parse(fmt, body)
+    assert exc.value.line == line
+
+
+def test_catalog_store_import_lifecycle(tmp_path):
+    store = CatalogStore(tmp_path / "catalogs.sqlite3")
+    topics = _parse("csv", b"subject,name\nMath,Limits\nPhysics,Optics\nMath,Series\n")
+
+    catalog_id = store.create("Semester 1")
+    store.add_topics(catalog_id, topics[:2])
+    # Not visible until the import finishes.
+    assert not store.exists(catalog_id)
+    assert store.topics(catalog_id, "Math") == []
+
+    store.add_topics(catalog_id, topics[2:])
+    store.finish(catalog_id, len(topics))
+
+    assert store.exists(catalog_id)
+    meta = store.get(catalog_id)
+    assert meta["name"] == "Semester 1"
+    assert meta["topic_count"] == 3
+    assert meta["subjects"] == {"Math": 2, "Physics": 1}
+    assert [t["name"] for t in store.topics(catalog_id, "Math")] == ["Limits", "Series"]
+    assert store.topics(catalog_id, "Math")[0] == {
+        "id": stable_topic_id("Math", "Limits"), "name": "Limits", "priority": 3, "familiarity": 3,
+    }
+
+    failed = store.create("broken")
+    store.add_topics(failed, topics)
+    store.discard(failed)
+    assert store.get(failed) is None
+    assert store.get(catalog_id)["topic_count"] == 3
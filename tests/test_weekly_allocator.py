@@ -33,4 +33,98 @@ def test_generate_weekly_plan_structure_and_totals():
     for d in days:
         for b in d.get("blocks", []):
             for s in b.get("subjects", []):
-                assert s.get("minutes", 0) >= 15
\ No newline at end of file
+                assert s.get("minutes", 0) >= 15
+
+def test_generate_weekly_plan_budget_exhausted_returns_partial_plan():
+    subjects = [
+        {"id": f"s{i}", "name": f"S{i}", "difficulty": 1 + i, "confidence": 2,
+         "topics": [{"id": f"t{i}", "name": "T", "priority": 3, "familiarity": 2}]}
+        for i in range(4)
+    ]
+    availability = {
+        "minutes_per_weekday": {d: 120 for d in
+                                ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]},
+        "rest_dates": [],
+        "start_date": "2025-01-06",
+    }
+
+    full = generate_weekly_plan(subjects, 10, availability)
+    partial = generate_weekly_plan(subjects, 10, availability, budget_ms=0)
+
+    assert "partial" not in full
+    assert partial["partial"] is True
+    assert len(partial["days"]) == 7
+    for d in partial["days"]:
+        assert d["total_minutes"] <= 120
+    assert sum(d["total_minutes"] for d in partial["days"]) > 0
+
+
+def _busy_week():
+    subjects = [
+        {"id": f"s{i}", "name": f"S{i}", "difficulty": 1 + i, "confidence": 2,
+         "topics": [{"id": f"t{i}", "name": "T", "priority": 3, "familiarity": 2}]}
+        for i in range(5)
+    ]
+    availability = {
+        "minutes_per_weekday": {"Monday": 45, "Tuesday": 150, "Wednesday": 30, "Thursday": 90,
+                                "Friday": 75, "Saturday": 180, "Sunday": 0},
+        "rest_dates": [],
+        "start_date": "2025-01-06",
+    }
+    return subjects, availability
+
+
+def test_generate_weekly_plan_packing_places_more_than_greedy():
+    subjects, availability = _busy_week()
+    caps = availability["minutes_per_weekday"]
+
+    greedy = generate_weekly_plan(subjects, 9.5, availability)
+    greedy_total = sum(d["total_minutes"] for d in greedy["days"])
+    assert "placement" not in greedy
+
+    for mode in ("ffd", "best_fit"):
+        plan = generate_weekly_plan(subjects, 9.5, availability, placement=mode)
+        report = plan["placement"]
+        placed = sum(d["total_minutes"] for d in plan["days"])
+
+        assert placed > greedy_total
+        assert report["mode"] == mode
+        assert report["placed_minutes"] == placed
+        assert report["placed_minutes"] + report["unplaced_minutes"] == report["requested_minutes"]
+        assert 0 < report["utilization"] <= 1
+
+        for d in plan["days"]:
+            assert d["total_minutes"] <= caps[d["weekday"]]
+            entries = [s for b in d["blocks"] for s in b["subjects"]]
+            assert len({s["id"] for s in entries}) <= 3
+            assert sum(1 for s in entries if s["difficulty"] >= 4) <= 2
+
+
+def test_generate_weekly_plan_packing_splits_sessions_larger_than_any_day():
+    subjects = [{"id": "s1", "name": "Math", "difficulty": 5, "confidence": 3, "topics": []}]
+    availability = {
+        "minutes_per_weekday": {d: 50 for d in
+                                ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]},
+        "rest_dates": [],
+        "start_date": "2025-01-06",
+    }
+
+    plan = generate_weekly_plan(subjects, 5, availability, placement="best_fit")
+
+    assert plan["placement"]["splits"] > 0
+    assert plan["placement"]["unplaced_minutes"] == 0
+    for d in plan["days"]:
+        assert d["total_minutes"] <= 50
+        for b in d["blocks"]:
+            for s in b["subjects"]:
+                assert s["minutes"] >= 20
+
+
+def test_generate_weekly_plan_rejects_unknown_placement():
+    subjects, availability = _busy_week()
+    try:
+        generate_weekly_plan(subjects, 5, availability, placement="random")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")